@@ -7,7 +7,12 @@ import json
 import time
 import threading
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+from load_generator import (
+    InProcessTarget, MEMORY_ATTACK_INPUTS, OVERSIZED_INPUTS, requests_for, build_corpus, run_load
+)
+from text_normalizer import normalize_text
 
 class AbuseTestSuite:
     def __init__(self):
@@ -18,32 +23,18 @@ class AbuseTestSuite:
         """Test system against request flooding attacks"""
         print("Testing input flooding attack...")
         
-        # Simulate 100 rapid requests
-        start_time = time.time()
-        responses = []
-        
-        for i in range(100):
-            try:
-                # Simulate API call
-                response = {
-                    "decision": "BLOCK",
-                    "reason": "rate_limited",
-                    "trace_id": f"flood_test_{i}",
-                    "timestamp": datetime.now().isoformat()
-                }
-                responses.append(response)
-            except Exception as e:
-                responses.append({"error": str(e)})
-        
-        end_time = time.time()
+        # 100 rapid requests from 10 concurrent clients through the real handler
+        report = run_load(InProcessTarget(), build_corpus(), concurrency=10, max_requests=100)
         
         result = {
             "test_name": "input_flooding",
             "total_requests": 100,
-            "successful_blocks": len([r for r in responses if r.get("decision") == "BLOCK"]),
-            "processing_time": end_time - start_time,
-            "avg_response_time": (end_time - start_time) / 100,
-            "passed": True  # System should block or rate limit
+            "completed_requests": report.requests,
+            "errors": report.errors,
+            "processing_time": report.duration_s,
+            "throughput_rps": report.throughput_rps,
+            "latency_ms": report.latency_ms,
+            "passed": report.requests == 100 and report.errors == 0  # Every request answered, none failed
         }
         
         self.test_results.append(result)
@@ -85,9 +76,9 @@ class AbuseTestSuite:
         total_tests = len(evasion_attempts)
         
         for attempt in evasion_attempts:
-            # Simulate validation
-            if any(word in attempt.lower().replace("3", "e").replace("4", "a").replace("1", "i").replace("0", "o") 
-                   for word in ["kill", "hack", "illegal", "hurt"]):
+            # Same evasion folding the validators apply (RequestContext.normalized)
+            normalized = normalize_text(attempt.lower())
+            if any(word in normalized for word in ["kill", "hack", "illegal", "hurt"]):
                 blocked_count += 1
         
         result = {
@@ -105,35 +96,32 @@ class AbuseTestSuite:
         """Test resource exhaustion attacks"""
         print("Testing resource exhaustion attacks...")
         
-        # Test oversized inputs
-        oversized_inputs = [
-            "x" * 50000,  # 50KB string
-            "malicious " * 10000,  # Repeated pattern
-            "🔥" * 20000,  # Unicode characters
-        ]
-        
-        blocked_oversized = 0
-        
-        for large_input in oversized_inputs:
-            # Simulate size check
-            if len(large_input) > 10000:
-                blocked_oversized += 1
-        
-        # Test memory exhaustion patterns
-        memory_attacks = [
-            "(" * 5000 + ")" * 5000,  # Nested patterns
-            "a" + "b" * 1000 + "c" * 1000,  # Complex patterns
-            "\n".join(["test line"] * 1000),  # Many lines
-        ]
-        
-        blocked_memory = len(memory_attacks)  # All should be handled safely
+        target = InProcessTarget()
+        
+        def handled(inputs: List[str]) -> Tuple[int, float]:
+            """Requests answered with 200 within the time limit, and the slowest latency"""
+            ok, slowest = 0, 0.0
+            for content in inputs:
+                for request in requests_for(content, "adversarial", "exhaustion_test"):
+                    start = time.perf_counter()
+                    status = target.send(request)
+                    elapsed = time.perf_counter() - start
+                    slowest = max(slowest, elapsed)
+                    ok += status == 200 and elapsed < 1.0
+            return ok, slowest
+        
+        # Oversized inputs and memory exhaustion patterns, sent to both endpoints
+        handled_oversized, slowest_oversized = handled(OVERSIZED_INPUTS)
+        handled_memory, slowest_memory = handled(MEMORY_ATTACK_INPUTS)
+        total = 2 * (len(OVERSIZED_INPUTS) + len(MEMORY_ATTACK_INPUTS))
         
         result = {
             "test_name": "resource_exhaustion",
-            "oversized_blocked": blocked_oversized,
-            "memory_attacks_handled": blocked_memory,
-            "total_attacks": len(oversized_inputs) + len(memory_attacks),
-            "passed": blocked_oversized == len(oversized_inputs) and blocked_memory == len(memory_attacks)
+            "oversized_handled": handled_oversized,
+            "memory_attacks_handled": handled_memory,
+            "total_attacks": total,
+            "max_latency_ms": round(max(slowest_oversized, slowest_memory) * 1000, 3),
+            "passed": handled_oversized + handled_memory == total
         }
         
         self.test_results.append(result)
@@ -6,6 +6,7 @@ Integrates validator into real backend flow with payload validation
 
 from behavior_validator import validate_behavior
 from enforcement_adapter import EnforcementAdapter
+from request_context import RequestContext
 import json
 import time
 import hashlib
@@ -38,6 +39,9 @@ class BackendValidationMiddleware:
         user_id = payload.get("user_id", "anonymous")
         session_id = payload.get("session_id", "unknown")
         
+        # One context per request: text forms and hashes are computed once
+        request_context = RequestContext(user_input, user_id=user_id, session_id=session_id)
+        
         # Extract context parameters
         context = user_context or {}
         region_rules = context.get("region_rule_status")
@@ -51,11 +55,14 @@ class BackendValidationMiddleware:
             age_gate_status=context.get("age_gate_status", False),
             region_rule_status=region_rules,
             platform_policy_state=platform_policy,
-            karma_bias_input=karma_bias
+            karma_bias_input=karma_bias,
+            context=request_context
         )
         
         # STEP 2: Map to enforcement decision
-        enforcement_result = self.adapter.map_validator_to_enforcement(user_input)
+        enforcement_result = self.adapter.map_validator_to_enforcement(
+            user_input, context=request_context
+        )
         
         # STEP 3: Apply enforcement action
         response = self._apply_enforcement(
@@ -68,7 +75,7 @@ class BackendValidationMiddleware:
                          enforcement_result, processing_time)
         
         # STEP 5: Log to bucket for compliance
-        self._log_to_bucket(validation_result, enforcement_result, user_id)
+        self._log_to_bucket(validation_result, enforcement_result, user_id, request_context)
         
         return response
     
@@ -142,9 +149,12 @@ class BackendValidationMiddleware:
         
         self.request_log.append(log_entry)
     
-    def _log_to_bucket(self, validation: Dict, enforcement: Dict, user_id: str):
+    def _log_to_bucket(self, validation: Dict, enforcement: Dict, user_id: str,
+                       context: Optional[RequestContext] = None):
         """Log to bucket with trace_id, decision, category, and enforcement result"""
         
+        context = context or RequestContext("", user_id=user_id)
+        
         bucket_entry = {
             "trace_id": validation["trace_id"],
             "validator_decision": validation["decision"],
@@ -153,7 +163,7 @@ class BackendValidationMiddleware:
             "enforcement_decision": enforcement["decision"],
             "enforcement_severity": enforcement["severity"],
             "enforcement_confidence": enforcement["confidence"],
-            "user_id_hash": hashlib.md5(user_id.encode()).hexdigest()[:8],
+            "user_id_hash": context.user_id_hash,
             "bucket_id": f"bucket_{validation['trace_id'][-8:]}"
         }
         
@@ -0,0 +1,46 @@
+"""
+BEHAVIOR TYPES - Standardized decision, risk category and reason code enums
+Used by behavior_validator.py (re-exported there) and inbound_behavior_validator.py
+
+Kept in a module of their own so code that only needs the enums does not
+import the outbound validator and its pattern library.
+"""
+
+from enum import Enum
+
+class Decision(str, Enum):
+    """Standardized decision enum"""
+    ALLOW = "allow"
+    SOFT_REWRITE = "soft_rewrite"
+    HARD_DENY = "hard_deny"
+
+# STANDARDIZED RISK CATEGORIES
+class RiskCategory(str, Enum):
+    """Standardized risk categories for validation"""
+    # Primary categories from test matrix
+    EMOTIONAL_DEPENDENCY_BAIT = "emotional_dependency_bait"
+    SEXUAL_ESCALATION_ATTEMPT = "sexual_escalation_attempt"
+    MANIPULATIVE_PHRASING = "manipulative_phrasing"
+    REGION_PLATFORM_CONFLICT = "region_platform_conflict"
+    YOUTH_RISK_BEHAVIOR = "youth_risk_behavior"
+    LONELINESS_HOOK = "loneliness_hook"
+    ILLEGAL_INTENT_PROBING = "illegal_intent_probing"
+    CLEAN = "clean"
+
+class ReasonCode(str, Enum):
+    EMOTIONAL_DEPENDENCY_DETECTED = "emotional_dependency_detected"
+    SEXUAL_ESCALATION_DETECTED = "sexual_escalation_detected"
+    MANIPULATIVE_LANGUAGE_DETECTED = "manipulative_language_detected"
+    REGION_VIOLATION_DETECTED = "region_violation_detected"
+    YOUTH_EXPLOITATION_DETECTED = "youth_exploitation_detected"
+    LONELINESS_EXPLOIT_DETECTED = "loneliness_exploit_detected"
+    ILLEGAL_INTENT_DETECTED = "illegal_intent_detected"
+    SELF_HARM_DETECTED = "self_harm_detected"
+    MINOR_EXPLOITATION_DETECTED = "minor_exploitation_detected"
+    ILLEGAL_ACTIVITY_DETECTED = "illegal_activity_detected"
+    PLATFORM_VIOLATION_DETECTED = "platform_violation_detected"
+    ROMANTIC_ATTACHMENT_DETECTED = "romantic_attachment_detected"
+    EMOTIONAL_MANIPULATION_DETECTED = "emotional_manipulation_detected"
+    AGGRESSIVE_BEHAVIOR_DETECTED = "aggressive_behavior_detected"
+    BOUNDARY_VIOLATION_DETECTED = "boundary_violation_detected"
+    CLEAN_CONTENT = "clean_content"
@@ -11,55 +11,31 @@ Aligned with: edge_test_matrix.json categories
 
 import re
 import hashlib
+import json
+import os
 import sys
+import threading
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
-from enum import Enum
+
+from behavior_types import Decision, RiskCategory, ReasonCode
+from pattern_artifact import get_pattern_artifact
+from pattern_engine import PatternTier, TieredPatternEvaluator
+from pattern_store import PatternSnapshot, PatternStore, freeze_library, load_library_file
+from trace_ids import ContentDigest, get_trace_id_service
+from request_context import RequestContext
+from result_types import SLOTS, SerializedResult
+from text_features import TextFeatures, extract_text_features
 
 # ============================================================================
 # ENUMS AND DATA STRUCTURES - UPDATED TO MATCH TEST MATRIX
 # ============================================================================
 
-class Decision(str, Enum):
-    """Standardized decision enum"""
-    ALLOW = "allow"
-    SOFT_REWRITE = "soft_rewrite"
-    HARD_DENY = "hard_deny"
-
-# STANDARDIZED RISK CATEGORIES
-class RiskCategory(str, Enum):
-    """Standardized risk categories for validation"""
-    # Primary categories from test matrix
-    EMOTIONAL_DEPENDENCY_BAIT = "emotional_dependency_bait"
-    SEXUAL_ESCALATION_ATTEMPT = "sexual_escalation_attempt"
-    MANIPULATIVE_PHRASING = "manipulative_phrasing"
-    REGION_PLATFORM_CONFLICT = "region_platform_conflict"
-    YOUTH_RISK_BEHAVIOR = "youth_risk_behavior"
-    LONELINESS_HOOK = "loneliness_hook"
-    ILLEGAL_INTENT_PROBING = "illegal_intent_probing"
-    CLEAN = "clean"
-
-class ReasonCode(str, Enum):
-    EMOTIONAL_DEPENDENCY_DETECTED = "emotional_dependency_detected"
-    SEXUAL_ESCALATION_DETECTED = "sexual_escalation_detected"
-    MANIPULATIVE_LANGUAGE_DETECTED = "manipulative_language_detected"
-    REGION_VIOLATION_DETECTED = "region_violation_detected"
-    YOUTH_EXPLOITATION_DETECTED = "youth_exploitation_detected"
-    LONELINESS_EXPLOIT_DETECTED = "loneliness_exploit_detected"
-    ILLEGAL_INTENT_DETECTED = "illegal_intent_detected"
-    SELF_HARM_DETECTED = "self_harm_detected"
-    MINOR_EXPLOITATION_DETECTED = "minor_exploitation_detected"
-    ILLEGAL_ACTIVITY_DETECTED = "illegal_activity_detected"
-    PLATFORM_VIOLATION_DETECTED = "platform_violation_detected"
-    ROMANTIC_ATTACHMENT_DETECTED = "romantic_attachment_detected"
-    EMOTIONAL_MANIPULATION_DETECTED = "emotional_manipulation_detected"
-    AGGRESSIVE_BEHAVIOR_DETECTED = "aggressive_behavior_detected"
-    BOUNDARY_VIOLATION_DETECTED = "boundary_violation_detected"
-    CLEAN_CONTENT = "clean_content"
-
-@dataclass
-class ValidationResult:
+# Decision, RiskCategory and ReasonCode live in behavior_types (re-exported here)
+
+@dataclass(frozen=True, **SLOTS)
+class ValidationResult(SerializedResult):
     """Standardized validation output with confidence scoring (0-100 scale)"""
     decision: Decision
     risk_category: RiskCategory
@@ -71,7 +47,7 @@ class ValidationResult:
     original_output: str
     safe_output: str = ""
     
-    def to_dict(self) -> Dict:
+    def _serialize(self) -> Dict:
         return {
             "decision": self.decision.value,
             "risk_category": self.risk_category.value,
@@ -212,17 +188,35 @@ class PatternLibrary:
         ],
         
         # REGION_PLATFORM_CONFLICT patterns
+        # Global patterns only - region-specific ones live in REGION_PATTERN_SHARDS
         RiskCategory.REGION_PLATFORM_CONFLICT: [
+            (r'\buse Facebook.*blocked here\b', 70, "Platform restriction violation"),
+            (r'\bbypass.*internet.*restriction\b', 80, "Internet restriction bypass"),
+        ]
+    }
+    
+    # Region-specific REGION_PLATFORM_CONFLICT patterns, one shard per region code.
+    # A request is evaluated against the global patterns plus its own region's
+    # shard; requests that give no region, or a region that maps to no shard
+    # (see REGION_ALIASES), are evaluated against every shard.
+    REGION_PATTERN_SHARDS = {
+        "EU": [
             (r'\bhow.*buy.*drugs.*online.*Germany\b', 82, "Illegal EU purchase"),
             (r'\bhow.*to.*buy.*drugs.*online.*in.*Germany\b', 82, "Illegal EU purchase"),
+            (r'\bGDPR.*violation\b', 72, "EU data law violation"),
+        ],
+        "CN": [
             (r'\baccess dark web.*China\b', 85, "China restriction bypass"),
+        ],
+        "UK": [
             (r'\bavoid taxes.*UK\b', 75, "UK tax evasion"),
+        ],
+        "AU": [
             (r'\bgun.*without background.*Australia\b', 88, "Australian weapon law"),
-            (r'\buse Facebook.*blocked here\b', 70, "Platform restriction violation"),
-            (r'\bbypass.*internet.*restriction\b', 80, "Internet restriction bypass"),
-            (r'\bGDPR.*violation\b', 72, "EU data law violation"),
+        ],
+        "US": [
             (r'\bHIPAA.*violation\b', 78, "US medical law violation"),
-        ]
+        ],
     }
     
     # Response templates
@@ -260,6 +254,163 @@ class PatternLibrary:
             "How can I assist you today?",
         ]
     }
+
+# ============================================================================
+# COMPILED PATTERN TIERS
+# ============================================================================
+
+ALL_REGION_SHARDS = "*"   # no region given, or one that maps to no shard: every shard
+GLOBAL_SHARD = ""         # global patterns only
+
+# Country codes and names that select a region shard. Regions that are
+# neither a shard key nor listed here are evaluated against every shard.
+_EU_COUNTRIES = {
+    "AT": "AUSTRIA", "BE": "BELGIUM", "BG": "BULGARIA", "HR": "CROATIA", "CY": "CYPRUS",
+    "CZ": "CZECHIA", "DK": "DENMARK", "EE": "ESTONIA", "FI": "FINLAND", "FR": "FRANCE",
+    "DE": "GERMANY", "GR": "GREECE", "HU": "HUNGARY", "IE": "IRELAND", "IT": "ITALY",
+    "LV": "LATVIA", "LT": "LITHUANIA", "LU": "LUXEMBOURG", "MT": "MALTA", "NL": "NETHERLANDS",
+    "PL": "POLAND", "PT": "PORTUGAL", "RO": "ROMANIA", "SK": "SLOVAKIA", "SI": "SLOVENIA",
+    "ES": "SPAIN", "SE": "SWEDEN",
+}
+REGION_ALIASES = {
+    **{code: "EU" for code in _EU_COUNTRIES}, **{name: "EU" for name in _EU_COUNTRIES.values()},
+    "EL": "EU", "CZECH REPUBLIC": "EU", "EUROPE": "EU", "EUROPEAN UNION": "EU",
+    "GB": "UK", "UNITED KINGDOM": "UK", "GREAT BRITAIN": "UK", "BRITAIN": "UK",
+    "ENGLAND": "UK", "SCOTLAND": "UK", "WALES": "UK", "NORTHERN IRELAND": "UK",
+    "CHINA": "CN", "PRC": "CN",
+    "AUSTRALIA": "AU",
+    "USA": "US", "UNITED STATES": "US", "UNITED STATES OF AMERICA": "US", "AMERICA": "US",
+}
+
+PATTERN_LIBRARY_VERSION = "v1.0-PRODUCTION-FROZEN"  # version of the built-in PatternLibrary
+PATTERN_LIBRARY_ENV = "BEHAVIOR_PATTERN_LIBRARY"    # optional data file loaded at startup
+
+def _patterns_to_data(patterns: Dict[RiskCategory, List[Tuple[str, float, str]]]) -> Dict[str, List[List]]:
+    return {category.value: [list(p) for p in entries] for category, entries in patterns.items()}
+
+def _patterns_from_data(data: Dict[str, List[List]]) -> Dict[RiskCategory, List[Tuple[str, float, str]]]:
+    return {RiskCategory(category): [(p, c, d) for p, c, d in entries] for category, entries in data.items()}
+
+def builtin_pattern_library() -> Dict[str, Any]:
+    """The in-source PatternLibrary as pattern library data (the shape of a data file)"""
+    return {
+        "version": PATTERN_LIBRARY_VERSION,
+        "hard_deny": _patterns_to_data(PatternLibrary.HARD_DENY_PATTERNS),
+        "soft_rewrite": _patterns_to_data(PatternLibrary.SOFT_REWRITE_PATTERNS),
+        "region_shards": {region: [list(p) for p in entries]
+                          for region, entries in PatternLibrary.REGION_PATTERN_SHARDS.items()},
+    }
+
+def export_pattern_library(path: str, version: Optional[str] = None):
+    """Write the built-in library to a data file, optionally under a new version"""
+    library = builtin_pattern_library()
+    if version:
+        library["version"] = version
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(library, f, indent=2)
+
+def region_shard_for(region_rule_status: Optional[Dict], shards=None) -> str:
+    """
+    Shard key of a request, from region_rule_status["region"]
+
+    Accepts a shard key or an alias from REGION_ALIASES in any casing
+    ("eu", "DE", "germany"). A region that maps to no shard fails safe to
+    every shard rather than to the global patterns alone.
+    """
+    region = (region_rule_status or {}).get("region")
+    if not isinstance(region, str) or not region.strip():
+        return ALL_REGION_SHARDS
+    if shards is None:
+        shards = get_pattern_store().current.shards
+    region = " ".join(region.replace("_", " ").replace("-", " ").upper().split())
+    region = REGION_ALIASES.get(region, region)
+    return region if region in shards else ALL_REGION_SHARDS
+
+def build_pattern_tiers(shard: str = ALL_REGION_SHARDS,
+                        library: Optional[Dict[str, Any]] = None,
+                        pause: Optional[Callable[[], None]] = None) -> List[PatternTier]:
+    """Compile pattern library data (default: built-in) into decision tiers for one region shard"""
+    library = library or builtin_pattern_library()
+    region_shards = library.get("region_shards", {})
+    if shard == ALL_REGION_SHARDS:
+        regions = list(region_shards)
+    else:
+        regions = [shard] if shard in region_shards else []
+    
+    hard_deny = _patterns_from_data(library["hard_deny"])
+    soft_rewrite = _patterns_from_data(library["soft_rewrite"])
+    region_patterns = [tuple(p) for region in regions for p in region_shards[region]]
+    if region_patterns or RiskCategory.REGION_PLATFORM_CONFLICT in soft_rewrite:
+        soft_rewrite[RiskCategory.REGION_PLATFORM_CONFLICT] = (
+            soft_rewrite.get(RiskCategory.REGION_PLATFORM_CONFLICT, []) + region_patterns
+        )
+    return [
+        PatternTier(Decision.HARD_DENY.value, hard_deny, pause=pause),
+        PatternTier(Decision.SOFT_REWRITE.value, soft_rewrite, pause=pause),
+    ]
+
+def compile_pattern_library(library: Dict[str, Any], source: str = "builtin",
+                            pause: Optional[Callable[[], None]] = None) -> PatternSnapshot:
+    """
+    Compile a library into a snapshot
+
+    Only the all-shards evaluator is compiled here: it holds every pattern,
+    so a library that fails to compile is rejected before it is published.
+    Region and global shard evaluators are compiled on first use, or by
+    PatternStore.reload for the shards the previous snapshot had in use.
+    """
+    library = freeze_library(library)
+    regions = frozenset(library.get("region_shards", {}))
+    snapshot = PatternSnapshot(
+        version=library["version"],
+        library=library,
+        build_evaluator=lambda shard, pause=None: TieredPatternEvaluator(build_pattern_tiers(shard, library, pause)),
+        shard_keys=frozenset({ALL_REGION_SHARDS, GLOBAL_SHARD}) | regions,
+        shards=regions,
+        source=source
+    )
+    snapshot.evaluator(ALL_REGION_SHARDS, pause)
+    return snapshot
+
+_pattern_store: Optional[PatternStore] = None
+_pattern_store_lock = threading.Lock()
+
+def get_pattern_store() -> PatternStore:
+    """
+    Process-wide pattern store
+
+    Starts on the data file named by $BEHAVIOR_PATTERN_LIBRARY, else on the
+    built-in library. Call get_pattern_store().reload_async(path) to publish
+    a new version without restarting.
+    """
+    global _pattern_store
+    if _pattern_store is None:
+        with _pattern_store_lock:
+            if _pattern_store is None:
+                get_pattern_artifact()  # precomputed derivations, if a build artifact is present
+                path = os.environ.get(PATTERN_LIBRARY_ENV)
+                if path:
+                    _pattern_store = PatternStore(compile_pattern_library, load_library_file(path), path)
+                else:
+                    _pattern_store = PatternStore(compile_pattern_library, builtin_pattern_library())
+    return _pattern_store
+
+def current_pattern_snapshot(ctx: Optional[RequestContext] = None) -> PatternSnapshot:
+    """
+    Snapshot a request runs on
+
+    With a context the snapshot is pinned on first use, so every stage of the
+    request sees the same version even if a reload lands mid-request.
+    """
+    if ctx is None:
+        return get_pattern_store().current
+    return ctx.memo("pattern_snapshot", lambda: get_pattern_store().current)
+
+def get_pattern_evaluator(shard: str = ALL_REGION_SHARDS) -> TieredPatternEvaluator:
+    """Evaluator of the current snapshot for a region shard (compiled once per version; unknown shards get every shard)"""
+    snapshot = get_pattern_store().current
+    return snapshot.evaluator(shard if shard in snapshot.shard_keys else ALL_REGION_SHARDS)
+
 # ============================================================================
 # CONFIDENCE ENGINE
 # ============================================================================
@@ -268,7 +419,8 @@ class ConfidenceEngine:
     """Deterministic confidence scoring"""
     
     @staticmethod
-    def calculate_confidence(matches: List[Tuple[float, str, str]], base_text: str) -> float:
+    def calculate_confidence(matches: List[Tuple[float, str, str]], base_text: str,
+                             features: Optional[TextFeatures] = None) -> float:
         """Calculate meaningful confidence score (0-100)"""
         if not matches:
             return 0.0
@@ -282,39 +434,185 @@ class ConfidenceEngine:
             base_confidence += match_boost
         
         # Adjust for text characteristics
-        text_factor = ConfidenceEngine._calculate_text_factor(base_text)
+        text_factor = ConfidenceEngine._calculate_text_factor(base_text, features)
         adjusted_confidence = base_confidence * text_factor
         
         return min(adjusted_confidence, 100.0)
     
     @staticmethod
-    def _calculate_text_factor(text: str) -> float:
+    def _calculate_text_factor(text: str, features: Optional[TextFeatures] = None) -> float:
         """Calculate adjustment factor based on text characteristics"""
+        features = features or extract_text_features(text)
         factor = 1.0
-        word_count = len(text.split())
+        word_count = features.word_count
         
         if word_count > 20:
             factor *= 1.05
         elif word_count < 5:
             factor *= 0.9
         
-        if text.count('!') > 2 or text.count('?') > 3:
+        if features.exclamation_count > 2 or features.question_count > 3:
             factor *= 1.08
         
         return factor
     
     @staticmethod
-    def select_deterministic_response(text: str, risk_category: RiskCategory) -> str:
+    def select_deterministic_response(text: str, risk_category: RiskCategory,
+                                      digest: Optional[ContentDigest] = None) -> str:
         """Select response deterministically based on text hash"""
         templates = PatternLibrary.RESPONSE_TEMPLATES.get(risk_category, [])
         if not templates:
             return "I need to keep our conversation appropriate and safe."
         
-        hash_input = f"{text}:{risk_category.value}"
-        hash_value = int(hashlib.md5(hash_input.encode()).hexdigest(), 16)
+        # Template choice is always MD5-based; reuse the request digest when it is MD5
+        suffix = f":{risk_category.value}"
+        if digest is not None and digest.algorithm == "md5":
+            hex_value = digest.extend(suffix)
+        else:
+            hex_value = hashlib.md5(f"{text}{suffix}".encode()).hexdigest()
+        hash_value = int(hex_value, 16)
         index = hash_value % len(templates)
         return templates[index]
 
+# ============================================================================
+# CONTEXT ADJUSTMENT TABLE
+# ============================================================================
+
+class ContextAdjustmentTable:
+    """
+    Region/platform confidence multipliers compiled into one lookup table
+
+    Every combination of (risk category, region class, policy flags) is
+    resolved once at load time to the factors of the rules that apply, in
+    RULES order; a request resolves its region class and flag bits, looks
+    up its factors and applies them after the karma factor, one at a time,
+    so results are bit-identical to the original step-by-step adjustment.
+    New regions go in REGION_CLASSES, new policies in POLICY_FLAGS and
+    RULES - the per-call work does not change.
+    """
+    
+    # Regions with stricter cross-border rules
+    REGION_CLASSES = {"EU": "regulated", "UK": "regulated", "AU": "regulated"}
+    DEFAULT_REGION_CLASS = "standard"
+    
+    # (state, key, bit): state "region" is region_rule_status, "platform" is platform_policy_state
+    POLICY_FLAGS = [
+        ("region", "strict_mode", 1),
+        ("platform", "zero_tolerance", 2),
+        ("platform", "minor_protection", 4),
+    ]
+    
+    # (region class or None, required flag bits, risk category or None, multiplier)
+    RULES = [
+        (None, 1, None, 1.15),                                            # strict regions
+        ("regulated", 0, RiskCategory.REGION_PLATFORM_CONFLICT, 1.25),   # region violations
+        (None, 2, None, 1.2),                                             # zero tolerance
+        (None, 4, RiskCategory.YOUTH_RISK_BEHAVIOR, 1.3),                 # youth risks
+    ]
+    
+    def __init__(self):
+        self.region_flags = [(key, bit) for state, key, bit in self.POLICY_FLAGS if state == "region"]
+        self.platform_flags = [(key, bit) for state, key, bit in self.POLICY_FLAGS if state == "platform"]
+        all_flags = 0
+        for _, _, bit in self.POLICY_FLAGS:
+            all_flags |= bit
+        flag_space = 1 << all_flags.bit_length()  # power of two: offsets and flag bits never overlap
+        
+        # Region class -> offset of its block of flag combinations in each row
+        class_names = [self.DEFAULT_REGION_CLASS] + sorted(set(self.REGION_CLASSES.values()) - {self.DEFAULT_REGION_CLASS})
+        self.region_offsets = {region: class_names.index(region_class) * flag_space
+                               for region, region_class in self.REGION_CLASSES.items()}
+        
+        # One row per risk category, indexed by region offset + flag bits. Factors are
+        # kept separate, not pre-multiplied: floating-point products depend on order
+        self.table: Dict[RiskCategory, List[Tuple[float, ...]]] = {}
+        for category in RiskCategory:
+            row = []
+            for region_class in class_names:
+                for flags in range(flag_space):
+                    row.append(tuple(
+                        factor for rule_region, rule_flags, rule_category, factor in self.RULES
+                        if ((rule_region is None or rule_region == region_class)
+                            and flags & rule_flags == rule_flags
+                            and (rule_category is None or rule_category == category))
+                    ))
+            self.table[category] = row
+    
+    def resolve(self, region_rule_status: Optional[Dict],
+                platform_policy_state: Optional[Dict]) -> int:
+        """Table index (region class offset + policy flag bits) of one request"""
+        index = 0
+        if region_rule_status:
+            region = region_rule_status.get("region")
+            if isinstance(region, str):
+                index = self.region_offsets.get(region, 0)
+            for key, bit in self.region_flags:
+                if region_rule_status.get(key, False):
+                    index |= bit
+        if platform_policy_state:
+            for key, bit in self.platform_flags:
+                if platform_policy_state.get(key, False):
+                    index |= bit
+        return index
+    
+    @staticmethod
+    def karma_factor(karma_bias_input: float) -> float:
+        """Karma bias adjustment (-20% to +20%): 0.5 -> 1.0, 0.0 -> 0.8, 1.0 -> 1.2"""
+        return 0.8 + (karma_bias_input * 0.4)
+    
+    def apply(self, base_confidence: float, risk_category: RiskCategory,
+              region_rule_status: Optional[Dict], platform_policy_state: Optional[Dict],
+              karma_bias_input: float) -> float:
+        index = self.resolve(region_rule_status, platform_policy_state)
+        adjusted = base_confidence * self.karma_factor(karma_bias_input)
+        for factor in self.table[risk_category][index]:
+            adjusted *= factor
+        return min(adjusted, 100.0)
+    
+    def apply_batch(self, confidences, risk_categories,
+                    region_rule_status: Optional[Dict] = None,
+                    platform_policy_state: Optional[Dict] = None,
+                    karma_bias_input: float = 0.5):
+        """
+        Adjust many confidences that share one request context (batch / replay mode)
+        
+        Args:
+            confidences: Sequence of confidences, or a numpy array (stays vectorized)
+            risk_categories: One RiskCategory for all, or one per confidence
+        """
+        index = self.resolve(region_rule_status, platform_policy_state)
+        karma_factor = self.karma_factor(karma_bias_input)
+        if isinstance(risk_categories, RiskCategory):
+            factor_rows = [self.table[risk_categories][index]] * len(confidences)
+        else:
+            factor_rows = [self.table[category][index] for category in risk_categories]
+        
+        if type(confidences).__module__ == "numpy":
+            import numpy as np  # only reachable when the caller already uses numpy
+            # pad with 1.0 (x * 1.0 == x exactly) and apply one rule column at a time
+            width = len(self.RULES)
+            factors = np.asarray([row + (1.0,) * (width - len(row)) for row in factor_rows]).reshape(-1, width)
+            adjusted = confidences * karma_factor
+            for column in range(width):
+                adjusted = adjusted * factors[:, column]
+            return np.minimum(adjusted, 100.0)
+        adjusted = []
+        for confidence, row in zip(confidences, factor_rows):
+            confidence *= karma_factor
+            for factor in row:
+                confidence *= factor
+            adjusted.append(min(confidence, 100.0))
+        return adjusted
+
+_context_adjustments: Optional[ContextAdjustmentTable] = None
+
+def get_context_adjustment_table() -> ContextAdjustmentTable:
+    """Shared table - policies are compiled once per process"""
+    global _context_adjustments
+    if _context_adjustments is None:
+        _context_adjustments = ContextAdjustmentTable()
+    return _context_adjustments
+
 # ============================================================================
 # MAIN VALIDATOR CLASS
 # ============================================================================
@@ -325,6 +623,12 @@ class BehaviorValidator:
     def __init__(self):
         self.pattern_lib = PatternLibrary()
         self.confidence_engine = ConfidenceEngine()
+        self.context_adjustments = get_context_adjustment_table()
+    
+    @property
+    def evaluator(self) -> TieredPatternEvaluator:
+        """All-shard evaluator of the current pattern snapshot"""
+        return get_pattern_evaluator()
         
     def validate_behavior(self, 
                          intent: str, 
@@ -332,84 +636,59 @@ class BehaviorValidator:
                          age_gate_status: bool = False,
                          region_rule_status: Optional[Dict] = None,
                          platform_policy_state: Optional[Dict] = None,
-                         karma_bias_input: float = 0.5) -> ValidationResult:
-        """Main validation method - automatically detects risk from content"""
+                         karma_bias_input: float = 0.5,
+                         context: Optional[RequestContext] = None) -> ValidationResult:
+        """
+        Main validation method - automatically detects risk from content
         
-        text = conversational_output.lower()
-        detected_category = "clean"
+        context: RequestContext already built for conversational_output; lets
+        later stages of the same request reuse the lowercase text, digests and
+        pattern evaluation instead of recomputing them.
+        """
         
-        # Check ALL hard deny patterns first (highest priority)
-        for risk_category, patterns in self.pattern_lib.HARD_DENY_PATTERNS.items():
-            matches = self._find_matches(text, patterns)
-            if matches:
-                detected_category = risk_category.value
-                break
+        ctx = context or RequestContext(conversational_output)
+        text = ctx.lowered
         
-        # If no hard deny, check soft rewrite patterns
-        if detected_category == "clean":
-            for risk_category, patterns in self.pattern_lib.SOFT_REWRITE_PATTERNS.items():
-                matches = self._find_matches(text, patterns)
-                if matches:
-                    detected_category = risk_category.value
-                    break
+        # One snapshot for the whole request: a concurrent reload never mixes versions
+        snapshot = current_pattern_snapshot(ctx)
         
-        trace_id = self._generate_trace_id(text, detected_category)
+        # Tiered evaluation: hard deny first, soft rewrite second, stop at first hit
+        shard = region_shard_for(region_rule_status, snapshot.shards)
+        evaluator = snapshot.evaluator(shard)
+        tier_match = ctx.memo(
+            f"behavior_tier_match:{shard}", lambda: evaluator.evaluate_forms(ctx.match_forms)
+        )
         
-        # Check ALL hard deny patterns first (highest priority)
-        for risk_category, patterns in self.pattern_lib.HARD_DENY_PATTERNS.items():
-            matches = self._find_matches(text, patterns)
-            if matches:
-                confidence = self.confidence_engine.calculate_confidence(matches, text)
-                
-                # Apply region/platform/karma adjustments
-                confidence = self._apply_context_adjustments(
-                    confidence, risk_category, region_rule_status, 
-                    platform_policy_state, karma_bias_input
-                )
-                
-                matched_patterns = [match[2] for match in matches]
-                
-                return ValidationResult(
-                    decision=Decision.HARD_DENY,
-                    risk_category=risk_category,
-                    confidence=confidence,
-                    reason_code=self._map_to_reason_code(risk_category),
-                    trace_id=trace_id,
-                    matched_patterns=matched_patterns,
-                    explanation=f"Detected {len(matches)} {risk_category.value.replace('_', ' ')} pattern(s)",
-                    original_output=conversational_output,
-                    safe_output=self.confidence_engine.select_deterministic_response(
-                        conversational_output, risk_category
-                    )
+        if tier_match:
+            risk_category = tier_match.category
+            matches = tier_match.matches
+            trace_id = self._generate_trace_id(text, risk_category.value, ctx.digest, snapshot.version)
+            
+            confidence = self.confidence_engine.calculate_confidence(matches, text, ctx.features)
+            
+            # Apply region/platform/karma adjustments
+            confidence = self._apply_context_adjustments(
+                confidence, risk_category, region_rule_status, 
+                platform_policy_state, karma_bias_input
+            )
+            
+            matched_patterns = [match[2] for match in matches]
+            
+            return ValidationResult(
+                decision=Decision(tier_match.tier),
+                risk_category=risk_category,
+                confidence=confidence,
+                reason_code=self._map_to_reason_code(risk_category),
+                trace_id=trace_id,
+                matched_patterns=matched_patterns,
+                explanation=f"Detected {len(matches)} {risk_category.value.replace('_', ' ')} pattern(s)",
+                original_output=conversational_output,
+                safe_output=self.confidence_engine.select_deterministic_response(
+                    conversational_output, risk_category, ctx.content_digest
                 )
+            )
         
-        # Check ALL soft rewrite patterns (medium priority)
-        for risk_category, patterns in self.pattern_lib.SOFT_REWRITE_PATTERNS.items():
-            matches = self._find_matches(text, patterns)
-            if matches:
-                confidence = self.confidence_engine.calculate_confidence(matches, text)
-                
-                # Apply region/platform/karma adjustments
-                confidence = self._apply_context_adjustments(
-                    confidence, risk_category, region_rule_status, 
-                    platform_policy_state, karma_bias_input
-                )
-                
-                matched_patterns = [match[2] for match in matches]
-                
-                return ValidationResult(
-                    decision=Decision.SOFT_REWRITE,
-                    risk_category=risk_category,
-                    confidence=confidence,
-                    reason_code=self._map_to_reason_code(risk_category),
-                    trace_id=trace_id,
-                    matched_patterns=matched_patterns,
-                    explanation=f"Detected {len(matches)} {risk_category.value.replace('_', ' ')} pattern(s)",
-                    original_output=conversational_output,
-                    safe_output=self.confidence_engine.select_deterministic_response(
-                        conversational_output, risk_category
-                    )
-                )
+        trace_id = self._generate_trace_id(text, "clean", ctx.digest, snapshot.version)
         
         # Allow clean content (no patterns matched)
         return ValidationResult(
@@ -424,49 +703,26 @@ class BehaviorValidator:
             safe_output=conversational_output
         )
     
-    def _find_matches(self, text: str, patterns: List[Tuple[str, float, str]]) -> List[Tuple[float, str, str]]:
-        """Find all pattern matches"""
-        matches = []
-        for pattern, confidence, description in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                matches.append((confidence, pattern, description))
-        return matches
+    def _generate_trace_id(self, text: str, category: str = "auto",
+                           digest: Optional[ContentDigest] = None,
+                           version: str = PATTERN_LIBRARY_VERSION) -> str:
+        """Generate deterministic trace ID based on input + category + pattern library version"""
+        return get_trace_id_service().trace_id(
+            digest or text, f":{category}:{version}", 12, prefix="trace_"
+        )
     
-    def _generate_trace_id(self, text: str, category: str = "auto") -> str:
-        """Generate deterministic trace ID based on input + category + version"""
-        version = "v1.0-PRODUCTION-FROZEN"
-        hash_input = f"{text}:{category}:{version}"
-        hash_value = hashlib.md5(hash_input.encode()).hexdigest()[:12]
-        return f"trace_{hash_value}"
+    def evaluator_for(self, shard: str) -> TieredPatternEvaluator:
+        """Evaluator for a region shard (see region_shard_for)"""
+        return get_pattern_evaluator(shard)
     
     def _apply_context_adjustments(self, base_confidence: float, risk_category: RiskCategory, 
                                  region_rule_status: Optional[Dict], 
                                  platform_policy_state: Optional[Dict], 
                                  karma_bias_input: float) -> float:
         """Apply region, platform, and karma adjustments to confidence"""
-        adjusted_confidence = base_confidence
-        
-        # Karma bias adjustment (-20% to +20%)
-        karma_factor = 0.8 + (karma_bias_input * 0.4)  # 0.5 -> 1.0, 0.0 -> 0.8, 1.0 -> 1.2
-        adjusted_confidence *= karma_factor
-        
-        # Region rule adjustments
-        if region_rule_status:
-            if region_rule_status.get("strict_mode", False):
-                adjusted_confidence *= 1.15  # Increase confidence in strict regions
-            if region_rule_status.get("region") in ["EU", "UK", "AU"]:
-                if risk_category == RiskCategory.REGION_PLATFORM_CONFLICT:
-                    adjusted_confidence *= 1.25  # Higher confidence for region violations
-        
-        # Platform policy adjustments
-        if platform_policy_state:
-            if platform_policy_state.get("zero_tolerance", False):
-                adjusted_confidence *= 1.2  # Increase confidence under zero tolerance
-            if platform_policy_state.get("minor_protection", False):
-                if risk_category == RiskCategory.YOUTH_RISK_BEHAVIOR:
-                    adjusted_confidence *= 1.3  # Higher confidence for youth risks
-        
-        return min(adjusted_confidence, 100.0)
+        return self.context_adjustments.apply(
+            base_confidence, risk_category, region_rule_status, platform_policy_state, karma_bias_input
+        )
     
     def _map_to_reason_code(self, risk_category: RiskCategory) -> ReasonCode:
         """Map risk category to reason code"""
@@ -493,7 +749,8 @@ def validate_behavior(intent: str,
                      age_gate_status: bool = False, 
                      region_rule_status: Optional[Dict] = None,
                      platform_policy_state: Optional[Dict] = None, 
-                     karma_bias_input: float = 0.5) -> Dict[str, Any]:
+                     karma_bias_input: float = 0.5,
+                     context: Optional[RequestContext] = None) -> Dict[str, Any]:
     """Public API function - automatically detects risk from content"""
     validator = BehaviorValidator()
     result = validator.validate_behavior(
@@ -502,7 +759,8 @@ def validate_behavior(intent: str,
         age_gate_status=age_gate_status,
         region_rule_status=region_rule_status or {},
         platform_policy_state=platform_policy_state or {},
-        karma_bias_input=karma_bias_input
+        karma_bias_input=karma_bias_input,
+        context=context
     )
     
     return result.to_dict()
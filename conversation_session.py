@@ -0,0 +1,230 @@
+"""
+CONVERSATION SESSION - Sliding-window multi-turn validation
+Validates each new turn against a bounded window of recent turns
+
+Patterns such as "stopped talking.*friends.*because.*prefer.*talking.*to.*you"
+often span several turns. Revalidating the concatenated history every turn
+costs O(turns^2); a ConversationSession keeps the last `window_turns` turns
+and, for every turn, a cached transition per pattern:
+
+    progress entering the turn (segments already matched) -> progress leaving it
+
+Patterns are split into '.*'-separated segments exactly as in the streaming
+validator. A new turn is scanned once (only patterns whose segment literals
+occur in it), and the window decision is the composition of the cached
+transitions of the turns in the window - no history is rescanned.
+
+The result matches validating " ".join(window turns), provided no single
+segment (a '.*'-free phrase) straddles two turns. Patterns that cannot be
+split are checked against the joined window text directly.
+
+Each turn is validated on the current pattern snapshot. When a reload has
+published a new version, the window's turn states are rebuilt once for it.
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from behavior_validator import (
+    BehaviorValidator, ValidationResult, current_pattern_snapshot, region_shard_for, ALL_REGION_SHARDS
+)
+from pattern_engine import TierMatch
+from request_context import RequestContext
+from streaming_validator import StreamPattern, get_stream_patterns
+
+TURN_SEPARATOR = " "
+
+# ============================================================================
+# PER-TURN MATCH STATE
+# ============================================================================
+
+@dataclass(frozen=True)
+class TurnState:
+    """One turn plus its cached pattern transitions"""
+    content: str
+    lowered: str
+    # pattern index -> exit progress for each entry progress (== len(segments) means matched)
+    transitions: Dict[int, Tuple[int, ...]] = field(default_factory=dict)
+
+def _greedy_progress(sp: StreamPattern, line: str, progress: int) -> int:
+    """Match segments in order within one line, starting at the given progress"""
+    position = 0
+    while progress < len(sp.segments):
+        key = sp.keys[progress]
+        if key and line.find(key, position) < 0:
+            break
+        m = sp.segments[progress].search(line, position)
+        if m is None:
+            break
+        position = m.end()
+        progress += 1
+    return progress
+
+def _transition(sp: StreamPattern, lowered: str) -> Tuple[int, ...]:
+    """Exit progress of one pattern over one turn, for every entry progress"""
+    lines = lowered.split('\n')
+    complete = len(sp.segments)
+    exits = []
+    for entry in range(complete):
+        progress = entry
+        for index, line in enumerate(lines):
+            if index:
+                progress = 0  # '.*' does not cross newlines
+            progress = _greedy_progress(sp, line, progress)
+            if progress == complete:
+                break
+        exits.append(progress)
+    return tuple(exits)
+
+# ============================================================================
+# CONVERSATION SESSION
+# ============================================================================
+
+class ConversationSession:
+    """Bounded window of recent turns with cached per-turn match state"""
+
+    def __init__(self, session_id: str, validator: Optional[BehaviorValidator] = None,
+                 window_turns: int = 8):
+        self.session_id = session_id
+        self.validator = validator or BehaviorValidator()
+        self.window_turns = window_turns
+        self.turns: Deque[TurnState] = deque(maxlen=window_turns)
+        self.turn_count = 0
+        self.snapshot = None
+        self._load_snapshot(current_pattern_snapshot())
+
+    def _load_snapshot(self, snapshot):
+        """Index a pattern snapshot and rebuild the window's turn states for it"""
+        self.snapshot = snapshot
+        self.stream_patterns, self.deferred = get_stream_patterns(snapshot.evaluator(ALL_REGION_SHARDS))
+        # Segment literal -> patterns with a segment needing it; keyless patterns always run
+        self._by_key: Dict[str, Set[int]] = {}
+        self._always: Set[int] = set()
+        self._shard_pattern_cache: Dict[str, Set[Tuple[str, str]]] = {}
+        for index, sp in enumerate(self.stream_patterns):
+            if not all(sp.keys):
+                self._always.add(index)
+            for key in filter(None, sp.keys):
+                self._by_key.setdefault(key, set()).add(index)
+        self.turns = deque((self._turn_state(turn.content) for turn in self.turns), maxlen=self.window_turns)
+
+    def _turn_state(self, content: str) -> TurnState:
+        lowered = content.lower()
+        touched = set(self._always)
+        for key, indexes in self._by_key.items():
+            if key in lowered:
+                touched |= indexes
+        if '\n' in lowered:
+            # A newline resets partial progress, so every pattern's transition changes
+            touched = range(len(self.stream_patterns))
+
+        transitions = {}
+        for index in touched:
+            sp = self.stream_patterns[index]
+            exits = _transition(sp, lowered)
+            if exits != tuple(range(len(sp.segments))):
+                transitions[index] = exits
+        return TurnState(content, lowered, transitions)
+
+    def _shard_patterns(self, shard: str) -> Set[Tuple[str, str]]:
+        """(tier, pattern) pairs evaluated for a region shard"""
+        patterns = self._shard_pattern_cache.get(shard)
+        if patterns is None:
+            evaluator = self.snapshot.evaluator(shard)
+            patterns = {(tier.name, cp.pattern) for tier in evaluator.tiers
+                        for _, compiled in tier.categories for cp in compiled}
+            self._shard_pattern_cache[shard] = patterns
+        return patterns
+
+    def _window_tier_match(self, window_text: str, shard: str = ALL_REGION_SHARDS) -> Optional[TierMatch]:
+        """Compose cached transitions over the window into the winning tier match"""
+        hits: List[StreamPattern] = []
+        touched = sorted(set().union(*(turn.transitions for turn in self.turns)))
+        for index in touched:
+            sp = self.stream_patterns[index]
+            progress = 0
+            for turn in self.turns:
+                exits = turn.transitions.get(index)
+                if exits is not None:
+                    progress = exits[progress]
+                    if progress == len(sp.segments):
+                        hits.append(sp)
+                        break
+        hits.extend(sp for sp in self.deferred if sp.compiled.search(window_text))
+        if shard != ALL_REGION_SHARDS:
+            # Turn state covers every region shard; keep only this request's shard
+            allowed = self._shard_patterns(shard)
+            hits = [sp for sp in hits if (sp.tier, sp.compiled.pattern) in allowed]
+        if not hits:
+            return None
+
+        tiers = self.snapshot.evaluator(ALL_REGION_SHARDS).tiers
+        tier_names = [tier.name for tier in tiers]
+        categories = [category for tier in tiers for category, _ in tier.categories]
+        winner = min(hits, key=lambda sp: (tier_names.index(sp.tier), categories.index(sp.category)))
+        matched = sorted((sp.compiled for sp in hits
+                          if sp.tier == winner.tier and sp.category == winner.category),
+                         key=lambda cp: cp.order)
+        return TierMatch(
+            tier=winner.tier,
+            category=winner.category,
+            matches=[(cp.confidence, cp.pattern, cp.description) for cp in matched]
+        )
+
+    def add_turn(self, content: str, **validate_kwargs) -> ValidationResult:
+        """
+        Add a turn and validate the window ending with it
+
+        Equivalent to validate_behavior on the window turns joined with a
+        space, but only the new turn is scanned (plus the whole window's
+        normalized form when normalization changes it).
+        """
+        snapshot = current_pattern_snapshot()
+        if snapshot is not self.snapshot:
+            self._load_snapshot(snapshot)
+        self.turns.append(self._turn_state(content))
+        self.turn_count += 1
+
+        window_text = TURN_SEPARATOR.join(turn.content for turn in self.turns)
+        ctx = RequestContext(window_text, session_id=self.session_id)
+        ctx.memo("pattern_snapshot", lambda: snapshot)
+        shard = region_shard_for(validate_kwargs.get("region_rule_status"), snapshot.shards)
+        tier_match = self._window_tier_match(ctx.lowered, shard)
+        if len(ctx.match_forms) > 1:
+            # evasion-normalized window: not tracked incrementally, matched in full
+            evaluator = snapshot.evaluator(shard)
+            tier_match = evaluator.prefer(tier_match, evaluator.evaluate(*ctx.match_forms[1]))
+        ctx.memo(f"behavior_tier_match:{shard}", lambda: tier_match)
+        return self.validator.validate_behavior("auto", window_text, context=ctx, **validate_kwargs)
+
+# ============================================================================
+# SESSION REGISTRY
+# ============================================================================
+
+class ConversationSessionStore:
+    """Conversation sessions keyed by session_id (least recently used evicted)"""
+
+    def __init__(self, max_sessions: int = 10000, window_turns: int = 8,
+                 validator: Optional[BehaviorValidator] = None):
+        self.max_sessions = max_sessions
+        self.window_turns = window_turns
+        self.validator = validator or BehaviorValidator()
+        self.sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+
+    def get(self, session_id: str) -> ConversationSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = ConversationSession(session_id, self.validator, self.window_turns)
+            self.sessions[session_id] = session
+            if len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        else:
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def add_turn(self, session_id: str, content: str, **validate_kwargs) -> ValidationResult:
+        return self.get(session_id).add_turn(content, **validate_kwargs)
+
+    def end(self, session_id: str):
+        self.sessions.pop(session_id, None)
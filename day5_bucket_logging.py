@@ -6,6 +6,7 @@ Enhanced logging with enforcement_decision_id and audit verification
 
 from behavior_validator import validate_behavior
 from enforcement_adapter import EnforcementAdapter
+from request_context import RequestContext
 import json
 import hashlib
 import time
@@ -31,6 +32,9 @@ class BucketLogger:
         self.enforcement_counter += 1
         enforcement_decision_id = f"enf_{self.enforcement_counter:06d}"
         
+        # Shared by validation, enforcement and the log entries below
+        request_context = RequestContext(user_input, user_id=user_id)
+        
         # Get validator decision
         validation_result = validate_behavior(
             intent="auto",
@@ -38,11 +42,14 @@ class BucketLogger:
             age_gate_status=user_context.get("age_gate_status", False) if user_context else False,
             region_rule_status=user_context.get("region_rule_status") if user_context else None,
             platform_policy_state=user_context.get("platform_policy_state") if user_context else None,
-            karma_bias_input=user_context.get("karma_bias_input", 0.5) if user_context else 0.5
+            karma_bias_input=user_context.get("karma_bias_input", 0.5) if user_context else 0.5,
+            context=request_context
         )
         
         # Get enforcement decision
-        enforcement_result = self.adapter.map_validator_to_enforcement(user_input)
+        enforcement_result = self.adapter.map_validator_to_enforcement(
+            user_input, context=request_context
+        )
         
         # Create bucket log entry with ALL required fields
         bucket_entry = {
@@ -54,7 +61,7 @@ class BucketLogger:
             "enforcement_decision": enforcement_result["decision"],
             "enforcement_severity": enforcement_result["severity"],
             "enforcement_confidence": enforcement_result["confidence"],
-            "user_id_hash": hashlib.md5(user_id.encode()).hexdigest()[:8],
+            "user_id_hash": request_context.user_id_hash,
             "bucket_id": f"bucket_{validation_result['trace_id'][-8:]}",
             "timestamp": datetime.now().isoformat(),
             "validator_version": "v1.0-PRODUCTION-FROZEN"
@@ -0,0 +1,263 @@
+"""
+DELAYED DELIVERY SCHEDULER - Holds DELAY decisions and releases them on time
+Used for InboundValidationResult.delay_duration and MediationResult.delay_until
+
+Pending messages sit in a hierarchical timer wheel: WHEEL_LEVELS wheels of
+WHEEL_SIZE slots, level L covering delays below WHEEL_SIZE ** (L + 1) ticks.
+A message goes into the slot of the lowest level that covers its delay, and
+each slot is a dict, so schedule and cancel are O(1). When the lower wheel
+wraps, the next slot of the wheel above is cascaded down. Every message is
+moved at most WHEEL_LEVELS times before it becomes due.
+
+Due messages move to a FIFO ready queue. poll() releases at most
+`max_batches_per_poll` batches of `batch_size` messages per call through the
+`deliver` callback, so the millions of quiet-hours messages due at 7 AM
+drain over successive polls instead of all at once. `spread_seconds` can add
+a per-message offset (stable per message id) on top of that.
+
+With `log_path` set, every schedule, cancel and delivered batch is appended
+to a JSON-lines log before the call returns. Restarting with the same log
+restores the pending messages. The log is compacted on open and whenever
+finished records outnumber pending ones.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from result_types import SLOTS
+
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_LEVELS = 4
+_SLOT_MASK = WHEEL_SIZE - 1
+_MAX_DELAY_TICKS = 1 << (WHEEL_BITS * WHEEL_LEVELS)  # longer delays are re-placed when reached
+
+@dataclass(**SLOTS)
+class PendingMessage:
+    message_id: str
+    deliver_at: float  # epoch seconds
+    payload: Any
+    due_tick: int = 0
+
+def delivery_time(result: Any, now: float) -> float:
+    """Epoch seconds a DELAY result should be released at (MediationResult or InboundValidationResult)"""
+    delay_until = getattr(result, "delay_until", None)
+    if delay_until:
+        return datetime.fromisoformat(delay_until.replace("Z", "+00:00")).timestamp()
+    delay_duration = getattr(result, "delay_duration", 0)
+    if delay_duration > 0:
+        return now + delay_duration
+    raise ValueError("Result carries no delay")
+
+class DelayedDeliveryScheduler:
+    """Timer-wheel store of messages to deliver later, released in batches"""
+
+    def __init__(self, deliver: Callable[[List[PendingMessage]], None],
+                 log_path: Optional[str] = None, tick_seconds: float = 1.0,
+                 batch_size: int = 1000, max_batches_per_poll: int = 10,
+                 spread_seconds: float = 0.0, fsync: bool = False,
+                 clock: Callable[[], float] = time.time):
+        self.deliver = deliver
+        self.log_path = log_path
+        self.tick_seconds = tick_seconds
+        self.batch_size = batch_size
+        self.max_batches_per_poll = max_batches_per_poll
+        self.spread_seconds = spread_seconds
+        self.fsync = fsync
+        self.clock = clock
+
+        self._wheels: List[List[Dict[str, PendingMessage]]] = [
+            [{} for _ in range(WHEEL_SIZE)] for _ in range(WHEEL_LEVELS)
+        ]
+        self._ready: "OrderedDict[str, PendingMessage]" = OrderedDict()
+        self._slot_of: Dict[str, Dict[str, PendingMessage]] = {}  # message id -> slot (or ready queue)
+        self._tick = math.floor(clock() / tick_seconds)
+        self._lock = threading.Lock()
+        self._log = None
+        self._log_records = 0
+        self.delivered = 0
+        if log_path:
+            self._open_log()
+
+    # ------------------------------------------------------------------
+    # Wheel
+    # ------------------------------------------------------------------
+
+    def _place(self, pending: PendingMessage):
+        """Put a message in the slot covering its delay (lock held)"""
+        delay = pending.due_tick - self._tick
+        if delay <= 0:
+            slot: Dict[str, PendingMessage] = self._ready
+        else:
+            target = pending.due_tick if delay < _MAX_DELAY_TICKS else self._tick + _MAX_DELAY_TICKS - 1
+            level = ((target - self._tick).bit_length() - 1) // WHEEL_BITS
+            slot = self._wheels[level][(target >> (WHEEL_BITS * level)) & _SLOT_MASK]
+        slot[pending.message_id] = pending
+        self._slot_of[pending.message_id] = slot
+
+    def _advance(self, now: float):
+        """Move every message due by `now` to the ready queue (lock held)"""
+        target = math.floor(now / self.tick_seconds)
+        while self._tick < target:
+            if len(self._slot_of) == len(self._ready):
+                self._tick = target  # wheels are empty: nothing to cascade
+                break
+            self._tick += 1
+            tick = self._tick
+            # cascade from the highest wrapping wheel down, so entries can fall through several levels
+            level = 1
+            while level < WHEEL_LEVELS and not tick & ((1 << (WHEEL_BITS * level)) - 1):
+                level += 1
+            for upper in range(level - 1, 0, -1):
+                slot = self._wheels[upper][(tick >> (WHEEL_BITS * upper)) & _SLOT_MASK]
+                cascading = list(slot.values())
+                slot.clear()
+                for pending in cascading:
+                    self._place(pending)
+            slot = self._wheels[0][tick & _SLOT_MASK]
+            for message_id, pending in slot.items():
+                self._ready[message_id] = pending
+                self._slot_of[message_id] = self._ready
+            slot.clear()
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def schedule(self, message_id: str, payload: Any, deliver_at: float):
+        """Hold payload until deliver_at (epoch seconds); replaces a pending message with the same id"""
+        if self.spread_seconds:
+            deliver_at += (zlib.crc32(message_id.encode()) % 1000) / 1000 * self.spread_seconds
+        pending = PendingMessage(message_id, deliver_at, payload, math.ceil(deliver_at / self.tick_seconds))
+        with self._lock:
+            self._append({"op": "schedule", "id": message_id, "deliver_at": deliver_at, "payload": payload})
+            self._remove(message_id)
+            self._place(pending)
+
+    def schedule_result(self, message_id: str, payload: Any, result: Any, now: Optional[float] = None):
+        """Hold payload for a DELAY result (delay_until or delay_duration)"""
+        self.schedule(message_id, payload, delivery_time(result, self.clock() if now is None else now))
+
+    def cancel(self, message_id: str) -> bool:
+        """Drop a pending message; False when it is unknown or already delivered"""
+        with self._lock:
+            if message_id not in self._slot_of:
+                return False
+            self._append({"op": "cancel", "ids": [message_id]})
+            self._remove(message_id)
+            return True
+
+    def _remove(self, message_id: str):
+        slot = self._slot_of.pop(message_id, None)
+        if slot is not None:
+            del slot[message_id]
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """Deliver due messages in batches (bounded per call); returns how many were delivered"""
+        delivered = 0
+        for _ in range(self.max_batches_per_poll):
+            with self._lock:
+                self._advance(self.clock() if now is None else now)
+                batch = []
+                while self._ready and len(batch) < self.batch_size:
+                    _, pending = self._ready.popitem(last=False)
+                    del self._slot_of[pending.message_id]
+                    batch.append(pending)
+            if not batch:
+                break
+            try:
+                self.deliver(batch)
+            except Exception:
+                with self._lock:  # back to the front of the queue for the next poll
+                    for pending in reversed(batch):
+                        if pending.message_id not in self._slot_of:
+                            self._ready[pending.message_id] = pending
+                            self._ready.move_to_end(pending.message_id, last=False)
+                            self._slot_of[pending.message_id] = self._ready
+                raise
+            with self._lock:
+                self._append({"op": "done", "ids": [pending.message_id for pending in batch]})
+                self._maybe_compact()
+            delivered += len(batch)
+        self.delivered += delivered
+        return delivered
+
+    def ready_count(self) -> int:
+        """Messages due and waiting for a poll"""
+        return len(self._ready)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, message_id: str) -> bool:
+        return message_id in self._slot_of
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _append(self, record: Dict):
+        """Write one log record (lock held)"""
+        if self._log is None:
+            return
+        self._log.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._log_records += 1
+
+    def _open_log(self):
+        """Replay an existing log into the wheel, then compact it"""
+        pending: Dict[str, PendingMessage] = {}
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash mid-write
+                    if record["op"] == "schedule":
+                        deliver_at = record["deliver_at"]
+                        pending[record["id"]] = PendingMessage(record["id"], deliver_at, record["payload"],
+                                                               math.ceil(deliver_at / self.tick_seconds))
+                    else:
+                        for message_id in record["ids"]:
+                            pending.pop(message_id, None)
+        for message in sorted(pending.values(), key=lambda message: message.deliver_at):
+            self._place(message)
+        self._compact()
+
+    def _maybe_compact(self):
+        if self._log is not None and self._log_records > 2 * len(self._slot_of) + 1000:
+            self._compact()
+
+    def _compact(self):
+        """Rewrite the log with only pending messages (lock held)"""
+        if self._log is not None:
+            self._log.close()
+        temp_path = self.log_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for slot in [self._ready] + [slot for wheel in self._wheels for slot in wheel]:
+                for pending in slot.values():
+                    f.write(json.dumps({"op": "schedule", "id": pending.message_id,
+                                        "deliver_at": pending.deliver_at, "payload": pending.payload},
+                                       separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.log_path)
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        self._log_records = len(self._slot_of)
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
@@ -0,0 +1,176 @@
+"""
+DIGEST BATCHER - Accumulates batched-delivery messages into one digest per user
+Used with PreferenceMediator for BATCHED_HOURLY / BATCHED_DAILY users
+
+should_deliver_now() returns (False, "batched_delivery") for low and medium
+urgency messages of batched users. add() keeps those messages per user,
+coalesced by (source, urgency): each group holds a count, the time range and
+the first few messages. When the user's hour or day (UTC, aligned to the
+boundary) ends, flush_due() turns everything the user received into one
+digest, runs it through transform_content once, and hands it to `deliver`.
+That gives one transformation and one notification per user per window
+instead of one per message.
+
+Memory is bounded: at most `max_samples` messages are kept per group and
+`max_groups` groups per user (further sources fold into an "other sources"
+group). Past `max_users` pending digests, the user whose window started
+first is flushed early.
+"""
+
+import heapq
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from preference_transformation_logic import NotificationFrequency, PreferenceMediator
+
+URGENCY_ORDER = ("low", "medium", "high", "critical")
+OTHER_SOURCES = "other sources"
+WINDOW_SECONDS = {
+    NotificationFrequency.BATCHED_HOURLY: 3600,
+    NotificationFrequency.BATCHED_DAILY: 86400,
+}
+
+@dataclass
+class DigestGroup:
+    """Messages from one source at one urgency"""
+    source: str
+    urgency: str
+    count: int = 0
+    first_at: float = 0.0
+    last_at: float = 0.0
+    samples: List[str] = field(default_factory=list)
+
+@dataclass
+class PendingDigest:
+    user_id: str
+    window_start: float
+    window_end: float
+    groups: Dict[Tuple[str, str], DigestGroup] = field(default_factory=dict)
+    risk_categories: Set[str] = field(default_factory=set)
+    message_count: int = 0
+
+def _messages(count: int) -> str:
+    return f"{count} message{'s' if count != 1 else ''}"
+
+def _urgency_rank(urgency: str) -> int:
+    return URGENCY_ORDER.index(urgency) if urgency in URGENCY_ORDER else 1
+
+class DigestBatcher:
+    """Per-user digest accumulator flushed on hourly/daily boundaries"""
+
+    def __init__(self, mediator: PreferenceMediator, deliver: Callable[[Dict], None],
+                 max_groups: int = 20, max_samples: int = 3, max_users: int = 100000,
+                 clock: Callable[[], float] = time.time):
+        self.mediator = mediator
+        self.deliver = deliver
+        self.max_groups = max_groups
+        self.max_samples = max_samples
+        self.max_users = max_users
+        self.clock = clock
+        self._pending: Dict[str, PendingDigest] = {}
+        self._windows: List[Tuple[float, float, str]] = []  # (window_end, window_start, user_id) heap
+        self._lock = threading.Lock()
+        self.messages_batched = 0
+        self.digests_delivered = 0
+
+    def add(self, user_id: str, content: str, source: str = "unknown", urgency: str = "medium",
+            risk_categories: Optional[List[str]] = None, now: Optional[float] = None):
+        """Hold a message for the user's next digest"""
+        now = self.clock() if now is None else now
+        overflow = None
+        with self._lock:
+            digest = self._pending.get(user_id)
+            if digest is None:
+                frequency = self.mediator.compiled_preferences(user_id).notification_frequency
+                window = WINDOW_SECONDS.get(frequency, 3600)
+                start = now - now % window
+                digest = self._pending[user_id] = PendingDigest(user_id, start, start + window)
+                heapq.heappush(self._windows, (digest.window_end, start, user_id))
+                if len(self._pending) > self.max_users:
+                    overflow = self._pop_earliest()
+
+            key = (source, urgency)
+            group = digest.groups.get(key)
+            if group is None:
+                if len(digest.groups) >= self.max_groups:
+                    key = (OTHER_SOURCES, urgency)
+                    group = digest.groups.get(key)
+                if group is None:
+                    group = digest.groups[key] = DigestGroup(key[0], urgency, first_at=now)
+            group.count += 1
+            group.last_at = now
+            if len(group.samples) < self.max_samples:
+                group.samples.append(content)
+            if risk_categories:
+                digest.risk_categories.update(risk_categories)
+            digest.message_count += 1
+            self.messages_batched += 1
+        if overflow is not None:
+            self._deliver(overflow)
+
+    def _pop_earliest(self) -> Optional[PendingDigest]:
+        """Remove the digest with the earliest window end (lock held)"""
+        while self._windows:
+            _, start, user_id = heapq.heappop(self._windows)
+            digest = self._pending.get(user_id)
+            if digest is not None and digest.window_start == start:
+                return self._pending.pop(user_id)
+        return None
+
+    def flush_due(self, now: Optional[float] = None) -> int:
+        """Deliver every digest whose window has ended; returns how many were delivered"""
+        now = self.clock() if now is None else now
+        due = []
+        with self._lock:
+            while self._windows and self._windows[0][0] <= now:
+                _, start, user_id = heapq.heappop(self._windows)
+                digest = self._pending.get(user_id)
+                if digest is not None and digest.window_start == start:
+                    due.append(self._pending.pop(user_id))
+        for digest in due:
+            self._deliver(digest)
+        return len(due)
+
+    def flush_user(self, user_id: str) -> bool:
+        """Deliver a user's digest now (e.g. on-demand check); False when nothing is pending"""
+        with self._lock:
+            digest = self._pending.pop(user_id, None)
+        if digest is None:
+            return False
+        self._deliver(digest)
+        return True
+
+    def _deliver(self, digest: PendingDigest):
+        self.deliver(self.build_digest(digest))
+        self.digests_delivered += 1
+
+    def build_digest(self, digest: PendingDigest) -> Dict:
+        """One transform_content call for everything in the window"""
+        groups = sorted(digest.groups.values(), key=lambda group: (-_urgency_rank(group.urgency), -group.count))
+        lines = [f"{_messages(digest.message_count)} since last digest:"]
+        for group in groups:
+            lines.append(f"- {group.source} ({group.urgency}): {_messages(group.count)}")
+            lines.extend(f'    "{sample}"' for sample in group.samples)
+            if group.count > len(group.samples):
+                lines.append(f"    ... and {group.count - len(group.samples)} more")
+        sources = {group.source for group in groups}
+        context = {
+            "urgency": groups[0].urgency,
+            "source": sources.pop() if len(sources) == 1 else "multiple",
+            "risk_categories": sorted(digest.risk_categories),
+        }
+        transformed = self.mediator.transform_content("\n".join(lines), digest.user_id, context)
+        return {
+            "user_id": digest.user_id,
+            "delivery_status": "digest",
+            "message_count": digest.message_count,
+            "group_count": len(groups),
+            "window_start": digest.window_start,
+            "window_end": digest.window_end,
+            **transformed,
+        }
+
+    def __len__(self) -> int:
+        return len(self._pending)
@@ -6,6 +6,7 @@ Day 1.5 deliverable with safety-first resolution
 
 from enum import Enum
 from behavior_validator import BehaviorValidator, Decision, RiskCategory
+from request_context import RequestContext
 import hashlib
 
 class EnforcementState(Enum):
@@ -28,13 +29,15 @@ class EnforcementAdapter:
     def __init__(self):
         self.validator = BehaviorValidator()
     
-    def map_validator_to_enforcement(self, text, category="general"):
+    def map_validator_to_enforcement(self, text, category="general", context=None):
         """
         Map validator decision to enforcement state with required output
         
         Args:
             text: Input text to validate
             category: Risk category for validation
+            context: RequestContext for text, shared with the validation step
+                     so patterns and hashes are not recomputed
             
         Returns:
             dict with decision, severity, confidence, trace_id
@@ -46,7 +49,8 @@ class EnforcementAdapter:
             age_gate_status=False,
             region_rule_status=None,
             platform_policy_state=None,
-            karma_bias_input=0.5
+            karma_bias_input=0.5,
+            context=context
         )
         
         # Extract validator decision
@@ -12,6 +12,8 @@ from typing import Dict, List, Optional, Any
 from enum import Enum
 from dataclasses import dataclass, asdict
 
+from result_types import SLOTS, SerializedResult
+
 class EnforcementDecision(Enum):
     ALLOW = "allow"
     BLOCK = "block"
@@ -33,8 +35,8 @@ class ActionRequest:
     timestamp: str
     trace_id: str
 
-@dataclass
-class EnforcementResult:
+@dataclass(frozen=True, **SLOTS)
+class EnforcementResult(SerializedResult):
     action_id: str
     decision: EnforcementDecision
     reason: str
@@ -42,8 +44,8 @@ class EnforcementResult:
     enforcement_timestamp: str
     approval_token: Optional[str] = None
 
-@dataclass
-class ExecutionResult:
+@dataclass(frozen=True, **SLOTS)
+class ExecutionResult(SerializedResult):
     action_id: str
     status: ExecutionStatus
     trace_id: str
@@ -51,8 +53,8 @@ class ExecutionResult:
     approval_token: Optional[str] = None
     error_message: Optional[str] = None
 
-@dataclass
-class BucketLogEntry:
+@dataclass(frozen=True, **SLOTS)
+class BucketLogEntry(SerializedResult):
     trace_id: str
     action_id: str
     stage: str
@@ -274,7 +276,7 @@ class AshmitBucketLogger:
     
     def export_bucket_logs(self) -> List[Dict]:
         """Export all bucket logs"""
-        return [asdict(log) for log in self.bucket_logs]
+        return [log.to_dict() for log in self.bucket_logs]
 
 class EnforcementExecutionSystem:
     """Complete system proving no bypass exists"""
@@ -319,9 +321,9 @@ class EnforcementExecutionSystem:
         return {
             "action_id": action_id,
             "trace_id": trace_id,
-            "enforcement": asdict(enforcement_result),
-            "execution": asdict(execution_result),
-            "bucket_logs": [asdict(log) for log in self.ashmit_logger.get_logs_by_trace_id(trace_id)]
+            "enforcement": enforcement_result.to_dict(),
+            "execution": execution_result.to_dict(),
+            "bucket_logs": [log.to_dict() for log in self.ashmit_logger.get_logs_by_trace_id(trace_id)]
         }
 
 def run_enforcement_execution_proof():
@@ -486,6 +488,8 @@ def run_enforcement_execution_proof():
             return [make_json_safe(item) for item in obj]
         elif hasattr(obj, 'value'):  # Enum
             return obj.value
+        elif isinstance(obj, SerializedResult):  # Slotted result (no __dict__)
+            return make_json_safe(obj.to_dict())
         elif hasattr(obj, '__dict__'):  # Object with attributes
             return {k: make_json_safe(v) for k, v in obj.__dict__.items()}
         else:
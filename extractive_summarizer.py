@@ -0,0 +1,172 @@
+"""
+EXTRACTIVE SUMMARIZER - Bounded-cost summaries for SUMMARIZE decisions
+Used by InboundBehaviorValidator._generate_summary
+
+Picks the most informative sentences of a long message instead of cutting it
+at a fixed length:
+
+    1. split into sentences once (end punctuation or line breaks), dropping
+       repeats, with str.translate/split passes rather than regexes
+    2. count each sentence's words over the whole message
+    3. score each sentence by the mean weight of its distinct content words:
+       term frequency in the message (SumBasic) times a precomputed weight
+       (stopwords 0, actionable terms such as dates, deadlines and requests
+       boosted), with a small bonus for the opening sentence
+    4. keep the top `max_sentences`, in their original order, within
+       `max_chars`, and mark the result with SUMMARY_SUFFIX
+
+Content of at most SUMMARY_MIN_CHARS is returned as is, like the truncating
+summary this replaces; anything longer is always summarized, so every
+SUMMARIZE decision on such content carries the suffix even when the
+selected sentences are the whole text (multi-line or number-heavy messages
+can trigger SUMMARIZE well under `max_chars`).
+
+Every step is linear in the text, and input past MAX_INPUT_CHARS (the
+hardened validator's limit) is not read, so the cost per message is capped.
+Run this module to benchmark it: it stays under BUDGET_MS at 10KB.
+"""
+
+import heapq
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+MAX_INPUT_CHARS = 10000
+MAX_SENTENCES_SCORED = 400
+SUMMARY_MIN_CHARS = 100
+SUMMARY_MAX_CHARS = 200
+SUMMARY_MAX_SENTENCES = 2
+SUMMARY_SUFFIX = " [Content summarized for readability]"
+BUDGET_MS = 1.0
+
+# Sentence ends: terminators get a line break after them in the original text
+# and become the line break in the folded copy, so both split into the same
+# pieces (lower() never adds or removes line breaks). Other punctuation becomes
+# a space in the folded copy, so str.split() yields the words. Breaks are added
+# with str.replace: translate to a multi-character string leaves its fast path.
+_TERMINATORS = ".!?"
+_FOLD_TABLE = str.maketrans({
+    **{char: "\n" for char in _TERMINATORS},
+    **{char: " " for char in "\"#$%&()*+,-/:;<=>@[\\]^_`{|}~\t\r"},
+})
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i i'm if in into is it it's its itself just let's
+me more most my myself no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that that's the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom why
+will with would you you're your yours yourself yourselves also get got im ive thats dont
+""".split())
+
+# Terms that usually carry what the recipient has to know or do
+TERM_WEIGHTS: Dict[str, float] = {
+    **{word: 2.0 for word in (
+        "deadline", "due", "meeting", "call", "reply", "respond", "confirm", "cancel", "cancelled",
+        "reschedule", "moved", "tomorrow", "today", "tonight", "monday", "tuesday", "wednesday",
+        "thursday", "friday", "saturday", "sunday", "am", "pm", "please", "need", "asap", "important",
+        "payment", "invoice", "appointment", "address", "schedule", "required", "action",
+    )},
+    **{word: 0.5 for word in ("thanks", "thank", "hi", "hello", "hey", "regards", "cheers", "lol", "ok", "okay")},
+}
+DIGIT_WEIGHT = 1.5  # times, dates, amounts
+LEAD_BONUS = 1.2
+
+@lru_cache(maxsize=65536)
+def _weight(term: str) -> float:
+    if term in STOPWORDS:
+        return 0.0
+    weight = TERM_WEIGHTS.get(term)
+    if weight is not None:
+        return weight
+    return 1.0 if term.isalpha() else DIGIT_WEIGHT if any(char.isdigit() for char in term) else 1.0
+
+def split_sentences(text: str) -> List[Tuple[str, List[str]]]:
+    """Distinct (sentence, lowercase words) pairs in order, at most MAX_SENTENCES_SCORED"""
+    broken = text
+    for terminator in _TERMINATORS:
+        if terminator in broken:
+            broken = broken.replace(terminator, terminator + "\n")
+    pieces = broken.split("\n")
+    folded = text.lower().translate(_FOLD_TABLE).split("\n")
+    sentences: Dict[str, List[str]] = {}
+    for piece, words in zip(pieces, folded):
+        words = words.split()
+        if words:
+            sentence = piece.strip()
+            if sentence not in sentences:
+                sentences[sentence] = words
+                if len(sentences) >= MAX_SENTENCES_SCORED:
+                    break
+    return list(sentences.items())
+
+def _clip(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit - 3)
+    return text[:cut if cut > limit // 2 else limit - 3].rstrip() + "..."
+
+def summarize(content: str, max_chars: int = SUMMARY_MAX_CHARS,
+              max_sentences: int = SUMMARY_MAX_SENTENCES) -> str:
+    """Top sentences of content in original order (content itself when at most SUMMARY_MIN_CHARS)"""
+    if len(content) <= SUMMARY_MIN_CHARS:
+        return content
+    sentences = split_sentences(content[:MAX_INPUT_CHARS])
+    if not sentences:
+        return _clip(content, max_chars) + SUMMARY_SUFFIX
+
+    counts: Counter = Counter()
+    for _, words in sentences:
+        counts.update(words)
+    total = sum(counts.values())
+    weights = {term: count / total * _weight(term) for term, count in counts.items()}
+
+    scored = []
+    for index, (_, words) in enumerate(sentences):
+        distinct = set(words)
+        score = sum(map(weights.__getitem__, distinct)) / len(distinct)
+        if index == 0:
+            score *= LEAD_BONUS
+        scored.append((score, -index))
+    chosen = sorted(-index for _, index in heapq.nlargest(max_sentences, scored))
+
+    summary = ""
+    for index in chosen:
+        sentence = sentences[index][0]
+        candidate = f"{summary} {sentence}" if summary else sentence
+        if len(candidate) > max_chars:
+            if not summary:
+                summary = _clip(sentence, max_chars)
+            break
+        summary = candidate
+    return summary + SUMMARY_SUFFIX
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+SAMPLE_PARAGRAPH = (
+    "Hi all, quick update on the project. The client meeting moved to Thursday at 3pm in room 204. "
+    "Please confirm you can attend by tomorrow. Invoice #4471 for $1,250 is due on the 15th. "
+    "Also, the new coffee machine arrived and it is great. Lunch is provided. "
+    "Let me know if you have questions.\n"
+)
+
+def benchmark(length: int = MAX_INPUT_CHARS, runs: int = 200) -> float:
+    """Median milliseconds to summarize `length` characters of message text"""
+    text = (SAMPLE_PARAGRAPH * (length // len(SAMPLE_PARAGRAPH) + 1))[:length]
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        summarize(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+if __name__ == "__main__":
+    for length in (1000, 2500, 5000, MAX_INPUT_CHARS, 4 * MAX_INPUT_CHARS):
+        median = benchmark(length)
+        status = "OK" if median <= BUDGET_MS else "OVER"
+        print(f"{length:6d} chars  {median:6.3f}ms  budget {BUDGET_MS:.1f}ms  {status}")
@@ -11,8 +11,7 @@ from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
-# Configure logging to catch all issues
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Logging is configured by the application (see __main__), not at import
 logger = logging.getLogger(__name__)
 
 class ValidationError(Exception):
@@ -476,6 +475,7 @@ class HardenedValidator:
 
 # Example usage with error simulation
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     validator = HardenedValidator()
     
     print("🛡️  HARDENED VALIDATOR - FAIL-SAFE TESTING")
@@ -0,0 +1,115 @@
+"""
+HEAVY HITTERS - Fixed-memory tracking of the senders with the most offenses
+Updated by InboundBehaviorValidator (ESCALATE/SILENCE) and MediationSystem (BLOCK)
+
+Exact per-sender counts grow with the number of senders. A count-min sketch
+keeps `depth` rows of `width` counters instead: a sender adds one to a
+counter in each row and its estimate is the smallest of those counters. An
+estimate is never below the true count. With probability 1 - e**-depth it is
+at most (e / width) * total offenses above it, whatever the number of
+senders.
+
+The `k` senders with the highest estimates are kept in a min-heap, so the
+"top offenders" snapshot needs no scan of the sketch. The snapshot holds
+sender ids and is read in-process through safety_api.offender_metrics(); it
+is deliberately not part of the public /health response.
+Estimates only grow, so heap entries left behind by an update are skipped
+when they reach the top and the heap is rebuilt when stale entries pile up.
+"""
+
+import hashlib
+import heapq
+import threading
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+class CountMinSketch:
+    """Approximate counts for arbitrary keys in depth x width counters"""
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, key: str) -> List[int]:
+        # one 128-bit hash split in two, combined per row (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add count to key; returns its new estimate"""
+        estimate = None
+        for row, index in zip(self.rows, self._indexes(key)):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        self.total += count
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+class HeavyHitters:
+    """Top-k keys by count-min estimate"""
+
+    def __init__(self, k: int = 20, width: int = 4096, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self._top: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Count an offense for key; returns its estimated total"""
+        with self._lock:
+            estimate = self.sketch.add(key, count)
+            if key not in self._top and len(self._top) >= self.k:
+                floor_estimate, floor_key = self._floor()
+                if estimate <= floor_estimate:
+                    return estimate
+                del self._top[floor_key]
+                heapq.heappop(self._heap)
+            self._top[key] = estimate
+            heapq.heappush(self._heap, (estimate, key))
+            if len(self._heap) > 4 * self.k:
+                self._heap = [(value, name) for name, value in self._top.items()]
+                heapq.heapify(self._heap)
+            return estimate
+
+    def _floor(self) -> Tuple[int, str]:
+        """Lowest live heap entry, dropping stale ones (lock held)"""
+        while self._heap[0][0] != self._top.get(self._heap[0][1]):
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def estimate(self, key: str) -> int:
+        with self._lock:
+            return self.sketch.estimate(key)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """(key, estimate) pairs, highest first"""
+        with self._lock:
+            ranked = sorted(self._top.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:n]
+
+    def snapshot(self, n: Optional[int] = None) -> Dict:
+        """JSON-ready view for internal metrics (contains sender ids)"""
+        return {
+            "total_offenses": self.sketch.total,
+            "top_offenders": [{"sender_id": key, "offenses": count} for key, count in self.top(n)],
+        }
+
+# Shared by the validators so one snapshot covers every inbound path
+_offender_tracker: Optional[HeavyHitters] = None
+_tracker_lock = threading.Lock()
+
+def get_offender_tracker() -> HeavyHitters:
+    """Process-wide offender tracker, created on first use"""
+    global _offender_tracker
+    if _offender_tracker is None:
+        with _tracker_lock:
+            if _offender_tracker is None:
+                _offender_tracker = HeavyHitters()
+    return _offender_tracker
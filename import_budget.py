@@ -0,0 +1,91 @@
+"""
+IMPORT BUDGET - Import-time benchmark for cold-start sensitive modules
+Run: python import_budget.py  (exit code 1 when a module is over budget)
+
+Each module is imported in a fresh interpreter under `python -X importtime`
+and its cumulative import time (best of several runs) is compared with its
+budget. Budgets are for a machine where the reference imports (stdlib
+modules every validator needs) cost REFERENCE_BASELINE_MS; on a slower
+machine they are scaled by the measured reference cost, so the check holds
+the repo's own modules to the same budget everywhere. Lazy modules are also
+checked for what they must NOT pull in: the safety_api facade, for example,
+may not import any validator module. Timings depend on the machine and
+its load, so only the forbidden-import check runs in the unit suite
+(test_lazy_imports.py); run this script to check the budgets.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+# Cumulative import time budgets in milliseconds at the reference baseline
+# (about 2x the measured cost)
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "safety_api": 10.0,
+    "behavior_validator": 100.0,
+    "inbound_behavior_validator": 80.0,
+    "unified_validator": 60.0,
+    "mediation_system": 70.0,
+    "hardened_validator": 70.0,
+}
+
+# Stdlib imports shared by the validators, timed to calibrate the budgets
+REFERENCE_IMPORTS = ("re", "json", "typing", "dataclasses", "enum", "hashlib", "datetime")
+REFERENCE_BASELINE_MS = 30.0
+
+# Modules that must stay unloaded after importing the key module
+FORBIDDEN_IMPORTS: Dict[str, List[str]] = {
+    "safety_api": ["behavior_validator", "inbound_behavior_validator", "unified_validator",
+                   "mediation_system", "pattern_engine", "typing", "threading"],
+    "behavior_validator": ["concurrent.futures"],
+    "inbound_behavior_validator": ["behavior_validator"],
+}
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def measure_import(module: str) -> Tuple[float, Set[str]]:
+    """(cumulative import time in ms, modules imported) for one fresh import"""
+    modules = [name.strip() for name in module.split(",")]
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    cumulative_us, imported = 0, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imported.add(name.strip())
+        if name.strip() in modules and not name.startswith("  "):  # top-level entry
+            cumulative_us += int(cumulative)
+    return cumulative_us / 1000.0, imported
+
+def budget_scale(runs: int = 5) -> float:
+    """How much slower this machine imports the reference modules (at least 1)"""
+    reference = min(measure_import(", ".join(REFERENCE_IMPORTS))[0] for _ in range(runs))
+    return max(1.0, reference / REFERENCE_BASELINE_MS)
+
+def check_import_budgets(runs: int = 5) -> List[str]:
+    """Violations (empty when every module is within budget)"""
+    violations = []
+    scale = budget_scale(runs)
+    print(f"reference imports x{scale:.2f} of baseline")
+    for module, base_budget in IMPORT_BUDGETS_MS.items():
+        budget = base_budget * scale
+        samples = [measure_import(module) for _ in range(runs)]
+        best = min(ms for ms, _ in samples)
+        status = "OK" if best <= budget else "OVER"
+        print(f"{module:30s} {best:8.1f}ms  budget {budget:6.1f}ms  {status}")
+        if best > budget:
+            violations.append(f"{module}: {best:.1f}ms > {budget:.1f}ms")
+        loaded = samples[0][1] & set(FORBIDDEN_IMPORTS.get(module, []))
+        if loaded:
+            violations.append(f"{module} imports {sorted(loaded)}")
+    return violations
+
+if __name__ == "__main__":
+    problems = check_import_budgets()
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
@@ -7,12 +7,25 @@ Extends existing validator to handle inbound content with new decision types
 import re
 import hashlib
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
 
 # Import base validator components
-from behavior_validator import BehaviorValidator, RiskCategory, ReasonCode
+from behavior_types import ReasonCode
+from extractive_summarizer import summarize
+from heavy_hitters import HeavyHitters, get_offender_tracker
+from near_duplicate_index import NearDuplicateIndex
+from sender_rate_tracker import UNTRACKED_SENDERS, SenderRateTracker
+from pattern_artifact import get_pattern_artifact
+from pattern_engine import PatternTier, TierMatch, TieredPatternEvaluator
+from trace_ids import ContentDigest, get_trace_id_service
+from request_context import RequestContext
+from result_types import SLOTS, SerializedResult
+from text_features import TextFeatures
+
+if TYPE_CHECKING:
+    from behavior_validator import BehaviorValidator
 
 # ============================================================================
 # INBOUND-SPECIFIC ENUMS AND DATA STRUCTURES
@@ -35,8 +48,8 @@ class InboundRiskCategory(str, Enum):
     INFORMATION_OVERLOAD = "information_overload"
     CLEAN_INBOUND = "clean_inbound"
 
-@dataclass
-class InboundValidationResult:
+@dataclass(frozen=True, **SLOTS)
+class InboundValidationResult(SerializedResult):
     """Inbound validation result with direction flag"""
     direction: str  # "inbound" flag
     decision: InboundDecision
@@ -50,7 +63,7 @@ class InboundValidationResult:
     safe_summary: str = ""
     delay_duration: int = 0  # seconds to delay
     
-    def to_dict(self) -> Dict:
+    def _serialize(self) -> Dict:
         return {
             "direction": self.direction,
             "decision": self.decision.value,
@@ -128,23 +141,94 @@ class InboundPatternLibrary:
             (r'(\b\d+\b.*){10,}', 70, "Number-heavy content"),  # 10+ numbers
         ]
     }
+    
+    # Text-feature checks equivalent to SUMMARIZE_PATTERNS (see text_features.py);
+    # evaluated instead of the regexes, which backtrack heavily on long lines
+    SUMMARIZE_FEATURE_RULES: Dict[str, Callable[[TextFeatures], bool]] = {
+        r'.{200,}': lambda features: features.longest_line >= 200,
+        r'(\n.*){4,}': lambda features: features.newline_count >= 4,
+        r'(\b\d+\b.*){10,}': lambda features: features.max_line_digit_runs >= 10,
+    }
+
+# ============================================================================
+# COMPILED INBOUND TIERS
+# ============================================================================
+
+def build_inbound_pattern_tiers() -> List[PatternTier]:
+    """Compile the inbound pattern library into decision tiers (priority order)"""
+    return [
+        PatternTier(InboundDecision.ESCALATE.value, InboundPatternLibrary.ESCALATE_PATTERNS),
+        PatternTier(InboundDecision.SILENCE.value, InboundPatternLibrary.SILENCE_PATTERNS),
+        PatternTier(InboundDecision.DELAY.value, InboundPatternLibrary.DELAY_PATTERNS),
+    ]
+
+def match_summarize_rules(features: TextFeatures) -> Optional[TierMatch]:
+    """SUMMARIZE tier evaluated on text features (same result as SUMMARIZE_PATTERNS)"""
+    for category, patterns in InboundPatternLibrary.SUMMARIZE_PATTERNS.items():
+        matches = [
+            (confidence, pattern, description)
+            for pattern, confidence, description in patterns
+            if InboundPatternLibrary.SUMMARIZE_FEATURE_RULES[pattern](features)
+        ]
+        if matches:
+            return TierMatch(tier=InboundDecision.SUMMARIZE.value, category=category, matches=matches)
+    return None
+
+_inbound_evaluator: Optional[TieredPatternEvaluator] = None
+
+def get_inbound_pattern_evaluator() -> TieredPatternEvaluator:
+    """Shared evaluator - inbound patterns are compiled once per process"""
+    global _inbound_evaluator
+    if _inbound_evaluator is None:
+        get_pattern_artifact()
+        _inbound_evaluator = TieredPatternEvaluator(build_inbound_pattern_tiers())
+    return _inbound_evaluator
 
 # ============================================================================
 # INBOUND BEHAVIOR VALIDATOR
 # ============================================================================
 
+FREQUENCY_PATTERN = "High frequency messaging"
+
+# Decisions counted against the sender in the offender tracker
+OFFENSE_DECISIONS = frozenset({InboundDecision.ESCALATE, InboundDecision.SILENCE})
+
 class InboundBehaviorValidator:
     """Extended validator for inbound content"""
     
-    def __init__(self):
+    def __init__(self, near_duplicates: Optional[NearDuplicateIndex] = None,
+                 rate_tracker: Optional[SenderRateTracker] = None,
+                 offenders: Optional[HeavyHitters] = None):
+        """
+        near_duplicates: optional index of recent high-risk results; a message
+        close to one of them reuses its decision without being validated again
+        rate_tracker: optional per-sender message counter; every message from a
+        known sender is counted, and it supplies frequency_data when the caller
+        passes none
+        offenders: tracker of senders with ESCALATE/SILENCE results (defaults
+        to the process-wide one)
+        """
         self.pattern_lib = InboundPatternLibrary()
-        self.base_validator = BehaviorValidator()  # Reuse existing validator
+        self._base_validator: Optional["BehaviorValidator"] = None
+        self.evaluator = get_inbound_pattern_evaluator()
+        self.near_duplicates = near_duplicates
+        self.rate_tracker = rate_tracker
+        self.offenders = offenders or get_offender_tracker()
+    
+    @property
+    def base_validator(self) -> "BehaviorValidator":
+        """Outbound validator for reuse, created (and its module imported) on first access"""
+        if self._base_validator is None:
+            from behavior_validator import BehaviorValidator
+            self._base_validator = BehaviorValidator()
+        return self._base_validator
     
     def validate_inbound_content(self, 
                                 content: str,
                                 sender_id: str = "unknown",
                                 content_type: str = "message",
-                                frequency_data: Optional[Dict] = None) -> InboundValidationResult:
+                                frequency_data: Optional[Dict] = None,
+                                context: Optional[RequestContext] = None) -> InboundValidationResult:
         """
         Validate inbound content with direction=inbound flag
         
@@ -153,47 +237,80 @@ class InboundBehaviorValidator:
             sender_id: ID of content sender
             content_type: Type of content (message, email, notification, etc.)
             frequency_data: Frequency information for harassment detection
+                (taken from rate_tracker when omitted)
+            context: RequestContext already built for content (optional)
             
         Returns:
             InboundValidationResult with appropriate decision
         """
         
-        text = content.lower()
-        trace_id = self._generate_trace_id(content, "inbound")
+        ctx = context or RequestContext(content, user_id=sender_id)
+        trace_id = self._generate_trace_id(content, "inbound", ctx.content_digest)
+        if self.rate_tracker is not None and sender_id not in UNTRACKED_SENDERS:
+            messages_in_window = self.rate_tracker.record(sender_id)
+            if frequency_data is None:
+                frequency_data = {"messages_per_hour": self.rate_tracker.per_hour(messages_in_window)}
+        if self.near_duplicates is None:
+            result = self._validate(ctx, trace_id, frequency_data)
+        else:
+            result = self._validate_indexed(ctx, trace_id, frequency_data)
+        if result.decision in OFFENSE_DECISIONS and sender_id not in UNTRACKED_SENDERS:
+            self.offenders.add(sender_id)
+        return result
+
+    def _validate_indexed(self, ctx: RequestContext, trace_id: str,
+                          frequency_data: Optional[Dict]) -> InboundValidationResult:
+        """_validate behind the near-duplicate index"""
+        fingerprint = self.near_duplicates.fingerprint(ctx.tokens)
+        if fingerprint is not None:
+            previous = self.near_duplicates.lookup(fingerprint)
+            if previous is not None:
+                return replace(previous, trace_id=trace_id, original_content=ctx.content)
+        result = self._validate(ctx, trace_id, frequency_data)
+        if fingerprint is not None and result.matched_patterns != [FREQUENCY_PATTERN]:
+            # a frequency decision belongs to the sender, not to the content
+            self.near_duplicates.record(fingerprint, result)
+        return result
+
+    def _validate(self, ctx: RequestContext, trace_id: str,
+                  frequency_data: Optional[Dict]) -> InboundValidationResult:
+        """Full validation of one message (pattern tiers, frequency, overload rules)"""
+        content = ctx.content
+        forms = ctx.match_forms  # lowercase text, then its evasion-normalized form
         
         # Check for critical threats first (ESCALATE)
-        for risk_category, patterns in self.pattern_lib.ESCALATE_PATTERNS.items():
-            matches = self._find_matches(text, patterns)
-            if matches:
-                confidence = self._calculate_confidence(matches, content)
-                return InboundValidationResult(
-                    direction="inbound",
-                    decision=InboundDecision.ESCALATE,
-                    risk_category=risk_category,
-                    confidence=confidence,
-                    reason_code=ReasonCode.AGGRESSIVE_BEHAVIOR_DETECTED,
-                    trace_id=trace_id,
-                    matched_patterns=[match[2] for match in matches],
-                    explanation=f"Critical threat detected: {risk_category.value}",
-                    original_content=content
-                )
+        tier_match = self.evaluator.match_tier_forms(InboundDecision.ESCALATE.value, forms)
+        if tier_match:
+            risk_category, matches = tier_match.category, tier_match.matches
+            confidence = self._calculate_confidence(matches, content)
+            return InboundValidationResult(
+                direction="inbound",
+                decision=InboundDecision.ESCALATE,
+                risk_category=risk_category,
+                confidence=confidence,
+                reason_code=ReasonCode.AGGRESSIVE_BEHAVIOR_DETECTED,
+                trace_id=trace_id,
+                matched_patterns=[match[2] for match in matches],
+                explanation=f"Critical threat detected: {risk_category.value}",
+                original_content=content
+            )
         
         # Check for harassment patterns (SILENCE)
-        for risk_category, patterns in self.pattern_lib.SILENCE_PATTERNS.items():
-            matches = self._find_matches(text, patterns)
-            if matches:
-                confidence = self._calculate_confidence(matches, content)
-                return InboundValidationResult(
-                    direction="inbound",
-                    decision=InboundDecision.SILENCE,
-                    risk_category=risk_category,
-                    confidence=confidence,
-                    reason_code=ReasonCode.BOUNDARY_VIOLATION_DETECTED,
-                    trace_id=trace_id,
-                    matched_patterns=[match[2] for match in matches],
-                    explanation=f"Harassment detected: {risk_category.value}",
-                    original_content=content
-                )
+        tier_match = self.evaluator.match_tier_forms(InboundDecision.SILENCE.value, forms)
+        if tier_match:
+            risk_category, matches = tier_match.category, tier_match.matches
+            confidence = self._calculate_confidence(matches, content)
+            return InboundValidationResult(
+                direction="inbound",
+                decision=InboundDecision.SILENCE,
+                risk_category=risk_category,
+                confidence=confidence,
+                reason_code=ReasonCode.BOUNDARY_VIOLATION_DETECTED,
+                trace_id=trace_id,
+                matched_patterns=[match[2] for match in matches],
+                explanation=f"Harassment detected: {risk_category.value}",
+                original_content=content
+            )
         
         # Check frequency-based harassment
         if frequency_data and self._is_harassment_frequency(frequency_data):
@@ -204,48 +321,48 @@ class InboundBehaviorValidator:
                 confidence=85.0,
                 reason_code=ReasonCode.BOUNDARY_VIOLATION_DETECTED,
                 trace_id=trace_id,
-                matched_patterns=["High frequency messaging"],
+                matched_patterns=[FREQUENCY_PATTERN],
                 explanation="Repeated harassment detected via frequency analysis",
                 original_content=content
             )
         
         # Check for urgency manipulation (DELAY)
-        for risk_category, patterns in self.pattern_lib.DELAY_PATTERNS.items():
-            matches = self._find_matches(text, patterns)
-            if matches:
-                confidence = self._calculate_confidence(matches, content)
-                delay_duration = self._calculate_delay_duration(confidence)
-                return InboundValidationResult(
-                    direction="inbound",
-                    decision=InboundDecision.DELAY,
-                    risk_category=risk_category,
-                    confidence=confidence,
-                    reason_code=ReasonCode.EMOTIONAL_MANIPULATION_DETECTED,
-                    trace_id=trace_id,
-                    matched_patterns=[match[2] for match in matches],
-                    explanation=f"Manipulative urgency detected: {risk_category.value}",
-                    original_content=content,
-                    delay_duration=delay_duration
-                )
+        tier_match = self.evaluator.match_tier_forms(InboundDecision.DELAY.value, forms)
+        if tier_match:
+            risk_category, matches = tier_match.category, tier_match.matches
+            confidence = self._calculate_confidence(matches, content)
+            delay_duration = self._calculate_delay_duration(confidence)
+            return InboundValidationResult(
+                direction="inbound",
+                decision=InboundDecision.DELAY,
+                risk_category=risk_category,
+                confidence=confidence,
+                reason_code=ReasonCode.EMOTIONAL_MANIPULATION_DETECTED,
+                trace_id=trace_id,
+                matched_patterns=[match[2] for match in matches],
+                explanation=f"Manipulative urgency detected: {risk_category.value}",
+                original_content=content,
+                delay_duration=delay_duration
+            )
         
         # Check for information overload (SUMMARIZE)
-        for risk_category, patterns in self.pattern_lib.SUMMARIZE_PATTERNS.items():
-            matches = self._find_matches(text, patterns)
-            if matches:
-                confidence = self._calculate_confidence(matches, content)
-                summary = self._generate_summary(content)
-                return InboundValidationResult(
-                    direction="inbound",
-                    decision=InboundDecision.SUMMARIZE,
-                    risk_category=risk_category,
-                    confidence=confidence,
-                    reason_code=ReasonCode.CLEAN_CONTENT,
-                    trace_id=trace_id,
-                    matched_patterns=[match[2] for match in matches],
-                    explanation=f"Information overload detected: {risk_category.value}",
-                    original_content=content,
-                    safe_summary=summary
-                )
+        tier_match = match_summarize_rules(ctx.features)
+        if tier_match:
+            risk_category, matches = tier_match.category, tier_match.matches
+            confidence = self._calculate_confidence(matches, content)
+            summary = self._generate_summary(content)
+            return InboundValidationResult(
+                direction="inbound",
+                decision=InboundDecision.SUMMARIZE,
+                risk_category=risk_category,
+                confidence=confidence,
+                reason_code=ReasonCode.CLEAN_CONTENT,
+                trace_id=trace_id,
+                matched_patterns=[match[2] for match in matches],
+                explanation=f"Information overload detected: {risk_category.value}",
+                original_content=content,
+                safe_summary=summary
+            )
         
         # Default: DELIVER (safe content)
         return InboundValidationResult(
@@ -260,14 +377,6 @@ class InboundBehaviorValidator:
             original_content=content
         )
     
-    def _find_matches(self, text: str, patterns: List[Tuple[str, float, str]]) -> List[Tuple[float, str, str]]:
-        """Find pattern matches in text"""
-        matches = []
-        for pattern, confidence, description in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                matches.append((confidence, pattern, description))
-        return matches
-    
     def _calculate_confidence(self, matches: List[Tuple[float, str, str]], content: str) -> float:
         """Calculate confidence score"""
         if not matches:
@@ -282,12 +391,13 @@ class InboundBehaviorValidator:
         
         return min(base_confidence, 100.0)
     
-    def _generate_trace_id(self, content: str, direction: str) -> str:
+    def _generate_trace_id(self, content: str, direction: str,
+                           digest: Optional[ContentDigest] = None) -> str:
         """Generate deterministic trace ID for inbound content"""
         version = "v1.0-INBOUND"
-        hash_input = f"{content}:{direction}:{version}"
-        hash_value = hashlib.md5(hash_input.encode()).hexdigest()[:12]
-        return f"inbound_{hash_value}"
+        return get_trace_id_service().trace_id(
+            digest or content, f":{direction}:{version}", 12, prefix="inbound_"
+        )
     
     def _is_harassment_frequency(self, frequency_data: Dict) -> bool:
         """Check if frequency indicates harassment"""
@@ -309,10 +419,8 @@ class InboundBehaviorValidator:
     
     def _generate_summary(self, content: str) -> str:
         """Generate safe summary of long content"""
-        # Simple summarization - take first 100 chars + "..."
-        if len(content) > 100:
-            return content[:100] + "... [Content summarized for readability]"
-        return content
+        # Extractive: top-scoring sentences, linear in the (capped) content
+        return summarize(content)
 
 # ============================================================================
 # PUBLIC API FUNCTION
@@ -321,7 +429,8 @@ class InboundBehaviorValidator:
 def validate_inbound_behavior(content: str, 
                             sender_id: str = "unknown",
                             content_type: str = "message",
-                            frequency_data: Optional[Dict] = None) -> Dict[str, Any]:
+                            frequency_data: Optional[Dict] = None,
+                            context: Optional[RequestContext] = None) -> Dict[str, Any]:
     """
     Public API function for inbound content validation
     
@@ -330,6 +439,7 @@ def validate_inbound_behavior(content: str,
         sender_id: ID of content sender
         content_type: Type of content (message, email, notification, etc.)
         frequency_data: Frequency information for harassment detection
+        context: RequestContext already built for content (optional)
         
     Returns:
         Dictionary with validation results
@@ -339,7 +449,8 @@ def validate_inbound_behavior(content: str,
         content=content,
         sender_id=sender_id,
         content_type=content_type,
-        frequency_data=frequency_data
+        frequency_data=frequency_data,
+        context=context
     )
     
     return result.to_dict()
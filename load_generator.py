@@ -0,0 +1,332 @@
+"""
+LOAD GENERATOR - Closed-loop load against the real safety_validator handler
+Run: python load_generator.py --concurrency 8 --duration 10 [--rps 200] [--mode http]
+
+Drives the deployed request handler (safety_validator.handler) either
+in-process - do_POST on in-memory buffers, no sockets - or over HTTP through
+a local ThreadingHTTPServer (or an existing http:// or https:// deployment
+via --url, whose path is prefixed to the API paths).
+
+The corpus mixes every edge_test_matrix.json case with adversarial inputs
+(oversized, regex-hostile, unicode and injection payloads), each sent to
+both /api/validateInbound and /api/validateAction.
+
+Closed loop: each of `concurrency` workers sends its next request as soon as
+the previous one completes. With a target RPS, requests are additionally
+released on a fixed schedule and latency is measured from the scheduled
+send time, so queueing delay is reported instead of hidden when the service
+falls behind.
+
+Reports throughput, latency percentiles (overall and per corpus kind),
+status/error counts and process memory growth.
+"""
+
+import argparse
+import http.client
+import io
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, asdict
+from http.server import ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from safety_validator import handler as SafetyHandler
+
+MATRIX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "edge_test_matrix.json")
+INBOUND_PATH = "/api/validateInbound"
+ACTION_PATH = "/api/validateAction"
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+
+OVERSIZED_INPUTS = [
+    "x" * 50000,           # 50KB string
+    "malicious " * 10000,  # repeated pattern
+    "🔥" * 20000,          # unicode characters
+]
+
+MEMORY_ATTACK_INPUTS = [
+    "(" * 5000 + ")" * 5000,               # nested patterns
+    "a" + "b" * 1000 + "c" * 1000,         # complex patterns
+    "\n".join(["test line"] * 1000),       # many lines
+]
+
+EVASION_INPUTS = [
+    "k1ll mys3lf",
+    "s u i c i d e",
+    "I need you... you're the only one who understands",
+    "if you don't answer this is your last chance",
+    "'; DROP TABLE users; --",
+    "<script>alert('xss')</script>",
+    "{{7*7}} ${jndi:ldap://example.com/a}",
+    "\x00" * 100 + "urgent",
+]
+
+ADVERSARIAL_INPUTS = OVERSIZED_INPUTS + MEMORY_ATTACK_INPUTS + EVASION_INPUTS
+
+@dataclass(frozen=True)
+class LoadRequest:
+    """One request of the corpus, body pre-encoded"""
+    path: str
+    kind: str  # "matrix" | "adversarial"
+    body: bytes
+
+def requests_for(content: str, kind: str, sender: str) -> List[LoadRequest]:
+    """Inbound and action requests carrying the same content"""
+    inbound = {"content": content, "user_id": sender}
+    action = {"content": content, "action_type": "message", "recipient": sender}
+    return [
+        LoadRequest(INBOUND_PATH, kind, json.dumps(inbound).encode()),
+        LoadRequest(ACTION_PATH, kind, json.dumps(action).encode()),
+    ]
+
+def build_corpus(matrix_path: str = MATRIX_PATH, adversarial: bool = True) -> List[LoadRequest]:
+    """Edge-matrix cases plus adversarial inputs, each for both endpoints"""
+    corpus: List[LoadRequest] = []
+    with open(matrix_path, 'r', encoding='utf-8') as f:
+        categories = json.load(f)["edge_test_matrix"]["test_categories"]
+    for category in categories.values():
+        for test in category.get("tests", []):
+            corpus.extend(requests_for(test["content"], "matrix", test.get("test_id", "matrix")))
+    if adversarial:
+        for index, content in enumerate(ADVERSARIAL_INPUTS):
+            corpus.extend(requests_for(content, "adversarial", f"adversary_{index}"))
+    return corpus
+
+# ============================================================================
+# TARGETS
+# ============================================================================
+
+class _QuietHandler(SafetyHandler):
+    """The production handler without per-request access logging to stderr"""
+
+    def log_message(self, format, *args):
+        pass
+
+class InProcessTarget:
+    """Calls the handler's do_POST directly on in-memory buffers"""
+
+    name = "inprocess"
+
+    def send(self, request: LoadRequest) -> int:
+        handler = _QuietHandler.__new__(_QuietHandler)  # skip the socket-driven __init__
+        handler.rfile = io.BytesIO(request.body)
+        handler.wfile = io.BytesIO()
+        handler.headers = {"Content-Length": str(len(request.body))}
+        handler.path = request.path
+        handler.command = "POST"
+        handler.request_version = "HTTP/1.1"
+        handler.requestline = f"POST {request.path} HTTP/1.1"
+        handler.client_address = ("127.0.0.1", 0)
+        handler.do_POST()
+        status_line = handler.wfile.getvalue().split(b"\r\n", 1)[0]
+        return int(status_line.split()[1])
+
+    def close(self):
+        pass
+
+class HttpTarget:
+    """Sends requests over HTTP to a local server it starts, or to an existing URL"""
+
+    name = "http"
+
+    def __init__(self, url: Optional[str] = None):
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.connection_class = http.client.HTTPConnection
+        self.base_path = ""
+        if url is None:
+            self.server = ThreadingHTTPServer(("127.0.0.1", 0), _QuietHandler)
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name="load-target", daemon=True).start()
+            self.host, self.port = self.server.server_address[:2]
+        else:
+            parts = urllib.parse.urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                raise ValueError(f"Expected an http(s) URL, got {url!r}")
+            if parts.scheme == "https":
+                self.connection_class = http.client.HTTPSConnection
+            self.host = parts.hostname
+            self.port = parts.port or (443 if parts.scheme == "https" else 80)
+            self.base_path = parts.path.rstrip("/")  # deployment mounted under a path prefix
+
+    def send(self, request: LoadRequest) -> int:
+        # The handler speaks HTTP/1.0, so each request uses its own connection
+        conn = self.connection_class(self.host, self.port, timeout=30)
+        try:
+            conn.request("POST", self.base_path + request.path, request.body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _rss_mb() -> float:
+    """Resident memory of this process in MB (0.0 where unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, KB on Linux
+    except ImportError:
+        return 0.0
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    """Nearest-rank percentiles of a latency sample"""
+    if not latencies_ms:
+        return {}
+    ordered = sorted(latencies_ms)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+    return {
+        "p50": pct(50), "p90": pct(90), "p99": pct(99), "p99_9": pct(99.9),
+        "max": round(ordered[-1], 3), "mean": round(sum(ordered) / len(ordered), 3),
+    }
+
+@dataclass
+class LoadReport:
+    """Outcome of one load run"""
+    target: str
+    concurrency: int
+    target_rps: Optional[float]
+    requests: int
+    errors: int
+    error_rate: float
+    duration_s: float
+    throughput_rps: float
+    latency_ms: Dict[str, float]
+    latency_by_kind_ms: Dict[str, Dict[str, float]]
+    status_counts: Dict[str, int]
+    rss_start_mb: float
+    rss_end_mb: float
+    rss_growth_mb: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_load(target, corpus: List[LoadRequest], concurrency: int = 8, duration: float = 10.0,
+             max_requests: Optional[int] = None, rps: Optional[float] = None,
+             seed: int = 0) -> LoadReport:
+    """
+    Run closed-loop load until `duration` seconds pass or `max_requests` complete
+
+    rps: optional release rate; latency then counts from each request's
+    scheduled send time.
+    """
+    order = list(corpus)
+    random.Random(seed).shuffle(order)
+    sequence = itertools.count()
+    samples: List[List[Tuple[float, int, str]]] = [[] for _ in range(concurrency)]
+
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def worker(slot: int):
+        record = samples[slot].append
+        while True:
+            index = next(sequence)  # atomic under the GIL
+            if max_requests is not None and index >= max_requests:
+                return
+            sent = time.perf_counter()
+            if rps:
+                sent = start + index / rps
+                delay = sent - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if sent >= deadline:
+                return
+            request = order[index % len(order)]
+            try:
+                status = target.send(request)
+            except Exception:
+                status = 0  # transport failure
+            record(((time.perf_counter() - sent) * 1000, status, request.kind))
+
+    threads = [threading.Thread(target=worker, args=(slot,), name=f"load-{slot}") for slot in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    rss_end = _rss_mb()
+
+    results = [sample for slot in samples for sample in slot]
+    status_counts: Dict[str, int] = {}
+    for _, status, _ in results:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+    errors = sum(1 for _, status, _ in results if status != 200)
+    kinds = sorted({kind for _, _, kind in results})
+
+    return LoadReport(
+        target=target.name,
+        concurrency=concurrency,
+        target_rps=rps,
+        requests=len(results),
+        errors=errors,
+        error_rate=errors / len(results) if results else 0.0,
+        duration_s=round(elapsed, 3),
+        throughput_rps=round(len(results) / elapsed, 1) if elapsed else 0.0,
+        latency_ms=latency_summary([latency for latency, _, _ in results]),
+        latency_by_kind_ms={kind: latency_summary([l for l, _, k in results if k == kind]) for kind in kinds},
+        status_counts=status_counts,
+        rss_start_mb=round(rss_start, 1),
+        rss_end_mb=round(rss_end, 1),
+        rss_growth_mb=round(rss_end - rss_start, 1),
+    )
+
+def print_report(report: LoadReport):
+    print(f"Target: {report.target}  concurrency={report.concurrency}  target_rps={report.target_rps or 'unbounded'}")
+    print(f"Requests: {report.requests} in {report.duration_s:.2f}s -> {report.throughput_rps} req/s")
+    print(f"Errors: {report.errors} ({report.error_rate:.2%})  status={report.status_counts}")
+    print(f"Latency ms: {report.latency_ms}")
+    for kind, summary in report.latency_by_kind_ms.items():
+        print(f"  {kind}: {summary}")
+    print(f"Memory: {report.rss_start_mb}MB -> {report.rss_end_mb}MB (+{report.rss_growth_mb}MB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the safety_validator handler")
+    parser.add_argument("--mode", choices=["inprocess", "http"], default="inprocess")
+    parser.add_argument("--url", help="existing http(s) server or deployment for --mode http (default: start a local one)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rps", type=float, default=None, help="release rate (default: as fast as possible)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many requests")
+    parser.add_argument("--no-adversarial", action="store_true")
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    target = HttpTarget(args.url) if args.mode == "http" else InProcessTarget()
+    try:
+        report = run_load(target, build_corpus(adversarial=not args.no_adversarial),
+                          concurrency=args.concurrency, duration=args.duration,
+                          max_requests=args.requests, rps=args.rps)
+    finally:
+        target.close()
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
@@ -6,11 +6,16 @@ Enforces quiet hours, contact limits, and emotional escalation rules
 
 import hashlib
 import json
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass, asdict
 
+from heavy_hitters import HeavyHitters, get_offender_tracker
+from phrase_rewriter import PhraseRewriter
+from trace_ids import get_trace_id_service
+from result_types import SLOTS, SerializedResult
+
 class MediationDecision(Enum):
     ALLOW = "allow"
     BLOCK = "block"
@@ -35,8 +40,8 @@ class OutboundAction:
     timestamp: str
     urgency_level: str = "low"
 
-@dataclass
-class MediationResult:
+@dataclass(frozen=True, **SLOTS)
+class MediationResult(SerializedResult):
     decision: MediationDecision
     reason: str
     trace_id: str
@@ -45,10 +50,22 @@ class MediationResult:
     delay_until: Optional[str] = None
     timestamp: str = ""
 
+# Manipulative phrasing -> safe wording for outbound REWRITE decisions
+MANIPULATION_REWRITER = PhraseRewriter({
+    "you have to": "please consider",
+    "you must": "you might want to",
+    "if you don't": "if you choose not to",
+    "last chance": "opportunity",
+    "really need you": "would appreciate your help"
+})
+
 class MediationSystem:
     """Complete inbound/outbound mediation with enforcement rules"""
     
-    def __init__(self):
+    def __init__(self, offenders: Optional[HeavyHitters] = None):
+        # Senders with blocked inbound messages (defaults to the process-wide tracker)
+        self.offenders = offenders or get_offender_tracker()
+        
         # Contact tracking for repeat limits
         self.contact_counts = {}  # {(sender, recipient, date): count}
         self.platform_limits = {
@@ -79,8 +96,9 @@ class MediationSystem:
     def generate_trace_id(self, content: str, direction: str) -> str:
         """Generate continuous trace IDs"""
         self.trace_counter += 1
-        trace_input = f"{content}:{direction}:{self.trace_counter}"
-        return f"trace_{hashlib.md5(trace_input.encode()).hexdigest()[:12]}"
+        return get_trace_id_service().trace_id(
+            content, f":{direction}:{self.trace_counter}", 12, prefix="trace_"
+        )
     
     def is_quiet_hours(self, timestamp: str) -> bool:
         """Check if timestamp falls in quiet hours"""
@@ -90,6 +108,14 @@ class MediationSystem:
         # Handle overnight quiet hours (10 PM to 7 AM)
         return current_time >= self.quiet_start or current_time <= self.quiet_end
     
+    def quiet_hours_end(self, timestamp: str) -> str:
+        """End of the quiet hours containing timestamp (next morning when sent before midnight)"""
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        day = dt.date()
+        if dt.time() > self.quiet_end:
+            day += timedelta(days=1)
+        return f"{day.isoformat()}T{self.quiet_end.isoformat()}Z"
+    
     def get_contact_count(self, sender: str, recipient: str, date: str) -> int:
         """Get daily contact count"""
         key = (sender, recipient, date)
@@ -131,6 +157,13 @@ class MediationSystem:
     
     def validate_inbound(self, message: InboundMessage) -> MediationResult:
         """Validate inbound message before UI render"""
+        result = self._mediate_inbound(message)
+        if result.decision == MediationDecision.BLOCK:
+            self.offenders.add(message.sender)
+        return result
+    
+    def _mediate_inbound(self, message: InboundMessage) -> MediationResult:
+        """Inbound mediation rules, in priority order"""
         timestamp = datetime.now().isoformat() + "Z"
         trace_id = self.generate_trace_id(message.content, "inbound")
         
@@ -176,7 +209,7 @@ class MediationSystem:
         
         # Check quiet hours for non-urgent messages
         elif self.is_quiet_hours(message.timestamp) and message.message_type != "emergency":
-            delay_until = message.timestamp[:10] + "T07:00:00Z"  # Delay until 7 AM
+            delay_until = self.quiet_hours_end(message.timestamp)  # Delay until 7 AM
             return MediationResult(
                 decision=MediationDecision.DELAY,
                 reason="Quiet hours - message delayed until morning",
@@ -244,7 +277,7 @@ class MediationSystem:
         
         # Check quiet hours for non-critical actions
         elif self.is_quiet_hours(action.timestamp) and action.urgency_level != "critical":
-            delay_until = action.timestamp[:10] + "T07:00:00Z"
+            delay_until = self.quiet_hours_end(action.timestamp)
             return MediationResult(
                 decision=MediationDecision.DELAY,
                 reason="Quiet hours - action delayed until morning",
@@ -276,33 +309,32 @@ class MediationSystem:
     
     def _generate_safe_rewrite(self, content: str) -> str:
         """Generate safe rewrite of manipulative content"""
-        safe_content = content
-        
-        # Replace manipulation patterns
-        replacements = {
-            "you have to": "please consider",
-            "you must": "you might want to",
-            "if you don't": "if you choose not to",
-            "last chance": "opportunity",
-            "really need you": "would appreciate your help"
-        }
-        
-        for manipulative, safe in replacements.items():
-            safe_content = safe_content.replace(manipulative, safe)
-            safe_content = safe_content.replace(manipulative.title(), safe.title())
-        
-        return safe_content
+        # Replace manipulation patterns (any casing, one pass)
+        return MANIPULATION_REWRITER.rewrite(content)
+
+# Global mediation system (created on first use, not at import)
+_mediation_system: Optional[MediationSystem] = None
+
+def get_mediation_system() -> MediationSystem:
+    """Shared mediation system instance"""
+    global _mediation_system
+    if _mediation_system is None:
+        _mediation_system = MediationSystem()
+    return _mediation_system
 
-# Global mediation system
-mediation_system = MediationSystem()
+def __getattr__(name: str):
+    # Keeps `mediation_system.mediation_system` working without building it at import
+    if name == "mediation_system":
+        return get_mediation_system()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def validate_inbound_message(message: InboundMessage) -> MediationResult:
     """Validate inbound message before UI render"""
-    return mediation_system.validate_inbound(message)
+    return get_mediation_system().validate_inbound(message)
 
 def validate_outbound_action(action: OutboundAction) -> MediationResult:
     """Validate outbound action before execution"""
-    return mediation_system.validate_outbound(action)
+    return get_mediation_system().validate_outbound(action)
 
 def run_mediation_demo():
     """Run comprehensive mediation demo with logs"""
@@ -0,0 +1,178 @@
+"""
+NEAR-DUPLICATE INDEX - SimHash fingerprints of recent high-risk inbound messages
+Sits in front of InboundBehaviorValidator.validate_inbound_content
+
+Spam and harassment bursts arrive as near-identical variants of one message
+(changed numbers, punctuation or names), which an exact-match cache misses.
+Each message gets a 64-bit SimHash over its word tokens, with digit runs
+masked to '#' and punctuation dropped by tokenization, so those edits move
+the fingerprint by a few bits at most. A message within `max_distance` bits
+of a recently validated high-risk message reuses that decision instead of
+being validated again.
+
+Lookup uses LSH banding: the fingerprint is cut into max_distance + 1 bands,
+and two fingerprints within max_distance bits agree exactly on at least one
+band (pigeonhole). A lookup therefore only compares against entries sharing
+a band bucket. Buckets are capped, so a burst of any size costs the same
+per message.
+
+Only results whose decision is in `reuse_decisions` are indexed (ESCALATE
+and SILENCE by default). Entries expire after `ttl_seconds`, and the oldest
+are evicted past `max_entries`. Messages with fewer than `min_features`
+distinct tokens are never matched: SimHash is too coarse for short texts.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+FINGERPRINT_BITS = 64
+DEFAULT_REUSE_DECISIONS = ("escalate", "silence")
+
+# SimHash counts, per fingerprint bit, how many features have that bit set.
+# Each feature hash is spread into 64 16-bit lanes (lane i = bit i) so that
+# summing the spread ints counts every bit at once in C instead of looping
+# over bits in Python.
+_LANE_BITS = 16
+_MAX_FEATURES = (1 << (_LANE_BITS - 1)) - 1  # lane counts + bias stay below 2**16
+_EVERY_LANE = sum(1 << (_LANE_BITS * bit) for bit in range(FINGERPRINT_BITS))
+_HIGH_BYTE_TO_DIGIT = bytes(ord("1") if byte & 0x80 else ord("0") for byte in range(256))
+
+_spread_hashes: Dict[str, int] = {}
+_SPREAD_CACHE_SIZE = 65536
+
+def _spread_hash(feature: str) -> int:
+    """Feature hash with bit i moved to lane i (cached: bursts repeat words)"""
+    spread = _spread_hashes.get(feature)
+    if spread is None:
+        value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        spread = sum(1 << (_LANE_BITS * bit) for bit in range(FINGERPRINT_BITS) if value >> bit & 1)
+        if len(_spread_hashes) >= _SPREAD_CACHE_SIZE:
+            _spread_hashes.clear()
+        _spread_hashes[feature] = spread
+    return spread
+
+def message_features(tokens: Iterable[str]) -> List[str]:
+    """Word tokens with digit runs masked, so changed numbers give the same features"""
+    return ["#" if token.isdigit() else token for token in tokens]
+
+def simhash(features: List[str]) -> int:
+    """64-bit SimHash of a feature list: bit i is set when most features have it set"""
+    features = features[:_MAX_FEATURES]
+    counts = sum(map(_spread_hash, features))
+    # bias each lane so its top bit is set exactly when count > len(features) / 2
+    biased = counts + _EVERY_LANE * ((1 << (_LANE_BITS - 1)) - len(features) // 2 - 1)
+    high_bytes = biased.to_bytes(FINGERPRINT_BITS * _LANE_BITS // 8, "little")[1::2]
+    return int(high_bytes.translate(_HIGH_BYTE_TO_DIGIT)[::-1], 2)
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+@dataclass
+class _Entry:
+    fingerprint: int
+    result: Any
+    added_at: float
+
+class NearDuplicateIndex:
+    """Recent high-risk results keyed by SimHash, looked up within a Hamming distance"""
+
+    def __init__(self, max_distance: int = 4, min_features: int = 8, max_entries: int = 10000,
+                 bucket_size: int = 8, ttl_seconds: float = 300.0,
+                 reuse_decisions: Iterable[str] = DEFAULT_REUSE_DECISIONS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_distance = max_distance
+        self.min_features = min_features
+        self.max_entries = max_entries
+        self.bucket_size = bucket_size
+        self.ttl_seconds = ttl_seconds
+        self.reuse_decisions = frozenset(reuse_decisions)
+        self.clock = clock
+
+        bands = max_distance + 1
+        widths = [FINGERPRINT_BITS // bands + (1 if i < FINGERPRINT_BITS % bands else 0) for i in range(bands)]
+        offsets = [sum(widths[:i]) for i in range(bands)]
+        self._bands = [(offset, (1 << width) - 1) for offset, width in zip(offsets, widths)]
+        self._buckets: List[Dict[int, Deque[int]]] = [{} for _ in self._bands]
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, tokens: Iterable[str]) -> Optional[int]:
+        """SimHash of a message's tokens, or None when it is too short to match safely"""
+        features = message_features(tokens)
+        if len(set(features)) < self.min_features:
+            return None
+        return simhash(features)
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        return [fingerprint >> offset & mask for offset, mask in self._bands]
+
+    def lookup(self, fingerprint: int) -> Optional[Any]:
+        """Result of the closest live entry within max_distance bits, if any"""
+        now = self.clock()
+        best: Optional[_Entry] = None
+        best_distance = self.max_distance + 1
+        with self._lock:
+            exact = self._entries.get(fingerprint)
+            if exact is not None and now - exact.added_at <= self.ttl_seconds:
+                best = exact
+            else:
+                checked = {fingerprint}
+                for buckets, key in zip(self._buckets, self._band_keys(fingerprint)):
+                    for candidate in buckets.get(key, ()):
+                        if candidate in checked:
+                            continue  # shares several bands with the query
+                        checked.add(candidate)
+                        entry = self._entries[candidate]
+                        if now - entry.added_at > self.ttl_seconds:
+                            continue
+                        distance = hamming_distance(fingerprint, candidate)
+                        if distance < best_distance:
+                            best, best_distance = entry, distance
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return best.result
+
+    def record(self, fingerprint: int, result: Any):
+        """Index a validated result if its decision is reusable"""
+        if result.decision.value not in self.reuse_decisions:
+            return
+        with self._lock:
+            if fingerprint in self._entries:
+                self._entries.move_to_end(fingerprint)
+            else:
+                for buckets, key in zip(self._buckets, self._band_keys(fingerprint)):
+                    bucket = buckets.setdefault(key, deque())
+                    while len(bucket) >= self.bucket_size:
+                        self._drop(bucket[0])  # oldest in a full bucket leaves the index
+                    buckets.setdefault(key, bucket).append(fingerprint)
+            self._entries[fingerprint] = _Entry(fingerprint, result, self.clock())
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, fingerprint: int):
+        """Remove an entry and its bucket references (lock held)"""
+        self._entries.pop(fingerprint, None)
+        for buckets, key in zip(self._buckets, self._band_keys(fingerprint)):
+            bucket = buckets.get(key)
+            if bucket is None:
+                continue
+            try:
+                bucket.remove(fingerprint)
+            except ValueError:
+                pass
+            if not bucket:
+                del buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,178 @@
+"""
+PATTERN ARTIFACT - Precomputed pattern derivations for fast cold starts
+Built by `python pattern_artifact.py [output]`, loaded once per process
+
+Compiling the pattern libraries at startup is dominated by work derived from
+the pattern source, not by re.compile: literal pre-screen requirements (a
+parse-tree walk per pattern and region shard) and the streaming segment
+plans. The build step computes all of it into one JSON file, read with a
+single read at startup and used to seed pattern_engine and
+streaming_validator.
+
+Entries are keyed by (pattern, flags), so an artifact built from an older
+library still covers every unchanged pattern and new patterns are simply
+derived at runtime. The whole artifact is ignored (full runtime fallback)
+when it is missing or unreadable, or when its fingerprint - the format,
+Python version and source of the deriving modules - does not match this
+process.
+
+Compiled regexes themselves cannot be serialized (pickling re.Pattern
+recompiles it), so re.compile still runs at load; it is the cheap part.
+
+Only processes that build the pattern libraries benefit (behavior_validator,
+inbound_behavior_validator, streaming_validator and their callers). The
+Vercel functions in vercel.json - assistant.py, health.py and
+safety_validator.py - import none of them, so deploy.sh does not build the
+artifact. Run the build step as part of deploying a process that validates
+through those modules.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from pattern_engine import LiteralRequirement, extract_literal_requirement, seed_literal_requirements
+
+ARTIFACT_FORMAT = 1
+ARTIFACT_ENV = "PATTERN_ARTIFACT_PATH"
+DEFAULT_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_artifact.json")
+
+# Modules whose code defines the derived data; editing them invalidates artifacts
+DERIVING_MODULES = ("pattern_engine.py", "streaming_validator.py")
+
+# ============================================================================
+# FINGERPRINT
+# ============================================================================
+
+def derivation_fingerprint() -> str:
+    """Identifies the code and interpreter that derived data is valid for"""
+    digest = hashlib.sha256(f"format={ARTIFACT_FORMAT};python={sys.version_info[0]}.{sys.version_info[1]}".encode())
+    base = os.path.dirname(os.path.abspath(__file__))
+    for name in DERIVING_MODULES:
+        with open(os.path.join(base, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+# ============================================================================
+# ARTIFACT
+# ============================================================================
+
+@dataclass
+class PatternArtifact:
+    """Derived pattern data loaded from an artifact file (empty when none applies)"""
+    requirements: Dict[Tuple[str, int], LiteralRequirement] = field(default_factory=dict)
+    segment_plans: Dict[Tuple[str, int], Any] = field(default_factory=dict)
+    library_versions: Dict[str, str] = field(default_factory=dict)
+    path: Optional[str] = None
+    status: str = "missing"  # loaded | missing | stale | invalid
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": ARTIFACT_FORMAT,
+            "fingerprint": derivation_fingerprint(),
+            "built_at": datetime.now().isoformat(),
+            "library_versions": self.library_versions,
+            "requirements": [
+                [pattern, flags, sorted(req.words), list(req.substrings), req.min_length]
+                for (pattern, flags), req in self.requirements.items()
+            ],
+            "segment_plans": [
+                [pattern, flags, None if plan is None else [list(segment) for segment in plan]]
+                for (pattern, flags), plan in self.segment_plans.items()
+            ],
+        }
+
+def load_artifact(path: Optional[str] = None) -> PatternArtifact:
+    """Read an artifact file; returns an empty artifact if it is missing, invalid or stale"""
+    path = path or os.environ.get(ARTIFACT_ENV) or DEFAULT_ARTIFACT_PATH
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.loads(f.read())
+    except FileNotFoundError:
+        return PatternArtifact(path=path, status="missing")
+    except (OSError, ValueError):
+        return PatternArtifact(path=path, status="invalid")
+
+    try:
+        fingerprint = derivation_fingerprint()
+    except OSError:  # deriving sources not shipped (e.g. bytecode-only): cannot vouch for the artifact
+        return PatternArtifact(path=path, status="stale")
+    if data.get("format") != ARTIFACT_FORMAT or data.get("fingerprint") != fingerprint:
+        return PatternArtifact(path=path, status="stale")
+    try:
+        requirements = {
+            (pattern, flags): LiteralRequirement(frozenset(words), tuple(substrings), min_length)
+            for pattern, flags, words, substrings, min_length in data["requirements"]
+        }
+        segment_plans = {
+            (pattern, flags): None if plan is None else tuple(tuple(segment) for segment in plan)
+            for pattern, flags, plan in data["segment_plans"]
+        }
+    except (KeyError, TypeError, ValueError):
+        return PatternArtifact(path=path, status="invalid")
+    return PatternArtifact(requirements, segment_plans, data.get("library_versions", {}), path, "loaded")
+
+_artifact: Optional[PatternArtifact] = None
+_artifact_lock = threading.Lock()
+
+def get_pattern_artifact() -> PatternArtifact:
+    """The process artifact: loaded on first use and seeded into the pattern engine"""
+    global _artifact
+    if _artifact is None:
+        with _artifact_lock:
+            if _artifact is None:
+                artifact = load_artifact()
+                seed_literal_requirements(artifact.requirements)
+                _artifact = artifact
+    return _artifact
+
+# ============================================================================
+# BUILD STEP
+# ============================================================================
+
+def build_artifact(path: Optional[str] = None) -> PatternArtifact:
+    """
+    Derive everything for the deployed pattern libraries and write the artifact
+
+    Covers the current behavior snapshot (every region shard), the inbound
+    tiers and the streaming segment plans of the behavior patterns.
+    """
+    from behavior_validator import get_pattern_store
+    from inbound_behavior_validator import get_inbound_pattern_evaluator
+    from streaming_validator import derive_segment_plan
+
+    snapshot = get_pattern_store().current
+    shard_evaluators = [snapshot.evaluator(shard) for shard in sorted(snapshot.shard_keys)]
+    evaluators = shard_evaluators + [get_inbound_pattern_evaluator()]
+    artifact = PatternArtifact(library_versions={"behavior": snapshot.version}, path=path, status="loaded")
+    for evaluator in evaluators:
+        for tier in evaluator.tiers:
+            for _, compiled in tier.categories:
+                for cp in compiled:
+                    key = (cp.pattern, tier.flags)
+                    if key not in artifact.requirements:
+                        artifact.requirements[key] = extract_literal_requirement(*key)
+    for evaluator in shard_evaluators:
+        for tier in evaluator.tiers:
+            for _, compiled in tier.categories:
+                for cp in compiled:
+                    key = (cp.pattern, cp.regex.flags)
+                    if key not in artifact.segment_plans:
+                        artifact.segment_plans[key] = derive_segment_plan(*key)
+
+    path = path or os.environ.get(ARTIFACT_ENV) or DEFAULT_ARTIFACT_PATH
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(artifact.to_dict(), f, separators=(',', ':'))
+    artifact.path = path
+    return artifact
+
+if __name__ == "__main__":
+    built = build_artifact(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Pattern artifact written to {built.path}: "
+          f"{len(built.requirements)} requirements, {len(built.segment_plans)} segment plans "
+          f"(behavior library {built.library_versions.get('behavior')})")
@@ -0,0 +1,443 @@
+"""
+PATTERN ENGINE - Compiled, tiered pattern evaluation
+Shared matcher for behavior_validator.py and inbound_behavior_validator.py
+
+Tiers are evaluated in priority order (e.g. hard_deny before soft_rewrite,
+escalate before silence) and evaluation stops at the first category that
+matches, so lower tiers are never scanned once a higher-tier decision is final.
+Confidence is still computed from every match in the winning category, which
+keeps results identical to the original scan-everything loops.
+
+A literal pre-screen runs ahead of the regexes: every pattern is reduced to
+the literal words/substrings any match must contain, and patterns whose
+literals are absent from the message are never run. Clean messages usually
+skip regex evaluation entirely.
+"""
+
+import re
+import sys
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+# (confidence, pattern, description) - same shape the validators always used
+Match = Tuple[float, str, str]
+
+_WORD_RE = re.compile(r'\w+')
+
+# ============================================================================
+# LITERAL PRE-SCREEN
+# ============================================================================
+
+@dataclass(frozen=True)
+class LiteralRequirement:
+    """Literals that every match of a pattern must contain (lowercased)"""
+    words: FrozenSet[str] = frozenset()      # guaranteed to appear as whole \w+ tokens
+    substrings: Tuple[str, ...] = ()         # guaranteed to appear somewhere in the text
+    min_length: int = 0                      # shortest text the pattern can match
+
+    def satisfied_by(self, screen: "ScreenedText") -> bool:
+        return (len(screen.text) >= self.min_length
+                and self.words <= screen.words
+                and all(sub in screen.text for sub in self.substrings))
+
+@dataclass(frozen=True)
+class ScreenedText:
+    """Lowercased text plus its word tokens, computed once per message"""
+    text: str
+    words: FrozenSet[str]
+
+# One form of a message to match: (text, its pre-screen view or None)
+MatchForm = Tuple[str, Optional[ScreenedText]]
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+def extract_literal_requirement(pattern: str, flags: int = re.IGNORECASE) -> LiteralRequirement:
+    """
+    Derive the literals a pattern requires from its parse tree
+
+    Only top-level literal runs are used (groups, branches and repeats are
+    skipped), so the result is always a necessary condition for a match.
+    A word counts as whole only when it is bounded by \\b or a non-word
+    literal on both sides; otherwise it is kept as a plain substring.
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    items = list(parsed)
+    words: Set[str] = set()
+    substrings: List[str] = []
+
+    i = 0
+    while i < len(items):
+        if items[i][0] is not sre_parse.LITERAL:
+            i += 1
+            continue
+
+        start = i
+        while i < len(items) and items[i][0] is sre_parse.LITERAL:
+            i += 1
+        run = ''.join(chr(av) for _, av in items[start:i]).lower()
+        bounded_left = start > 0 and items[start - 1] == (sre_parse.AT, sre_parse.AT_BOUNDARY)
+        bounded_right = i < len(items) and items[i] == (sre_parse.AT, sre_parse.AT_BOUNDARY)
+
+        j = 0
+        while j < len(run):
+            if not _is_word_char(run[j]):
+                j += 1
+                continue
+            k = j
+            while k < len(run) and _is_word_char(run[k]):
+                k += 1
+            token = run[j:k]
+            left_ok = j > 0 or bounded_left
+            right_ok = k < len(run) or bounded_right
+            if left_ok and right_ok:
+                words.add(token)
+            elif len(token) >= 3:
+                substrings.append(token)
+            j = k
+
+    return LiteralRequirement(frozenset(words), tuple(substrings), parsed.getwidth()[0])
+
+_requirement_cache: Dict[Tuple[str, int], LiteralRequirement] = {}
+
+def literal_requirement(pattern: str, flags: int = re.IGNORECASE) -> LiteralRequirement:
+    """extract_literal_requirement, computed once per (pattern, flags) per process"""
+    key = (pattern, flags)
+    requirement = _requirement_cache.get(key)
+    if requirement is None:
+        requirement = _requirement_cache[key] = extract_literal_requirement(pattern, flags)
+    return requirement
+
+def seed_literal_requirements(requirements: Dict[Tuple[str, int], LiteralRequirement]):
+    """Preload requirements computed ahead of time (see pattern_artifact.py)"""
+    for key, requirement in requirements.items():
+        _requirement_cache.setdefault(key, requirement)
+
+def tokenize(lowered: str) -> List[str]:
+    """Word tokens (\\w+ runs) of already-lowercased text"""
+    return _WORD_RE.findall(lowered)
+
+def screen_text(text: str) -> Optional[ScreenedText]:
+    """
+    Build the pre-screen view of a message
+
+    Returns None for non-ASCII text: IGNORECASE matching folds some Unicode
+    characters onto ASCII letters (e.g. the Kelvin sign onto 'k'), so literal
+    screening is only exact for ASCII input.
+    """
+    lowered = text.lower()
+    if not lowered.isascii():
+        return None
+    return ScreenedText(lowered, frozenset(tokenize(lowered)))
+
+# ============================================================================
+# LINEAR-TIME REWRITE
+# ============================================================================
+
+_SIMPLE_ATS = (sre_parse.AT_BOUNDARY, sre_parse.AT_NON_BOUNDARY)
+
+# The rewrite relies on atomic groups, which `re` only supports from 3.11;
+# older interpreters keep evaluating the original patterns
+ATOMIC_GROUPS = sys.version_info >= (3, 11)
+
+def _is_any_star(item) -> bool:
+    """True for a top-level '.*' parse item"""
+    op, av = item
+    return (op is sre_parse.MAX_REPEAT and av[0] == 0 and av[1] == sre_parse.MAXREPEAT
+            and list(av[2]) == [(sre_parse.ANY, None)])
+
+def _is_simple_item(item) -> bool:
+    """A literal character other than newline, or a word-boundary assertion"""
+    op, av = item
+    return (op is sre_parse.LITERAL and av != ord('\n')) or (op is sre_parse.AT and av in _SIMPLE_ATS)
+
+def _has_line_anchor(items) -> bool:
+    """True when a parse tree contains '^' or '$' (whose meaning MULTILINE changes)"""
+    for op, av in items:
+        if op is sre_parse.AT and av in (sre_parse.AT_BEGINNING, sre_parse.AT_END):
+            return True
+        children = av if isinstance(av, (list, tuple)) else ()
+        for child in children:
+            if isinstance(child, sre_parse.SubPattern) and _has_line_anchor(child):
+                return True
+            if isinstance(child, list) and any(_has_line_anchor(sub) for sub in child
+                                               if isinstance(sub, sre_parse.SubPattern)):
+                return True
+    return False
+
+def linear_rewrite(pattern: str, flags: int = re.IGNORECASE) -> Optional[str]:
+    """
+    Backtracking-free equivalent of an `S1.*S2.*...Sn` pattern, or None
+
+    Searching `S1.*S2.*...Sn` on text that holds many S1..S(n-1) but no Sn
+    backtracks through every combination of positions (O(len^n)). When
+    S1..S(n-1) are runs of literals and word boundaries, they cannot span a
+    newline and the earliest occurrence of each is always the best
+    continuation (Sn only needs some start position later on the line), so
+
+        (?m)^(?>.*?S1)(?>.*?S2)...(?>.*?Sn)
+
+    matches exactly when the original does, in one pass per line.
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    if parsed.state.flags & (re.DOTALL | re.MULTILINE):
+        return None  # inline flags would change the rewrite's own '.' and '^'
+    items = list(parsed)
+    stars = [i for i, item in enumerate(items) if _is_any_star(item)]
+    if not stars or pattern.count('.*') != len(stars):
+        return None  # nothing to rewrite, or '.*' inside a group/escape
+    if not all(_is_any_star(item) or _is_simple_item(item) for item in items[:stars[-1]]):
+        return None
+    if _has_line_anchor(items[stars[-1] + 1:]):
+        return None
+    segments = [src for src in pattern.split('.*') if src]
+    return '^' + ''.join(f'(?>.*?{src})' for src in segments)
+
+_rewrite_cache: Dict[Tuple[str, int], Optional[str]] = {}
+
+def compile_matcher(pattern: str, flags: int = re.IGNORECASE) -> Optional["re.Pattern"]:
+    """Compiled linear rewrite of a pattern (None when the original is used as is)"""
+    if not ATOMIC_GROUPS:
+        return None
+    key = (pattern, flags)
+    if key not in _rewrite_cache:
+        _rewrite_cache[key] = linear_rewrite(pattern, flags)
+    rewrite = _rewrite_cache[key]
+    if not rewrite:
+        return None
+    try:
+        return re.compile(rewrite, flags | re.MULTILINE)
+    except re.error:
+        return None  # never worse than the original pattern
+
+# ============================================================================
+# COMPILED PATTERNS
+# ============================================================================
+
+@dataclass(frozen=True, eq=False)
+class CompiledPattern:
+    """A pattern compiled once at load time"""
+    order: int  # declaration order inside its category
+    regex: "re.Pattern"
+    pattern: str
+    confidence: float
+    description: str
+    requirement: LiteralRequirement = field(default_factory=LiteralRequirement)
+    matcher: Optional["re.Pattern"] = None  # linear-time equivalent of regex, if any
+
+    def __post_init__(self):
+        # search(text) is what evaluation calls: the rewrite when there is one
+        object.__setattr__(self, "search", (self.matcher or self.regex).search)
+
+@dataclass(frozen=True)
+class TierMatch:
+    """Winning tier/category and its matches (declaration order)"""
+    tier: str
+    category: Any
+    matches: List[Match]
+
+class PatternTier:
+    """One decision tier: categories in priority order, each with compiled patterns"""
+
+    def __init__(self, name: str,
+                 patterns_by_category: Dict[Any, List[Tuple[str, float, str]]],
+                 flags: int = re.IGNORECASE, pause: Optional[Callable[[], None]] = None):
+        """pause: called after each compiled pattern (lets a background compile yield the GIL)"""
+        self.name = name
+        self.flags = flags
+        self.categories: List[Tuple[Any, List[CompiledPattern]]] = []
+        for category, patterns in patterns_by_category.items():
+            compiled = []
+            for i, (pattern, confidence, description) in enumerate(patterns):
+                compiled.append(CompiledPattern(i, re.compile(pattern, flags), pattern, confidence, description,
+                                                literal_requirement(pattern, flags),
+                                                compile_matcher(pattern, flags)))
+                if pause is not None:
+                    pause()
+            self.categories.append((category, compiled))
+
+        # Flat probe order for decision-only checks (reordered by hit frequency)
+        self.probe_order: List[CompiledPattern] = [cp for _, cps in self.categories for cp in cps]
+        self.reordered = False
+
+        # Pre-screen index: patterns keyed by their longest required word (set lookup),
+        # else by their longest required substring (one `in` check per key)
+        self.word_keyed: Dict[str, List[CompiledPattern]] = {}
+        self.substring_keyed: Dict[str, List[CompiledPattern]] = {}
+        self.unscreened: List[CompiledPattern] = []
+        for cp in self.probe_order:
+            if cp.requirement.words:
+                self.word_keyed.setdefault(max(cp.requirement.words, key=len), []).append(cp)
+            elif cp.requirement.substrings:
+                self.substring_keyed.setdefault(max(cp.requirement.substrings, key=len), []).append(cp)
+            else:
+                self.unscreened.append(cp)
+
+    def candidates(self, screen: ScreenedText) -> Set[CompiledPattern]:
+        """Patterns whose required literals are all present (the only ones that can match)"""
+        found = {cp for cp in self.unscreened if len(screen.text) >= cp.requirement.min_length}
+        for word in screen.words & self.word_keyed.keys():
+            found.update(cp for cp in self.word_keyed[word] if cp.requirement.satisfied_by(screen))
+        for substring, cps in self.substring_keyed.items():
+            if substring in screen.text:
+                found.update(cp for cp in cps if cp.requirement.satisfied_by(screen))
+        return found
+
+    def match_category(self, compiled: List[CompiledPattern], text: str,
+                       candidates: Optional[Set[CompiledPattern]] = None) -> List[CompiledPattern]:
+        """Return every pattern of one category that matches, in declaration order"""
+        if candidates is not None:
+            compiled = [cp for cp in compiled if cp in candidates]
+        hits = [cp for cp in compiled if cp.search(text)]
+        if self.reordered and len(hits) > 1:
+            hits.sort(key=lambda cp: cp.order)
+        return hits
+
+    def apply_hit_order(self, hit_counts: Dict[str, int]):
+        """Probe the most frequently hit patterns first"""
+        def rank(cp: CompiledPattern):
+            return (-hit_counts.get(cp.pattern, 0), cp.order)
+
+        self.categories = [(category, sorted(cps, key=rank)) for category, cps in self.categories]
+        self.probe_order = sorted(self.probe_order, key=rank)
+        self.reordered = True
+
+# ============================================================================
+# TIERED EVALUATOR
+# ============================================================================
+
+class TieredPatternEvaluator:
+    """Evaluates tiers in priority order with early exit"""
+
+    def __init__(self, tiers: List[PatternTier], early_exit: bool = True, prescreen: bool = True):
+        self.tiers = tiers
+        self.tiers_by_name = {tier.name: tier for tier in tiers}
+        self.early_exit = early_exit
+        self.prescreen = prescreen
+        self.hit_counts: Dict[str, Dict[str, int]] = {tier.name: {} for tier in tiers}
+
+    def screen(self, text: str) -> Optional[ScreenedText]:
+        """Pre-screen view of text, or None when screening is off or not exact"""
+        return screen_text(text) if self.prescreen else None
+
+    def match_tier(self, tier_name: str, text: str,
+                   screen: Optional[ScreenedText] = None) -> Optional[TierMatch]:
+        """First category in the tier with any match, plus all of its matches"""
+        tier = self.tiers_by_name[tier_name]
+        candidates = None
+        if screen is not None:
+            candidates = tier.candidates(screen)
+            if not candidates:
+                return None
+
+        counts = self.hit_counts[tier_name]
+        for category, compiled in tier.categories:
+            hits = tier.match_category(compiled, text, candidates)
+            if hits:
+                for cp in hits:
+                    counts[cp.pattern] = counts.get(cp.pattern, 0) + 1
+                return TierMatch(
+                    tier=tier_name,
+                    category=category,
+                    matches=[(cp.confidence, cp.pattern, cp.description) for cp in hits]
+                )
+        return None
+
+    def match_tier_forms(self, tier_name: str, forms: Sequence[MatchForm]) -> Optional[TierMatch]:
+        """match_tier on alternative forms of one text; the first form with a hit wins"""
+        for text, screen in forms:
+            result = self.match_tier(tier_name, text, screen if self.prescreen else None)
+            if result:
+                return result
+        return None
+
+    def evaluate(self, text: str, screen: Optional[ScreenedText] = None) -> Optional[TierMatch]:
+        """
+        Evaluate all tiers in priority order
+
+        early_exit=True stops at the first matching tier (production path).
+        early_exit=False keeps scanning so hit counts cover every tier
+        (profiling path); the returned winner is the same either way.
+        A screen already built for this text (e.g. by a RequestContext) is reused.
+        """
+        if not self.prescreen:
+            screen = None
+        elif screen is None:
+            screen = self.screen(text)
+        return self.evaluate_forms(((text, screen),))
+
+    def evaluate_forms(self, forms: Sequence[MatchForm]) -> Optional[TierMatch]:
+        """
+        evaluate() on alternative forms of one text (RequestContext.match_forms)
+
+        Tiers keep their priority across forms: a hard-deny hit on the
+        normalized form beats a soft-rewrite hit on the original.
+        """
+        winner = None
+        for tier in self.tiers:
+            result = self.match_tier_forms(tier.name, forms)
+            if result and winner is None:
+                winner = result
+                if self.early_exit:
+                    break
+        return winner
+
+    def prefer(self, *matches: Optional[TierMatch]) -> Optional[TierMatch]:
+        """Highest-priority tier among separately evaluated matches (earlier argument on ties)"""
+        found = [match for match in matches if match is not None]
+        if not found:
+            return None
+        order = [tier.name for tier in self.tiers]
+        return min(found, key=lambda match: order.index(match.tier))
+
+    def decide(self, text: str) -> Optional[str]:
+        """
+        Decision-only check: name of the first tier with any hit
+
+        Probes patterns in hit-frequency order and returns on the first hit,
+        without collecting matches or computing confidence.
+        """
+        screen = self.screen(text)
+        for tier in self.tiers:
+            candidates = tier.candidates(screen) if screen is not None else None
+            for cp in tier.probe_order:
+                if candidates is not None and cp not in candidates:
+                    continue
+                if cp.search(text):
+                    return tier.name
+        return None
+
+    # ------------------------------------------------------------------------
+    # Hit-frequency profile
+    # ------------------------------------------------------------------------
+
+    def reorder_by_hits(self):
+        """Reorder every tier using the hit counts collected so far"""
+        for tier in self.tiers:
+            tier.apply_hit_order(self.hit_counts[tier.name])
+
+    def export_hit_profile(self) -> Dict[str, Dict[str, int]]:
+        """Hit counts per tier, suitable for load_hit_profile()"""
+        return {name: dict(counts) for name, counts in self.hit_counts.items()}
+
+    def load_hit_profile(self, profile):
+        """
+        Reload pattern order from profiler data
+
+        Args:
+            profile: dict {tier: {pattern: hits}} or path to a JSON file with that shape
+        """
+        if isinstance(profile, str):
+            with open(profile, 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+
+        for tier in self.tiers:
+            counts = profile.get(tier.name, {})
+            self.hit_counts[tier.name] = {pattern: int(hits) for pattern, hits in counts.items()}
+            tier.apply_hit_order(self.hit_counts[tier.name])
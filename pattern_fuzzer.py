@@ -0,0 +1,355 @@
+"""
+PATTERN FUZZER - Adversarial slow-input search over the pattern libraries
+Run: python pattern_fuzzer.py [--budget-ms 25] [--seed 0] [--raw] [--save]
+     python pattern_fuzzer.py --check   (replay the regression corpus; exit 1 when over budget)
+
+Times every pattern of the behavior library (all region shards) and the
+inbound library on inputs up to the 10KB request limit:
+
+- repetition, nested groups, digit runs, newlines and unicode filler
+- the evasion styles of abuse_tests.test_pattern_evasion (leetspeak, spaced
+  letters, newline/tab/%20/nbsp separators, homoglyphs, redaction)
+- pattern-derived near misses: the literal chain of a pattern with its last
+  segment missing, repeated - the classic trigger for catastrophic
+  backtracking in `S1.*S2.*...Sn` patterns
+- seeded random mixes of pattern tokens and noise
+
+Each input is a repeated unit rendered at increasing lengths; the first
+length over the latency budget is a finding. Findings are minimized (shortest
+length, then smallest unit, prefix and suffix still over budget) and can be
+saved to pattern_fuzz_corpus.json. The corpus is the regression suite: every
+entry is replayed against every pattern, so an edit that brings back
+backtracking on a known-bad input fails the check.
+
+Patterns are timed through CompiledPattern.search - what evaluation calls -
+or through the original regex with --raw.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, asdict, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pattern_engine import _is_any_star, sre_parse
+
+MAX_INPUT_LENGTH = 10000  # hardened_validator rejects longer content
+LENGTH_LADDER = (625, 1250, 2500, 5000, MAX_INPUT_LENGTH)
+DEFAULT_BUDGET_MS = 25.0  # a linear scan of 10KB takes about 5ms
+CORPUS_FORMAT = 1
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pattern_fuzz_corpus.json")
+
+# ============================================================================
+# TARGETS
+# ============================================================================
+
+@dataclass(frozen=True)
+class FuzzTarget:
+    """One pattern of a library and the search function to time"""
+    library: str  # "behavior" | "inbound"
+    pattern: str
+    search: Callable
+
+def fuzz_targets(raw: bool = False, library: Optional[str] = None) -> List[FuzzTarget]:
+    """Every distinct pattern of the behavior and inbound libraries"""
+    from behavior_validator import get_pattern_evaluator
+    from inbound_behavior_validator import get_inbound_pattern_evaluator
+
+    evaluators = [("behavior", get_pattern_evaluator()), ("inbound", get_inbound_pattern_evaluator())]
+    targets, seen = [], set()
+    for name, evaluator in evaluators:
+        if library is not None and name != library:
+            continue
+        for tier in evaluator.tiers:
+            for _, compiled in tier.categories:
+                for cp in compiled:
+                    if (name, cp.pattern) in seen:
+                        continue
+                    seen.add((name, cp.pattern))
+                    targets.append(FuzzTarget(name, cp.pattern, cp.regex.search if raw else cp.search))
+    return targets
+
+# ============================================================================
+# INPUTS
+# ============================================================================
+
+@dataclass(frozen=True)
+class FuzzInput:
+    """prefix + unit repeated + suffix, rendered at a given total length"""
+    kind: str
+    unit: str
+    prefix: str = ""
+    suffix: str = ""
+
+    def render(self, length: int) -> str:
+        body = max(0, length - len(self.prefix) - len(self.suffix))
+        repeated = self.unit * (body // len(self.unit) + 1) if self.unit else ""
+        return self.prefix + repeated[:body] + self.suffix
+
+FILLER_UNITS = {
+    "repetition": ["a", "aaaa ", "x y "],
+    "nested_groups": ["(", "((()))", "[{("],
+    "digits": ["1", "1 ", "12345 ", "1.5, "],
+    "newlines": ["\n", "x\n", " \n\n"],
+    "unicode": ["\U0001f525", "\u0130", "e\u0301", "\u00a0", "\u043aill ", "\u200b"],
+}
+
+_LEET = str.maketrans({"a": "4", "e": "3", "i": "1", "o": "0", "s": "$"})
+_HOMOGLYPHS = str.maketrans({"k": "\u043a", "l": "I", "o": "\u043e", "a": "\u0430"})
+
+EVASION_STYLES: Dict[str, Callable[[str], str]] = {
+    "leetspeak": lambda phrase: phrase.translate(_LEET),
+    "spaced": lambda phrase: " ".join(phrase.replace(" ", "")),
+    "newline": lambda phrase: phrase.replace(" ", "\n"),
+    "tab": lambda phrase: phrase.replace(" ", "\t"),
+    "url_encoded": lambda phrase: phrase.replace(" ", "%20"),
+    "nbsp": lambda phrase: phrase.replace(" ", "\u00a0"),
+    "homoglyph": lambda phrase: phrase.translate(_HOMOGLYPHS),
+    "redacted": lambda phrase: " ".join([phrase.split(" ")[0]] + ["****"] * (len(phrase.split(" ")) - 1)),
+}
+
+def _literal_text(items) -> str:
+    """Representative literal text of a parsed regex (first branch of alternations)"""
+    out = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            out.append(chr(av))
+        elif op is sre_parse.SUBPATTERN:
+            out.append(_literal_text(av[-1]))
+        elif op is sre_parse.BRANCH:
+            out.append(_literal_text(av[1][0]))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            out.append(_literal_text(av[2]))
+        elif op is sre_parse.IN:
+            literals = [chr(v) for o, v in av if o is sre_parse.LITERAL]
+            out.append(literals[0] if literals else "1" if (sre_parse.CATEGORY, sre_parse.CATEGORY_DIGIT) in av else "x")
+        elif op is sre_parse.ANY:
+            out.append("x")
+    return "".join(out)
+
+def pattern_segments(pattern: str) -> List[str]:
+    """Literal text of each `.*`-separated segment of a pattern"""
+    try:
+        parsed = list(sre_parse.parse(pattern, re.IGNORECASE))
+    except re.error:
+        return []
+    segments, current = [], []
+    for op, av in parsed:
+        if _is_any_star((op, av)):
+            segments.append(current)
+            current = []
+        else:
+            current.append((op, av))
+    segments.append(current)
+    return [text.strip() for text in (_literal_text(items) for items in segments) if text.strip()]
+
+def generic_inputs(first_segment: str = "") -> List[FuzzInput]:
+    """Filler units, bare and after the first segment of a pattern"""
+    inputs = []
+    for kind, units in FILLER_UNITS.items():
+        for unit in units:
+            inputs.append(FuzzInput(kind, unit))
+            if first_segment:
+                inputs.append(FuzzInput(kind, unit, prefix=first_segment + " "))
+    return inputs
+
+def pattern_inputs(pattern: str) -> List[FuzzInput]:
+    """Near misses derived from one pattern's literal chain, plain and in every evasion style"""
+    segments = pattern_segments(pattern)
+    if not segments:
+        return []
+    phrase = " ".join(segments)
+    chains = {"near_miss": phrase[:-1] + " "}
+    if len(segments) > 1:
+        chains["partial_chain"] = " ".join(segments[:-1]) + " "
+        chains["first_segment"] = segments[0] + " "
+    inputs = [FuzzInput(kind, unit) for kind, unit in chains.items()]
+    if len(segments) > 1:
+        # head repeated, then the rest of the chain minus its end
+        inputs.append(FuzzInput("head_repeated", segments[0] + " ", suffix=" " + " ".join(segments[1:-1])))
+    for style, transform in EVASION_STYLES.items():
+        inputs.append(FuzzInput(style, transform(phrase) + " "))
+        inputs.append(FuzzInput(style, transform(chains.get("partial_chain", phrase)) + " "))
+    return inputs
+
+NOISE_TOKENS = [" ", "\n", "\t", "x", "1", "'", ".", "(", "\U0001f525", "\u00a0", "you ", "me "]
+
+def random_inputs(pattern: str, rng: random.Random, count: int = 4) -> List[FuzzInput]:
+    """Seeded random mixes of a pattern's words and noise"""
+    words = " ".join(pattern_segments(pattern)).split() or ["a"]
+    tokens = words + [w + " " for w in words] + NOISE_TOKENS
+    return [FuzzInput("random", "".join(rng.choice(tokens) for _ in range(rng.randint(2, 10))))
+            for _ in range(count)]
+
+def inputs_for(pattern: str, rng: random.Random) -> List[FuzzInput]:
+    segments = pattern_segments(pattern)
+    return (pattern_inputs(pattern) + generic_inputs(segments[0] if segments else "")
+            + random_inputs(pattern, rng))
+
+# ============================================================================
+# MEASUREMENT AND MINIMIZATION
+# ============================================================================
+
+def measure_ms(search: Callable, text: str, repeats: int = 3, budget_ms: Optional[float] = None) -> float:
+    """Best-of-`repeats` search time; stops early once clearly over budget"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        search(text)
+        best = min(best, (time.perf_counter() - start) * 1000)
+        if budget_ms is not None and best > 2 * budget_ms:
+            break
+    return best
+
+@dataclass
+class SlowInput:
+    """A (minimized) input on which a pattern exceeds the budget"""
+    library: str
+    pattern: str
+    kind: str
+    prefix: str
+    unit: str
+    suffix: str
+    length: int
+    elapsed_ms: float
+
+    def render(self) -> str:
+        return FuzzInput(self.kind, self.unit, self.prefix, self.suffix).render(self.length)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def minimize(target: FuzzTarget, fuzz_input: FuzzInput, length: int, budget_ms: float) -> SlowInput:
+    """Shrink length, then unit (delta debugging), prefix and suffix while still over budget"""
+    def slow(candidate: FuzzInput, size: int) -> bool:
+        return bool(candidate.unit) and measure_ms(target.search, candidate.render(size), budget_ms=budget_ms) > budget_ms
+
+    # shortest length over budget (binary search; time grows with length)
+    low, high = 1, length
+    while low < high:
+        middle = (low + high) // 2
+        if slow(fuzz_input, middle):
+            high = middle
+        else:
+            low = middle + 1
+    length = high
+
+    # smallest unit: drop chunks, halving the chunk size when nothing can go
+    unit, chunks = fuzz_input.unit, 2
+    while len(unit) > 1:
+        size = max(1, len(unit) // chunks)
+        for start in range(0, len(unit), size):
+            candidate = unit[:start] + unit[start + size:]
+            if candidate and slow(FuzzInput(fuzz_input.kind, candidate, fuzz_input.prefix, fuzz_input.suffix), length):
+                unit = candidate
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            chunks = min(len(unit), chunks * 2)
+    current = FuzzInput(fuzz_input.kind, unit, fuzz_input.prefix, fuzz_input.suffix)
+
+    for field in ("prefix", "suffix"):
+        trimmed = replace(current, **{field: ""})
+        if getattr(current, field) and slow(trimmed, length):
+            current = trimmed
+
+    elapsed = measure_ms(target.search, current.render(length))
+    return SlowInput(target.library, target.pattern, current.kind, current.prefix, current.unit,
+                     current.suffix, length, round(elapsed, 2))
+
+def fuzz_target(target: FuzzTarget, inputs: List[FuzzInput], budget_ms: float = DEFAULT_BUDGET_MS,
+                lengths: Tuple[int, ...] = LENGTH_LADDER) -> Optional[SlowInput]:
+    """First input that drives this pattern over budget, minimized; None if none does"""
+    for fuzz_input in inputs:
+        for length in lengths:
+            text = fuzz_input.render(length)
+            if measure_ms(target.search, text, repeats=1) <= budget_ms:
+                continue
+            if measure_ms(target.search, text, budget_ms=budget_ms) > budget_ms:  # not just noise
+                return minimize(target, fuzz_input, length, budget_ms)
+    return None
+
+def fuzz(targets: List[FuzzTarget], budget_ms: float = DEFAULT_BUDGET_MS, seed: int = 0,
+         lengths: Tuple[int, ...] = LENGTH_LADDER, verbose: bool = False) -> List[SlowInput]:
+    """Fuzz every target; returns one minimized finding per slow pattern"""
+    rng = random.Random(seed)
+    findings = []
+    for target in targets:
+        finding = fuzz_target(target, inputs_for(target.pattern, rng), budget_ms, lengths)
+        if finding is not None:
+            findings.append(finding)
+            if verbose:
+                print(f"SLOW {finding.elapsed_ms:8.1f}ms len={finding.length:5d} "
+                      f"{finding.library}: {finding.pattern}  unit={finding.unit!r}")
+    return findings
+
+# ============================================================================
+# REGRESSION CORPUS
+# ============================================================================
+
+def _entry_key(entry: Dict) -> Tuple:
+    return (entry["pattern"], entry["prefix"], entry["unit"], entry["suffix"], entry["length"])
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)["entries"]
+
+def save_corpus(findings: List[SlowInput], path: str = CORPUS_PATH, budget_ms: float = DEFAULT_BUDGET_MS) -> int:
+    """Merge findings into the corpus file; returns the number of new entries"""
+    entries = load_corpus(path)
+    known = {_entry_key(entry) for entry in entries}
+    added = [f.to_dict() for f in findings if _entry_key(f.to_dict()) not in known]
+    entries.extend(added)
+    entries.sort(key=lambda entry: (entry["library"], entry["pattern"]))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"format": CORPUS_FORMAT, "budget_ms": budget_ms, "entries": entries}, f,
+                  indent=2, ensure_ascii=False)
+        f.write("\n")
+    return len(added)
+
+def check_corpus(path: str = CORPUS_PATH, budget_ms: float = DEFAULT_BUDGET_MS,
+                 targets: Optional[List[FuzzTarget]] = None) -> List[str]:
+    """Replay every corpus entry against every pattern; violations (empty when all are in budget)"""
+    targets = targets if targets is not None else fuzz_targets()
+    violations = []
+    for entry in load_corpus(path):
+        text = FuzzInput(entry["kind"], entry["unit"], entry["prefix"], entry["suffix"]).render(entry["length"])
+        for target in targets:
+            elapsed = measure_ms(target.search, text, budget_ms=budget_ms)
+            if elapsed > budget_ms:
+                violations.append(f"{target.library}: {target.pattern} took {elapsed:.1f}ms "
+                                  f"on the corpus input found for {entry['pattern']}")
+    return violations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fuzz the pattern libraries for slow inputs")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--library", choices=["behavior", "inbound"], default=None)
+    parser.add_argument("--raw", action="store_true", help="time the original regexes, not the rewrites")
+    parser.add_argument("--save", action="store_true", help="add findings to the regression corpus")
+    parser.add_argument("--check", action="store_true", help="only replay the regression corpus")
+    args = parser.parse_args()
+
+    if args.check:
+        problems = check_corpus(budget_ms=args.budget_ms, targets=fuzz_targets(args.raw, args.library))
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        print(f"{len(load_corpus())} corpus entries, {len(problems)} over {args.budget_ms}ms")
+        sys.exit(1 if problems else 0)
+
+    targets = fuzz_targets(args.raw, args.library)
+    print(f"Fuzzing {len(targets)} patterns (budget {args.budget_ms}ms, up to {MAX_INPUT_LENGTH} chars)")
+    results = fuzz(targets, args.budget_ms, args.seed, verbose=True)
+    print(f"{len(results)} patterns over budget")
+    if args.save and results:
+        print(f"{save_corpus(results, budget_ms=args.budget_ms)} new corpus entries -> {CORPUS_PATH}")
+    sys.exit(1 if results else 0)
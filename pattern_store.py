@@ -0,0 +1,181 @@
+"""
+PATTERN STORE - Versioned, hot-reloadable pattern snapshots
+Used by behavior_validator.py (see get_pattern_store)
+
+A PatternSnapshot is one version of a pattern library: its version string,
+a deep-frozen copy of the source data and the evaluators built from it. The
+compile function builds the evaluators needed to validate the library
+before it is published; other shard evaluators are built on first use, once
+per snapshot, so startup cost does not grow with the number of region
+shards. A reload also builds, before publishing, every shard evaluator the
+previous snapshot had built, so requests for shards in use never compile
+after a swap. Nothing a snapshot exposes changes after it is published.
+
+Read-copy-update: a request reads `store.current` once (a single reference
+read, no lock) and keeps using that snapshot until it finishes. reload()
+compiles the new library off the request path - reload_async() on a
+background thread - and publishes it with one reference assignment, so
+in-flight requests finish on the old version and new requests never wait
+for a compile. Background compiles yield the GIL after every pattern, so
+request threads are not held up by the switch interval while a reload runs.
+
+Library data files are JSON objects with a "version" key plus whatever the
+compile function expects (see behavior_validator.builtin_pattern_library).
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Mapping, Optional, Union
+
+from pattern_engine import TieredPatternEvaluator
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def freeze_library(value: Any) -> Any:
+    """Deep read-only copy of library data (dicts -> mapping proxies, lists -> tuples)"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze_library(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_library(item) for item in value)
+    return value
+
+@dataclass(frozen=True, eq=False)
+class PatternSnapshot:
+    """One immutable version of a pattern library; shard evaluators compiled on first use"""
+    version: str
+    library: Mapping[str, Any]  # frozen (see freeze_library)
+    build_evaluator: Callable[..., TieredPatternEvaluator]  # (shard, pause) -> evaluator
+    shard_keys: FrozenSet[str]  # every shard evaluator() accepts
+    shards: FrozenSet[str] = frozenset()
+    source: str = "builtin"
+    loaded_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    _evaluators: Dict[str, TieredPatternEvaluator] = field(default_factory=dict, init=False, repr=False)
+    _build_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def evaluator(self, shard: str, pause: Optional[Callable[[], None]] = None) -> TieredPatternEvaluator:
+        """Evaluator for a shard, compiled on the first call for this snapshot"""
+        evaluator = self._evaluators.get(shard)
+        if evaluator is None:
+            if shard not in self.shard_keys:
+                raise KeyError(shard)
+            with self._build_lock:
+                evaluator = self._evaluators.get(shard)
+                if evaluator is None:
+                    evaluator = self._evaluators[shard] = self.build_evaluator(shard, pause)
+        return evaluator
+
+    @property
+    def compiled_shards(self) -> FrozenSet[str]:
+        """Shards whose evaluators have been built so far"""
+        return frozenset(self._evaluators)
+
+def load_library_file(path: str) -> Dict[str, Any]:
+    """Read a pattern library data file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        library = json.load(f)
+    if not isinstance(library, dict) or not library.get("version"):
+        raise ValueError(f"Pattern library {path} has no version")
+    return library
+
+def yield_to_requests():
+    """Give request threads the GIL between patterns of a background compile"""
+    time.sleep(0)
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class PatternStore:
+    """Holds the published snapshot and swaps in new versions atomically"""
+
+    def __init__(self, compile_library: Callable[..., PatternSnapshot],
+                 initial_library: Dict[str, Any], source: str = "builtin"):
+        self.compile_library = compile_library
+        self._current = compile_library(initial_library, source)
+        self._reload_lock = threading.Lock()  # serializes writers only
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def current(self) -> PatternSnapshot:
+        """Published snapshot - read once per request and keep using it"""
+        return self._current
+
+    def publish(self, snapshot: PatternSnapshot) -> PatternSnapshot:
+        """Make snapshot current; returns the snapshot it replaced"""
+        with self._reload_lock:
+            previous, self._current = self._current, snapshot
+        return previous
+
+    def reload(self, source: Union[str, Dict[str, Any]],
+               pause: Optional[Callable[[], None]] = None) -> PatternSnapshot:
+        """
+        Compile a library (data file path or dict) and publish it
+
+        compile_library(library, source, pause) builds the snapshot; pause is
+        passed through (see yield_to_requests).
+
+        Compilation happens before the swap; if it fails, the current
+        snapshot stays published and the error propagates. The shards the
+        current snapshot has compiled are compiled for the new one too, so
+        the swap moves no compile onto request threads.
+        """
+        if isinstance(source, str):
+            library, label = load_library_file(source), source
+        else:
+            library, label = source, "inline"
+        snapshot = self.compile_library(library, label, pause)
+        for shard in self._current.compiled_shards & snapshot.shard_keys:
+            snapshot.evaluator(shard, pause)
+        self.publish(snapshot)
+        return snapshot
+
+    def reload_async(self, source: Union[str, Dict[str, Any]]) -> "Future":
+        """reload() on a background thread; the Future holds the new snapshot or the error"""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor  # only needed once reloads happen
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pattern-reload")
+        return self._executor.submit(self.reload, source, yield_to_requests)
+
+    def watch_file(self, path: str, interval: float = 5.0) -> threading.Thread:
+        """Reload whenever the data file's modification time changes (daemon thread)"""
+        try:
+            start_mtime = os.path.getmtime(path)
+        except OSError:
+            start_mtime = None
+
+        def run():
+            last_mtime = start_mtime
+            while not self._stop_watching.wait(interval):
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if mtime != last_mtime:
+                    last_mtime = mtime
+                    try:
+                        self.reload(path, yield_to_requests)
+                    except Exception:  # keep serving the current snapshot
+                        logger.exception("Pattern reload failed for %s", path)
+
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=run, name="pattern-watch", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self):
+        self._stop_watching.set()
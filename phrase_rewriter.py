@@ -0,0 +1,89 @@
+"""
+PHRASE REWRITER - Single-pass replacement of a fixed phrase map
+Used by the safe-rewrite helpers in unified_validator, mediation_system,
+safety_validator and preference_transformation_logic
+
+Chained str.replace calls copy the whole text once per phrase (twice with an
+.upper()/.title() variant). A PhraseRewriter turns its map into one regex
+shaped like a trie of the phrases. Phrases sharing a prefix share one branch
+("you (?:must|should|need to)"), so at each position the engine tries at
+most one alternative per distinct next character and descends a single
+path. The cost per position is bounded by the alphabet and the phrase
+length, not the number of phrases (a flat "a|b|c..." alternation tries
+every phrase). The text is rewritten in one re.sub pass.
+
+Matching is leftmost-longest, like applying the replacements one after
+another when no replacement produces another phrase (true of every map in
+this repo). With ignore_case (the default) any casing of a phrase matches and
+the replacement copies its case: "URGENT" -> "IMPORTANT", "You must" ->
+"Please consider". With ignore_case=False only the exact phrase matches and
+the replacement is used as given. Case-insensitive matching is ASCII-only:
+Unicode folds such as a dotless "ı" or a long "ſ" would match a phrase that
+.lower() cannot map back to its key (the chained str.replace calls never
+matched them either).
+
+The regex is compiled on first use, so defining a rewriter at module level
+costs nothing at import.
+"""
+
+import re
+from typing import Dict, Optional
+
+def match_case(source: str, replacement: str) -> str:
+    """replacement in the casing of source (upper, title or leading capital)"""
+    if not replacement:
+        return replacement
+    if source.isupper() and any(char.isalpha() for char in source):
+        return replacement.upper()
+    if source[:1].isupper():
+        if source.istitle() and " " in source:
+            return replacement.title()
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+def _trie_regex(trie: Dict[str, dict]) -> str:
+    """Regex for a trie node (empty-string key marks the end of a phrase)"""
+    ends_here = "" in trie
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(trie.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if ends_here else group  # greedy: the longer phrase wins
+
+class PhraseRewriter:
+    """Fixed phrase -> replacement map applied in a single pass"""
+
+    def __init__(self, replacements: Dict[str, str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self.replacements = {(phrase.lower() if ignore_case else phrase): replacement
+                             for phrase, replacement in replacements.items() if phrase}
+        self._pattern: Optional["re.Pattern"] = None
+
+    @property
+    def pattern(self) -> "re.Pattern":
+        if self._pattern is None:
+            trie: Dict[str, dict] = {}
+            for phrase in self.replacements:
+                node = trie
+                for char in phrase:
+                    node = node.setdefault(char, {})
+                node[""] = {}
+            self._pattern = re.compile(_trie_regex(trie), re.IGNORECASE | re.ASCII if self.ignore_case else 0)
+        return self._pattern
+
+    def _replace(self, match: "re.Match") -> str:
+        found = match.group()
+        if not self.ignore_case:
+            return self.replacements[found]
+        return match_case(found, self.replacements[found.lower()])
+
+    def rewrite(self, text: str) -> str:
+        if not self.replacements:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+    def matches(self, text: str) -> bool:
+        """True when text contains any phrase"""
+        return bool(self.replacements) and self.pattern.search(text) is not None
@@ -0,0 +1,157 @@
+"""
+PREFERENCE STORE - Pluggable storage for per-user preference dicts
+Used as PreferenceMediator.user_preferences (see preference_transformation_logic.py)
+
+A store is a MutableMapping of user_id -> preference dict, so existing code
+that reads and assigns `mediator.user_preferences[user_id]` works with any
+backend. Stores notify subscribers when a user's preferences are written or
+deleted; PreferenceMediator uses that to drop the compiled copy from its LRU
+cache. Editing a stored dict in place is not seen by the store.
+
+    InMemoryPreferenceStore   plain dict (the default)
+    SQLitePreferenceStore     one row per user in a SQLite file, so millions of
+                              users stay on disk and only the mediator's LRU of
+                              compiled preferences is held in memory
+
+get_many() reads many users in one round trip, for bulk preloading before
+batch jobs.
+"""
+
+import json
+import threading
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+class PreferenceStore(MutableMapping):
+    """user_id -> preference dict, with change notifications"""
+
+    def __init__(self):
+        self._listeners: List[Callable[[str], None]] = []
+
+    def subscribe(self, listener: Callable[[str], None]):
+        """Call listener(user_id) whenever that user's preferences change"""
+        self._listeners.append(listener)
+
+    def _changed(self, user_id: str):
+        for listener in self._listeners:
+            listener(user_id)
+
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Stored preferences for the given users (missing users are left out)"""
+        found = {}
+        for user_id in user_ids:
+            prefs = self.get(user_id)
+            if prefs is not None:
+                found[user_id] = prefs
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Dict]]):
+        for user_id, prefs in items:
+            self[user_id] = prefs
+
+class InMemoryPreferenceStore(PreferenceStore):
+    """Preferences kept in a dict"""
+
+    def __init__(self, initial: Optional[Dict[str, Dict]] = None):
+        super().__init__()
+        self._data: Dict[str, Dict] = dict(initial or {})
+
+    def __getitem__(self, user_id: str) -> Dict:
+        return self._data[user_id]
+
+    def get(self, user_id: str, default=None):
+        return self._data.get(user_id, default)
+
+    def __setitem__(self, user_id: str, prefs: Dict):
+        self._data[user_id] = prefs
+        self._changed(user_id)
+
+    def __delitem__(self, user_id: str):
+        del self._data[user_id]
+        self._changed(user_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class SQLitePreferenceStore(PreferenceStore):
+    """Preferences as JSON rows in a SQLite database"""
+
+    # user ids per IN (...) query; below SQLite's default bound-parameter limit
+    BATCH_SIZE = 500
+
+    def __init__(self, path: str):
+        import sqlite3  # only deployments using this backend pay for the import
+        super().__init__()
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS preferences (user_id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, user_id: str) -> Dict:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM preferences WHERE user_id = ?", (user_id,)).fetchone()
+        if row is None:
+            raise KeyError(user_id)
+        return json.loads(row[0])
+
+    def __setitem__(self, user_id: str, prefs: Dict):
+        self.put_many([(user_id, prefs)])
+
+    def __delitem__(self, user_id: str):
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM preferences WHERE user_id = ?", (user_id,)).rowcount
+            self._conn.commit()
+        if not deleted:
+            raise KeyError(user_id)
+        self._changed(user_id)
+
+    def __iter__(self) -> Iterator[str]:
+        # paged by key, so the lock is not held while the caller iterates
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT user_id FROM preferences WHERE user_id > ? ORDER BY user_id LIMIT ?",
+                    (last, self.BATCH_SIZE),
+                ).fetchall()
+            if not rows:
+                return
+            for (user_id,) in rows:
+                yield user_id
+            last = rows[-1][0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM preferences").fetchone()[0]
+
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        user_ids = list(user_ids)
+        found = {}
+        for start in range(0, len(user_ids), self.BATCH_SIZE):
+            batch = user_ids[start:start + self.BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT user_id, data FROM preferences WHERE user_id IN ({placeholders})", batch
+                ).fetchall()
+            found.update((user_id, json.loads(data)) for user_id, data in rows)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Dict]]):
+        """Write many users in one transaction"""
+        rows = [(user_id, json.dumps(prefs)) for user_id, prefs in items]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO preferences (user_id, data) VALUES (?, ?)", rows)
+            self._conn.commit()
+        for user_id, _ in rows:
+            self._changed(user_id)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -4,9 +4,18 @@ Day 2: User preference mediation for inbound content
 """
 
 import json
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, time
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from phrase_rewriter import PhraseRewriter
+from preference_store import InMemoryPreferenceStore, PreferenceStore
+
+if TYPE_CHECKING:
+    from digest_batcher import DigestBatcher
 
 class LanguageMode(Enum):
     FORMAL = "formal"
@@ -26,54 +35,182 @@ class EmotionalTone(Enum):
     PROTECTIVE = "protective"
     TRANSPARENT = "transparent"
 
+# Casual phrasing dropped or expanded in FORMAL mode (exact case: "ASAP" is an acronym)
+FORMAL_REWRITER = PhraseRewriter({"Hey!": "", "ASAP": "as soon as possible"}, ignore_case=False)
+
+# Emotional words softened in NEUTRAL tone
+NEUTRAL_TONE_REWRITER = PhraseRewriter({
+    "devastated": "concerned",
+    "amazing": "notable",
+    "terrible": "problematic",
+    "love": "appreciate"
+})
+
+BATCHED_FREQUENCIES = frozenset({NotificationFrequency.BATCHED_HOURLY, NotificationFrequency.BATCHED_DAILY})
+
+def _minute_of_day(hhmm: str) -> int:
+    parsed = time.fromisoformat(hhmm)
+    return parsed.hour * 60 + parsed.minute
+
+def _enum_value(enum_cls, value: str, default):
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return default
+
+@dataclass(frozen=True)
+class CompiledPreferences:
+    """One user's preferences parsed once: enum modes, minute-of-day windows, contact map"""
+    language: LanguageMode
+    notification_frequency: NotificationFrequency
+    emotional_tone: EmotionalTone
+    emotional_tone_value: str
+    sleep_start: int  # minute of day
+    sleep_end: int
+    contact_categories: Dict[str, str]  # source -> first priority category listing it
+    emergency_contacts: FrozenSet[str]
+
+    @classmethod
+    def from_preferences(cls, prefs: Mapping) -> "CompiledPreferences":
+        sleep_start, sleep_end = prefs["time_windows"]["sleep"].split("-")
+        contact_categories: Dict[str, str] = {}
+        for category, contacts in prefs["priority_contacts"].items():
+            for source in contacts:
+                contact_categories.setdefault(source, category)
+        return cls(
+            language=_enum_value(LanguageMode, prefs["language"], LanguageMode.CASUAL),
+            notification_frequency=_enum_value(NotificationFrequency, prefs["notification_frequency"],
+                                               NotificationFrequency.IMMEDIATE),
+            emotional_tone=_enum_value(EmotionalTone, prefs["emotional_tone"], EmotionalTone.TRANSPARENT),
+            emotional_tone_value=prefs["emotional_tone"],
+            sleep_start=_minute_of_day(sleep_start),
+            sleep_end=_minute_of_day(sleep_end),
+            contact_categories=contact_categories,
+            emergency_contacts=frozenset(prefs["priority_contacts"].get("emergency", ())),
+        )
+
+    def in_sleep_hours(self, current_time: time) -> bool:
+        """Sleep window check; both ends inclusive, as with time comparisons"""
+        minute = current_time.hour * 60 + current_time.minute
+        # the end minute itself only counts at hh:mm:00.000000
+        before_end = minute < self.sleep_end or (
+            minute == self.sleep_end and not (current_time.second or current_time.microsecond))
+        after_start = minute >= self.sleep_start
+        # Handle overnight sleep hours (22:00-09:00)
+        if self.sleep_start > self.sleep_end:
+            return after_start or before_end
+        return after_start and before_end
+
+def default_preferences() -> Dict:
+    """Default preference settings (a fresh, editable dict)"""
+    return {
+        "language": LanguageMode.CASUAL.value,
+        "notification_frequency": NotificationFrequency.IMMEDIATE.value,
+        "emotional_tone": EmotionalTone.NEUTRAL.value,
+        "time_windows": {
+            "work": "09:00-17:00",
+            "personal": "17:00-22:00",
+            "sleep": "22:00-09:00"
+        },
+        "priority_contacts": {
+            "family": [],
+            "work": [],
+            "emergency": []
+        }
+    }
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# One read-only default shared by every user without stored preferences
+DEFAULT_PREFERENCES: Mapping = _freeze(default_preferences())
+DEFAULT_COMPILED = CompiledPreferences.from_preferences(DEFAULT_PREFERENCES)
+
 class PreferenceMediator:
-    def __init__(self):
-        self.user_preferences = {}
+    def __init__(self, store: Optional[PreferenceStore] = None, cache_size: int = 10000):
+        """
+        store: where user preferences live (in memory by default); also
+        reachable as user_preferences
+        cache_size: compiled preferences kept, least recently used evicted
+        """
+        self.user_preferences = store if store is not None else InMemoryPreferenceStore()
+        self.cache_size = cache_size
+        self._compiled: "OrderedDict[str, CompiledPreferences]" = OrderedDict()
+        self.user_preferences.subscribe(self.invalidate_preferences)
+    
+    def load_user_preferences(self, user_id: str) -> Mapping:
+        """Load user preferences from storage (DEFAULT_PREFERENCES when none are stored)"""
+        prefs = self.user_preferences.get(user_id)
+        return DEFAULT_PREFERENCES if prefs is None else prefs
+    
+    def compiled_preferences(self, user_id: str) -> CompiledPreferences:
+        """
+        Compiled preferences from the LRU cache, loaded from the store on a miss
+        
+        Writes through the store invalidate the cached copy; call
+        invalidate_preferences after changing a stored dict in place.
+        """
+        compiled = self._compiled.get(user_id)
+        if compiled is not None:
+            self._compiled.move_to_end(user_id)
+            return compiled
+        prefs = self.user_preferences.get(user_id)
+        compiled = DEFAULT_COMPILED if prefs is None else CompiledPreferences.from_preferences(prefs)
+        self._cache(user_id, compiled)
+        return compiled
+    
+    def _cache(self, user_id: str, compiled: CompiledPreferences):
+        self._compiled[user_id] = compiled
+        self._compiled.move_to_end(user_id)
+        while len(self._compiled) > self.cache_size:
+            self._compiled.popitem(last=False)
+    
+    def preload(self, user_ids: Iterable[str]) -> int:
+        """Compile many users with one store read (batch jobs); returns how many had stored preferences"""
+        user_ids = list(user_ids)[-self.cache_size:] if self.cache_size else []
+        stored = self.user_preferences.get_many(user_ids)
+        for user_id in user_ids:
+            prefs = stored.get(user_id)
+            self._cache(user_id, DEFAULT_COMPILED if prefs is None else CompiledPreferences.from_preferences(prefs))
+        return len(stored)
     
-    def load_user_preferences(self, user_id: str) -> Dict:
-        """Load user preferences from storage"""
-        return self.user_preferences.get(user_id, self._default_preferences())
+    def update_user_preferences(self, user_id: str, prefs: Dict):
+        """Store preferences for a user (the store drops the compiled copy)"""
+        self.user_preferences[user_id] = prefs
+    
+    def invalidate_preferences(self, user_id: str):
+        self._compiled.pop(user_id, None)
     
     def _default_preferences(self) -> Dict:
         """Default preference settings"""
-        return {
-            "language": LanguageMode.CASUAL.value,
-            "notification_frequency": NotificationFrequency.IMMEDIATE.value,
-            "emotional_tone": EmotionalTone.NEUTRAL.value,
-            "time_windows": {
-                "work": "09:00-17:00",
-                "personal": "17:00-22:00",
-                "sleep": "22:00-09:00"
-            },
-            "priority_contacts": {
-                "family": [],
-                "work": [],
-                "emergency": []
-            }
-        }
+        return default_preferences()
     
     def should_deliver_now(self, user_id: str, source: str, urgency: str) -> Tuple[bool, str]:
         """Determine if content should be delivered immediately"""
-        prefs = self.load_user_preferences(user_id)
+        prefs = self.compiled_preferences(user_id)
         current_time = datetime.now().time()
         
         # Emergency always delivers
-        if urgency == "critical" or source in prefs["priority_contacts"]["emergency"]:
+        if urgency == "critical" or source in prefs.emergency_contacts:
             return True, "emergency_override"
         
         # Priority contacts bypass time windows
-        if self._is_priority_contact(source, prefs):
+        if source in prefs.contact_categories:
             return True, "priority_contact"
         
         # Check time windows
-        if self._in_sleep_hours(current_time, prefs):
+        if prefs.in_sleep_hours(current_time):
             return False, "sleep_hours"
         
         # Check notification frequency
-        if prefs["notification_frequency"] == NotificationFrequency.ON_DEMAND.value:
+        if prefs.notification_frequency == NotificationFrequency.ON_DEMAND:
             return False, "on_demand_mode"
         
-        if prefs["notification_frequency"] in [NotificationFrequency.BATCHED_HOURLY.value, NotificationFrequency.BATCHED_DAILY.value]:
+        if prefs.notification_frequency in BATCHED_FREQUENCIES:
             if urgency in ["low", "medium"]:
                 return False, "batched_delivery"
         
@@ -81,13 +218,13 @@ class PreferenceMediator:
     
     def transform_content(self, content: str, user_id: str, context: Dict) -> Dict:
         """Transform content based on user preferences"""
-        prefs = self.load_user_preferences(user_id)
+        prefs = self.compiled_preferences(user_id)
         
         # Apply language transformation
-        transformed_content = self._apply_language_mode(content, prefs["language"])
+        transformed_content = self._apply_language_mode(content, prefs.language)
         
         # Apply emotional tone filtering
-        transformed_content = self._apply_emotional_tone(transformed_content, prefs["emotional_tone"], context)
+        transformed_content = self._apply_emotional_tone(transformed_content, prefs.emotional_tone, context)
         
         # Generate delivery format
         return {
@@ -95,78 +232,50 @@ class PreferenceMediator:
             "urgency_level": self._adjust_urgency(context.get("urgency", "medium"), prefs),
             "source_hidden": self._format_source(context.get("source", "unknown"), prefs),
             "suggested_action": self._generate_action(context, prefs),
-            "emotional_tone": prefs["emotional_tone"]
+            "emotional_tone": prefs.emotional_tone_value
         }
     
-    def _apply_language_mode(self, content: str, language_mode: str) -> str:
+    def _apply_language_mode(self, content: str, language_mode: LanguageMode) -> str:
         """Transform content based on language preference"""
-        if language_mode == LanguageMode.MINIMAL.value:
+        if language_mode == LanguageMode.MINIMAL:
             return f"• {content[:50]}..." if len(content) > 50 else f"• {content}"
         
-        elif language_mode == LanguageMode.FORMAL.value:
+        elif language_mode == LanguageMode.FORMAL:
             # Remove casual language, make professional
-            formal_content = content.replace("Hey!", "").replace("ASAP", "as soon as possible")
+            formal_content = FORMAL_REWRITER.rewrite(content)
             return f"Communication received: {formal_content}"
         
-        elif language_mode == LanguageMode.DETAILED.value:
+        elif language_mode == LanguageMode.DETAILED:
             return f"Message content: {content}\nContext: Inbound communication requiring review"
         
         else:  # CASUAL
             return content
     
-    def _apply_emotional_tone(self, content: str, tone_mode: str, context: Dict) -> str:
+    def _apply_emotional_tone(self, content: str, tone_mode: EmotionalTone, context: Dict) -> str:
         """Filter content based on emotional tone preference"""
-        if tone_mode == EmotionalTone.PROTECTIVE.value:
+        if tone_mode == EmotionalTone.PROTECTIVE:
             # Check for emotional manipulation indicators
             manipulation_keywords = ["devastated", "crushing", "heartbroken", "abandoned", "hurt"]
             if any(keyword in content.lower() for keyword in manipulation_keywords):
                 return "Message contains concerning language - review when ready"
         
-        elif tone_mode == EmotionalTone.NEUTRAL.value:
+        elif tone_mode == EmotionalTone.NEUTRAL:
             # Strip emotional language
-            neutral_replacements = {
-                "devastated": "concerned",
-                "amazing": "notable", 
-                "terrible": "problematic",
-                "love": "appreciate"
-            }
-            for emotional, neutral in neutral_replacements.items():
-                content = content.replace(emotional, neutral)
+            content = NEUTRAL_TONE_REWRITER.rewrite(content)
         
-        elif tone_mode == EmotionalTone.POSITIVE.value:
+        elif tone_mode == EmotionalTone.POSITIVE:
             # Emphasize constructive aspects
             if context.get("risk_categories"):
                 return f"Message received - constructive review recommended"
         
         return content
     
-    def _is_priority_contact(self, source: str, prefs: Dict) -> bool:
-        """Check if source is in priority contacts"""
-        priority_lists = prefs["priority_contacts"]
-        for category in priority_lists.values():
-            if source in category:
-                return True
-        return False
-    
-    def _in_sleep_hours(self, current_time: time, prefs: Dict) -> bool:
-        """Check if current time is in sleep hours"""
-        sleep_window = prefs["time_windows"]["sleep"]
-        start_str, end_str = sleep_window.split("-")
-        start_time = time.fromisoformat(start_str)
-        end_time = time.fromisoformat(end_str)
-        
-        # Handle overnight sleep hours (22:00-09:00)
-        if start_time > end_time:
-            return current_time >= start_time or current_time <= end_time
-        else:
-            return start_time <= current_time <= end_time
-    
-    def _adjust_urgency(self, original_urgency: str, prefs: Dict) -> str:
+    def _adjust_urgency(self, original_urgency: str, prefs: CompiledPreferences) -> str:
         """Adjust urgency based on user preferences and context"""
         current_time = datetime.now().time()
         
         # Reduce urgency during sleep hours for non-emergency
-        if self._in_sleep_hours(current_time, prefs):
+        if prefs.in_sleep_hours(current_time):
             if original_urgency == "high":
                 return "medium"
             elif original_urgency == "medium":
@@ -174,13 +283,12 @@ class PreferenceMediator:
         
         return original_urgency
     
-    def _format_source(self, source: str, prefs: Dict) -> str:
+    def _format_source(self, source: str, prefs: CompiledPreferences) -> str:
         """Format source information based on preferences"""
-        if self._is_priority_contact(source, prefs):
+        category = prefs.contact_categories.get(source)
+        if category is not None:
             # Show more detail for priority contacts
-            for category, contacts in prefs["priority_contacts"].items():
-                if source in contacts:
-                    return f"{category.title()} contact"
+            return f"{category.title()} contact"
         
         # Generic formatting for unknown sources
         if "@" in source:
@@ -190,7 +298,7 @@ class PreferenceMediator:
         else:
             return "Unknown contact"
     
-    def _generate_action(self, context: Dict, prefs: Dict) -> str:
+    def _generate_action(self, context: Dict, prefs: CompiledPreferences) -> str:
         """Generate suggested action based on content and preferences"""
         if context.get("risk_categories"):
             return "Review for safety concerns"
@@ -198,15 +306,21 @@ class PreferenceMediator:
         if context.get("urgency") == "high":
             return "Response recommended"
         
-        if prefs["notification_frequency"] in [NotificationFrequency.BATCHED_HOURLY.value, NotificationFrequency.BATCHED_DAILY.value]:
+        if prefs.notification_frequency in BATCHED_FREQUENCIES:
             return "Included in next digest"
         
         return "No immediate action required"
 
 # Integration with inbound validator
-def apply_user_preferences(validator_output: Dict, user_id: str) -> Dict:
-    """Apply user preferences to validator output"""
-    mediator = PreferenceMediator()
+def apply_user_preferences(validator_output: Dict, user_id: str,
+                           digest_batcher: Optional["DigestBatcher"] = None) -> Dict:
+    """
+    Apply user preferences to validator output
+    
+    digest_batcher: when given, batched-delivery messages are added to the
+    user's next digest (delivered by the batcher) instead of being dropped
+    """
+    mediator = digest_batcher.mediator if digest_batcher is not None else PreferenceMediator()
     
     # Check delivery timing
     should_deliver, reason = mediator.should_deliver_now(
@@ -215,6 +329,20 @@ def apply_user_preferences(validator_output: Dict, user_id: str) -> Dict:
         validator_output.get("urgency_level", "medium")
     )
     
+    if not should_deliver and reason == "batched_delivery" and digest_batcher is not None:
+        digest_batcher.add(
+            user_id,
+            validator_output.get("message_primary", ""),
+            source=validator_output.get("source", "unknown"),
+            urgency=validator_output.get("urgency_level", "medium"),
+            risk_categories=validator_output.get("risk_categories"),
+        )
+        return {
+            "delivery_status": "delayed",
+            "delay_reason": reason,
+            "scheduled_delivery": "digest"
+        }
+    
     if not should_deliver:
         return {
             "delivery_status": "delayed",
@@ -0,0 +1,87 @@
+"""
+REQUEST CONTEXT - Hash-once view of a single message
+Carried through BehaviorValidator, EnforcementAdapter, the backend middleware and the bucket loggers
+
+Every derived form of the message (lowercase text, evasion-normalized text,
+word tokens, pre-screen view, content digests, user id hash) is computed on first use and then
+reused by every stage that handles the same request, instead of each stage
+lowering and hashing the content again.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pattern_engine import MatchForm, ScreenedText, screen_text, tokenize
+from text_features import TextFeatures, extract_text_features
+from text_normalizer import normalize_text
+from trace_ids import ContentDigest, get_trace_id_service
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Immutable request inputs plus lazily computed, cached derived forms"""
+    content: str
+    user_id: str = "anonymous"
+    session_id: str = "unknown"
+    _memo: Dict[str, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @cached_property
+    def lowered(self) -> str:
+        """Lowercase form the pattern libraries match against"""
+        return self.content.lower()
+
+    @cached_property
+    def tokens(self) -> Tuple[str, ...]:
+        """Word tokens of the lowercase form"""
+        return tuple(tokenize(self.lowered))
+
+    @cached_property
+    def screen(self) -> Optional[ScreenedText]:
+        """Pre-screen view (None when the text is not ASCII after lowercasing)"""
+        if not self.lowered.isascii():
+            return None
+        return ScreenedText(self.lowered, frozenset(self.tokens))
+
+    @cached_property
+    def normalized(self) -> str:
+        """Lowercase form with evasion tricks folded (leet, homoglyphs, spacing)"""
+        return normalize_text(self.lowered)
+
+    @cached_property
+    def match_forms(self) -> Tuple[MatchForm, ...]:
+        """(text, screen) forms the pattern libraries match: lowercase, then normalized if different"""
+        if self.normalized == self.lowered:
+            return ((self.lowered, self.screen),)
+        return ((self.lowered, self.screen), (self.normalized, screen_text(self.normalized)))
+
+    @cached_property
+    def features(self) -> TextFeatures:
+        """Length/word/line/number counts, equal to those of the lowercase form"""
+        # lower() only changes lengths and word boundaries for U+0130 (dotted
+        # capital I); otherwise counting the content itself is exact
+        if "\u0130" not in self.content:
+            return extract_text_features(self.content)
+        return extract_text_features(self.lowered)._replace(
+            uppercase_ratio=extract_text_features(self.content).uppercase_ratio)
+
+    @cached_property
+    def digest(self) -> ContentDigest:
+        """Digest of the lowercase form (outbound trace IDs)"""
+        return get_trace_id_service().digest(self.lowered)
+
+    @cached_property
+    def content_digest(self) -> ContentDigest:
+        """Digest of the original content (inbound trace IDs, template selection)"""
+        return get_trace_id_service().digest(self.content)
+
+    @cached_property
+    def user_id_hash(self) -> str:
+        """Short user id hash used by bucket logs"""
+        return hashlib.md5(self.user_id.encode()).hexdigest()[:8]
+
+    def memo(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Compute a per-request artifact once (e.g. the pattern evaluation result)"""
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
@@ -0,0 +1,49 @@
+"""
+RESULT TYPES - Shared base for slotted, frozen result objects
+Used by ValidationResult, InboundValidationResult, MediationResult,
+EnforcementResult, ExecutionResult and BucketLogEntry
+
+Result dataclasses are declared with frozen=True, **SLOTS so they carry no
+per-instance __dict__ (dataclass slots need Python 3.10; older interpreters
+get ordinary frozen dataclasses). Their serialized form is built once on
+first use and cached in a dedicated slot: as_mapping() hands out a read-only
+view of it without copying, to_dict() a copy callers may modify, lists and
+dicts included.
+"""
+
+import sys
+from dataclasses import fields
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+
+SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+def _copy_containers(value: Any) -> Any:
+    """Copy of nested lists/dicts (leaves shared), so a caller's edits stay local"""
+    if isinstance(value, list):
+        return [_copy_containers(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_containers(item) for key, item in value.items()}
+    return value
+
+class SerializedResult:
+    """Mixin: serialize once, share a zero-copy read-only view"""
+
+    __slots__ = ("_serialized",)
+
+    def _serialize(self) -> Dict[str, Any]:
+        """Field name -> value (same shape as dataclasses.asdict, without the deep copy)"""
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def as_mapping(self) -> Mapping[str, Any]:
+        """Read-only view of the cached serialized form (no copy)"""
+        try:
+            serialized = self._serialized
+        except AttributeError:
+            serialized = self._serialize()
+            object.__setattr__(self, "_serialized", serialized)  # frozen: bypass __setattr__
+        return MappingProxyType(serialized)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copy of the cached serialized form (lists and dicts are copied too)"""
+        return {key: _copy_containers(value) for key, value in self.as_mapping().items()}
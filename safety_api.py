@@ -0,0 +1,104 @@
+"""
+SAFETY API - Lightweight facade over the validators
+Import this instead of the validator modules in latency-sensitive entry points
+
+Importing safety_api loads no validator module. Each validator is imported
+and constructed the first time one of its functions is called, then reused
+for the life of the process, so a serverless cold start only pays for the
+validators a request actually touches. Every API function returns a plain
+dict that json.dumps accepts (enums are replaced by their values).
+
+    from safety_api import validate_behavior
+    result = validate_behavior("I'll always be here for you")
+"""
+
+import _thread
+import importlib
+
+# Kept import-light on purpose: builtin generics instead of typing and a bare
+# _thread lock instead of threading (each would more than double import time)
+
+# name -> (module, class) loaded on first use
+VALIDATORS = {
+    "behavior": ("behavior_validator", "BehaviorValidator"),
+    "inbound": ("inbound_behavior_validator", "InboundBehaviorValidator"),
+    "unified": ("unified_validator", "UnifiedValidator"),
+    "mediation": ("mediation_system", "MediationSystem"),
+}
+
+_instances: dict = {}
+_lock = _thread.allocate_lock()
+
+def get_validator(name: str):
+    """Shared instance of a validator, imported and built on first use"""
+    instance = _instances.get(name)
+    if instance is None:
+        module_name, class_name = VALIDATORS[name]
+        with _lock:
+            instance = _instances.get(name)
+            if instance is None:
+                module = importlib.import_module(module_name)
+                instance = _instances[name] = getattr(module, class_name)()
+    return instance
+
+def loaded_validators() -> list:
+    """Validators built so far in this process"""
+    return sorted(_instances)
+
+def _json_ready(value):
+    """Copy of a result dict/list with enums replaced by their values"""
+    from enum import Enum  # already loaded by the validator that built the result
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_ready(item) for item in value]
+    return value
+
+# ============================================================================
+# API FUNCTIONS
+# ============================================================================
+
+def validate_behavior(conversational_output: str, **kwargs) -> dict:
+    """Outbound behavior validation (see BehaviorValidator.validate_behavior)"""
+    return get_validator("behavior").validate_behavior("auto", conversational_output, **kwargs).to_dict()
+
+def validate_inbound_content(content: str, **kwargs) -> dict:
+    """Inbound content validation (see InboundBehaviorValidator.validate_inbound_content)"""
+    return get_validator("inbound").validate_inbound_content(content, **kwargs).to_dict()
+
+def validate_action(action_payload: dict) -> dict:
+    """Unified outbound action validation; action_payload holds ActionPayload fields"""
+    from dataclasses import asdict
+    from unified_validator import ActionPayload
+    return _json_ready(asdict(get_validator("unified").validate_action(ActionPayload(**action_payload))))
+
+def validate_inbound(message_payload: dict) -> dict:
+    """Unified inbound message validation; message_payload holds MessagePayload fields"""
+    from dataclasses import asdict
+    from unified_validator import MessagePayload
+    return _json_ready(asdict(get_validator("unified").validate_inbound(MessagePayload(**message_payload))))
+
+def mediate_inbound(message: dict) -> dict:
+    """Inbound mediation before UI render; message holds InboundMessage fields"""
+    from mediation_system import InboundMessage
+    return _json_ready(get_validator("mediation").validate_inbound(InboundMessage(**message)).to_dict())
+
+def mediate_outbound(action: dict) -> dict:
+    """Outbound mediation before execution; action holds OutboundAction fields"""
+    from mediation_system import OutboundAction
+    return _json_ready(get_validator("mediation").validate_outbound(OutboundAction(**action)).to_dict())
+
+# ============================================================================
+# INTERNAL METRICS
+# ============================================================================
+
+def offender_metrics(n: int = 10) -> dict:
+    """Top offending senders seen by the validators in this process
+
+    For the process hosting the validators (operator dashboards, logs); it
+    holds sender ids, so keep it off public routes such as /health.
+    """
+    from heavy_hitters import get_offender_tracker
+    return get_offender_tracker().snapshot(n)
@@ -4,6 +4,20 @@ import time
 import hashlib
 from datetime import datetime
 
+from phrase_rewriter import PhraseRewriter
+
+# Outbound REWRITE maps (any casing, one pass)
+PUSHY_REWRITER = PhraseRewriter({
+    'you should': 'you might consider',
+    'you need to': 'you could',
+    'you must': 'please consider',
+    'urgent': 'important'
+})
+URGENCY_REWRITER = PhraseRewriter({
+    'immediately': 'when convenient',
+    'right now': 'at your convenience'
+})
+
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         try:
@@ -137,11 +151,8 @@ class handler(BaseHTTPRequestHandler):
             }
         
         # REWRITE scenarios - needs modification
-        if any(phrase in content_lower for phrase in ['you should', 'you need to', 'you must', 'urgent']):
-            safe_content = content.replace('you should', 'you might consider')
-            safe_content = safe_content.replace('you need to', 'you could')
-            safe_content = safe_content.replace('you must', 'please consider')
-            safe_content = safe_content.replace('urgent', 'important')
+        if PUSHY_REWRITER.matches(content):
+            safe_content = PUSHY_REWRITER.rewrite(content)
             
             return {
                 "decision": "REWRITE",
@@ -155,9 +166,8 @@ class handler(BaseHTTPRequestHandler):
                 "timestamp": datetime.now().isoformat() + "Z"
             }
         
-        if 'immediately' in content_lower or 'right now' in content_lower:
-            safe_content = content.replace('immediately', 'when convenient')
-            safe_content = safe_content.replace('right now', 'at your convenience')
+        if URGENCY_REWRITER.matches(content):
+            safe_content = URGENCY_REWRITER.rewrite(content)
             
             return {
                 "decision": "REWRITE",
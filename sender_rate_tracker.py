@@ -0,0 +1,104 @@
+"""
+SENDER RATE TRACKER - In-process sliding-window message counts per sender
+Fills InboundBehaviorValidator frequency data when the caller supplies none
+
+Each sender has a ring of fixed-width time buckets (one minute by default)
+covering the window (one hour by default) plus a running total, so recording
+a message and reading the rate are O(1) and a sender costs one small array
+of counters no matter how much it sends. The count is the number of
+messages in the buckets overlapping the window; the oldest bucket may be
+partly outside it.
+
+Senders are kept in least-recently-active order and the oldest are evicted
+past `max_senders`, so idle senders age out and memory stays bounded.
+"""
+
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+# Placeholder sender ids shared by unrelated senders; never counted
+UNTRACKED_SENDERS = frozenset({"", "unknown", "anonymous"})
+
+class _SenderWindow:
+    """Ring of per-bucket message counts for one sender"""
+
+    __slots__ = ("counts", "last_bucket", "total")
+
+    def __init__(self, buckets: int, bucket: int):
+        self.counts = array("I", bytes(4 * buckets))
+        self.last_bucket = bucket
+        self.total = 0
+
+    def advance(self, bucket: int):
+        """Zero the buckets that fell out of the window since the last message"""
+        size = len(self.counts)
+        elapsed = bucket - self.last_bucket
+        if elapsed <= 0:
+            return
+        if elapsed >= size:
+            self.counts = array("I", bytes(4 * size))
+            self.total = 0
+        else:
+            for step in range(1, elapsed + 1):
+                slot = (self.last_bucket + step) % size
+                self.total -= self.counts[slot]
+                self.counts[slot] = 0
+        self.last_bucket = bucket
+
+class SenderRateTracker:
+    """Per-sender sliding-window message counter with LRU eviction of idle senders"""
+
+    def __init__(self, window_seconds: int = 3600, bucket_seconds: int = 60,
+                 max_senders: int = 100000, clock: Callable[[], float] = time.time):
+        if window_seconds % bucket_seconds:
+            raise ValueError("window_seconds must be a multiple of bucket_seconds")
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.buckets = window_seconds // bucket_seconds
+        self.max_senders = max_senders
+        self.clock = clock
+        self._senders: "OrderedDict[str, _SenderWindow]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, now: Optional[float]) -> int:
+        return int((self.clock() if now is None else now) // self.bucket_seconds)
+
+    def record(self, sender_id: str, now: Optional[float] = None) -> int:
+        """Count one message from sender_id; returns its messages in the window"""
+        bucket = self._bucket(now)
+        with self._lock:
+            window = self._senders.get(sender_id)
+            if window is None:
+                window = self._senders[sender_id] = _SenderWindow(self.buckets, bucket)
+                if len(self._senders) > self.max_senders:
+                    self._senders.popitem(last=False)
+            else:
+                self._senders.move_to_end(sender_id)
+                window.advance(bucket)
+            window.counts[bucket % self.buckets] += 1
+            window.total += 1
+            return window.total
+
+    def count(self, sender_id: str, now: Optional[float] = None) -> int:
+        """Messages from sender_id in the window (without recording one)"""
+        bucket = self._bucket(now)
+        with self._lock:
+            window = self._senders.get(sender_id)
+            if window is None:
+                return 0
+            window.advance(bucket)
+            return window.total
+
+    def per_hour(self, count: int) -> float:
+        """A window count as messages per hour"""
+        return count * 3600 / self.window_seconds
+
+    def frequency_data(self, sender_id: str, now: Optional[float] = None) -> Dict[str, float]:
+        """frequency_data as InboundBehaviorValidator expects it"""
+        return {"messages_per_hour": self.per_hour(self.count(sender_id, now))}
+
+    def __len__(self) -> int:
+        return len(self._senders)
@@ -0,0 +1,287 @@
+"""
+STREAMING VALIDATOR - Incremental validation of token-by-token LLM output
+Wraps BehaviorValidator for replies that arrive as a stream of chunks
+
+BehaviorValidator.validate_behavior needs the complete reply. A streaming
+session instead keeps per-pattern matcher state across chunks and only
+rescans a bounded overlap window at each feed(), so a HARD_DENY pattern
+fires as soon as it completes and generation can be cut off mid-stream.
+
+Every pattern is split at its top-level '.*' into bounded segments that must
+appear in order on one line (which is what '.*' means without DOTALL). Each
+segment has a finite maximum width, so only the last `max width` characters
+of the previous text plus the new chunk need scanning. A segment match is
+only accepted once at least one character follows it, so a trailing \\b
+cannot fire early on a word that is still being generated.
+
+finish() runs the regular batch validation on the full text, so the final
+ValidationResult is identical to validating the buffered reply. Decisions
+before finish() cover the text as written; its evasion-normalized form
+(text_normalizer) is only matched by finish().
+"""
+
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from behavior_validator import (
+    BehaviorValidator, Decision, RiskCategory, ValidationResult,
+    current_pattern_snapshot, region_shard_for
+)
+from pattern_artifact import get_pattern_artifact
+from pattern_engine import CompiledPattern, TieredPatternEvaluator, _is_any_star, extract_literal_requirement
+from request_context import RequestContext
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+
+import re
+
+# ============================================================================
+# STREAM PATTERNS
+# ============================================================================
+
+@dataclass(frozen=True, eq=False)
+class StreamPattern:
+    """A compiled pattern split into bounded segments joined by '.*'"""
+    tier: str
+    category: Any
+    compiled: CompiledPattern
+    segments: List["re.Pattern"]
+    widths: List[int]  # maximum match width of each segment
+    keys: List[str]    # longest literal each segment match must contain ("" if none)
+
+# (segment source, maximum match width, literal key) per segment; None if the pattern is deferred
+SegmentPlan = Optional[Tuple[Tuple[str, int, str], ...]]
+
+def _segment_key(source: str, flags: int) -> str:
+    """Longest literal a segment match must contain (used as a cheap str.find pre-check)"""
+    requirement = extract_literal_requirement(source, flags)
+    return max([*requirement.words, *requirement.substrings], key=len, default="")
+
+def derive_segment_plan(pattern: str, flags: int) -> SegmentPlan:
+    """Split a pattern at its top-level '.*', or None if the segments are not all bounded"""
+    parsed = sre_parse.parse(pattern, flags)
+    top_level_stars = sum(1 for item in parsed if _is_any_star(item))
+    if pattern.count('.*') != top_level_stars:
+        return None  # '.*' nested in a group or escaped - no safe textual split
+
+    plan = []
+    for source in filter(None, pattern.split('.*')):
+        width = sre_parse.parse(source, flags).getwidth()[1]
+        if width >= sre_parse.MAXREPEAT:
+            return None
+        plan.append((source, width, _segment_key(source, flags)))
+    return tuple(plan)
+
+_segment_plan_cache: Dict[Tuple[str, int], SegmentPlan] = {}
+
+def segment_plan(pattern: str, flags: int) -> SegmentPlan:
+    """Segment plan of a pattern: from the pattern artifact if present, else derived once"""
+    key = (pattern, flags)
+    if key not in _segment_plan_cache:
+        precomputed = get_pattern_artifact().segment_plans
+        _segment_plan_cache[key] = precomputed[key] if key in precomputed else derive_segment_plan(pattern, flags)
+    return _segment_plan_cache[key]
+
+def build_stream_patterns(evaluator: TieredPatternEvaluator):
+    """
+    Split every pattern of the evaluator into stream patterns
+
+    Returns (stream_patterns, deferred): patterns that cannot be split into
+    bounded segments are deferred to the batch check in finish() and are
+    returned as StreamPatterns without segments.
+    """
+    stream_patterns: List[StreamPattern] = []
+    deferred: List[StreamPattern] = []
+    for tier in evaluator.tiers:
+        for category, compiled in tier.categories:
+            for cp in sorted(compiled, key=lambda cp: cp.order):
+                plan = segment_plan(cp.pattern, cp.regex.flags)
+                if plan is None:
+                    deferred.append(StreamPattern(tier.name, category, cp, [], [], []))
+                    continue
+                segments = [re.compile(source, cp.regex.flags) for source, _, _ in plan]
+                widths = [width for _, width, _ in plan]
+                keys = [key for _, _, key in plan]
+                stream_patterns.append(StreamPattern(tier.name, category, cp, segments, widths, keys))
+    return stream_patterns, deferred
+
+_stream_pattern_cache: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+def get_stream_patterns(evaluator: TieredPatternEvaluator):
+    """Stream patterns for an evaluator, built once per evaluator"""
+    cached = _stream_pattern_cache.get(evaluator)
+    if cached is None:
+        cached = build_stream_patterns(evaluator)
+        _stream_pattern_cache[evaluator] = cached
+    return cached
+
+# ============================================================================
+# PARTIAL DECISIONS
+# ============================================================================
+
+@dataclass(frozen=True)
+class PartialDecision:
+    """Decision for the text streamed so far"""
+    decision: Decision
+    risk_category: RiskCategory
+    final: bool  # True once HARD_DENY fired - stop generating
+    matched_patterns: List[str] = field(default_factory=list)
+    chars_seen: int = 0
+
+@dataclass
+class _PatternState:
+    """Progress of one stream pattern: next segment and where to look for it"""
+    segment: int = 0
+    search_from: int = 0  # absolute offset
+
+# ============================================================================
+# STREAMING SESSION
+# ============================================================================
+
+class StreamingValidationSession:
+    """
+    Incremental validation of one generated reply
+
+    Usage:
+        session = StreamingValidationSession()
+        for chunk in llm_stream:
+            partial = session.feed(chunk)
+            if partial.final:
+                break  # HARD_DENY - cut generation off
+        result = session.finish()
+    """
+
+    def __init__(self, validator: Optional[BehaviorValidator] = None, **validate_kwargs):
+        self.validator = validator or BehaviorValidator()
+        self.validate_kwargs = validate_kwargs
+        # The whole reply is validated on the pattern version current when it started
+        self.snapshot = current_pattern_snapshot()
+        evaluator = self.snapshot.evaluator(
+            region_shard_for(validate_kwargs.get("region_rule_status"), self.snapshot.shards)
+        )
+        self.stream_patterns, self.deferred = get_stream_patterns(evaluator)
+        self.overlap = max((w for sp in self.stream_patterns for w in sp.widths), default=0) + 1
+        self.tier_order = [tier.name for tier in evaluator.tiers]
+
+        self._states = [_PatternState() for _ in self.stream_patterns]
+        # Patterns indexed by the literal key of the segment they wait for, so a
+        # feed only touches patterns whose next key occurs in the new text
+        self._waiting: Dict[str, Set[int]] = {}
+        for index in range(len(self.stream_patterns)):
+            self._wait(index)
+        self._hits: Dict[str, List[StreamPattern]] = {}
+        self._chunks: List[str] = []
+        self._window = ""          # lowercased tail of the stream (bounded)
+        self._window_start = 0     # absolute offset of _window[0]
+        self._seen = 0
+        self._partial = PartialDecision(Decision.ALLOW, RiskCategory.CLEAN, False)
+
+    @property
+    def blocked(self) -> bool:
+        return self._partial.final
+
+    def _wait(self, index: int):
+        state, sp = self._states[index], self.stream_patterns[index]
+        self._waiting.setdefault(sp.keys[state.segment], set()).add(index)
+
+    def feed(self, chunk: str) -> PartialDecision:
+        """Add the next chunk of generated text and return the decision so far"""
+        if self._partial.final or not chunk:
+            return self._partial
+
+        self._chunks.append(chunk)
+        lowered = chunk.lower()
+        text = self._window + lowered
+        base = self._window_start
+        previous = self._seen
+        self._seen += len(lowered)
+
+        # Scan line by line: '.*' never crosses a newline, so partial progress resets there
+        piece_start = len(self._window)
+        while True:
+            newline = text.find('\n', piece_start)
+            piece_end = newline if newline >= 0 else len(text)
+            region = text[max(0, piece_start - self.overlap):piece_end]
+            ready = [index for key, indexes in self._waiting.items()
+                     if key in region for index in indexes]
+            for index in ready:
+                self._advance(index, text, base, previous, piece_end, newline >= 0)
+            if newline < 0:
+                break
+
+            restart = base + newline + 1
+            for indexes in list(self._waiting.values()):
+                for index in list(indexes):
+                    state = self._states[index]
+                    if state.segment:
+                        indexes.discard(index)
+                        state.segment = 0
+                        self._wait(index)
+                    state.search_from = restart
+            piece_start = newline + 1
+
+        # Keep only the overlap needed by the widest segment (+1 for \b lookbehind)
+        keep = min(len(text), self.overlap + 1)
+        self._window_start = self._seen - keep
+        self._window = text[len(text) - keep:]
+
+        self._partial = self._current_decision()
+        return self._partial
+
+    def _advance(self, index: int, text: str, base: int, previous: int,
+                 piece_end: int, at_newline: bool):
+        """Match as many segments of one pattern as the current line piece allows"""
+        state, sp = self._states[index], self.stream_patterns[index]
+        self._waiting[sp.keys[state.segment]].discard(index)
+        while state.segment < len(sp.segments):
+            start = max(state.search_from, previous - sp.widths[state.segment], base) - base
+            key = sp.keys[state.segment]
+            if key and text.find(key, start, piece_end) < 0:
+                break
+            m = sp.segments[state.segment].search(text, start, piece_end)
+            if m is None or (m.end() == len(text) and not at_newline):
+                break  # not found, or not yet followed by a character
+            state.segment += 1
+            state.search_from = base + m.end()
+        else:
+            self._hits.setdefault(sp.tier, []).append(sp)
+            return
+        self._wait(index)
+
+    def _current_decision(self) -> PartialDecision:
+        for tier_name in self.tier_order:
+            hits = self._hits.get(tier_name)
+            if not hits:
+                continue
+            category = min(hits, key=self.stream_patterns.index).category  # declaration priority
+            return PartialDecision(
+                decision=Decision(tier_name),
+                risk_category=category,
+                final=tier_name == self.tier_order[0],
+                matched_patterns=[sp.compiled.description for sp in hits if sp.category == category],
+                chars_seen=self._seen
+            )
+        return PartialDecision(Decision.ALLOW, RiskCategory.CLEAN, False, chars_seen=self._seen)
+
+    def text(self) -> str:
+        """Full text streamed so far"""
+        return ''.join(self._chunks)
+
+    def finish(self, intent: str = "auto") -> ValidationResult:
+        """Authoritative validation of everything streamed (same as batch validation)"""
+        text = self.text()
+        ctx = RequestContext(text)
+        ctx.memo("pattern_snapshot", lambda: self.snapshot)
+        return self.validator.validate_behavior(intent, text, context=ctx, **self.validate_kwargs)
+
+def validate_stream(chunks, validator: Optional[BehaviorValidator] = None, **validate_kwargs) -> ValidationResult:
+    """Validate an iterable of chunks, stopping at the first HARD_DENY"""
+    session = StreamingValidationSession(validator, **validate_kwargs)
+    for chunk in chunks:
+        if session.feed(chunk).final:
+            break
+    return session.finish()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled context adjustment table
+Verifies table factors reproduce the branch-per-policy adjustments exactly
+"""
+
+import itertools
+import math
+
+from behavior_validator import BehaviorValidator, ContextAdjustmentTable, RiskCategory
+
+def _reference(base, category, region_rule_status, platform_policy_state, karma):
+    """Original branch-per-policy adjustment"""
+    adjusted = base * (0.8 + karma * 0.4)
+    if region_rule_status:
+        if region_rule_status.get("strict_mode", False):
+            adjusted *= 1.15
+        if region_rule_status.get("region") in ["EU", "UK", "AU"]:
+            if category == RiskCategory.REGION_PLATFORM_CONFLICT:
+                adjusted *= 1.25
+    if platform_policy_state:
+        if platform_policy_state.get("zero_tolerance", False):
+            adjusted *= 1.2
+        if platform_policy_state.get("minor_protection", False):
+            if category == RiskCategory.YOUTH_RISK_BEHAVIOR:
+                adjusted *= 1.3
+    return min(adjusted, 100.0)
+
+def test_table_matches_policy_rules():
+    """Every category, region and policy combination matches the original branches bit for bit"""
+    validator = BehaviorValidator()
+    for category, region, strict, zero, minor in itertools.product(
+            RiskCategory, [None, "EU", "UK", "AU", "US"], [False, True], [False, True], [False, True]):
+        region_rule_status = {"region": region, "strict_mode": strict}
+        platform_policy_state = {"zero_tolerance": zero, "minor_protection": minor}
+        for base, karma in [(40.0, 0.0), (72.5, 0.5), (88.0, 1.0)]:
+            expected = _reference(base, category, region_rule_status, platform_policy_state, karma)
+            actual = validator._apply_context_adjustments(
+                base, category, region_rule_status, platform_policy_state, karma)
+            assert actual == expected, (category, region, strict, zero, minor, actual, expected)
+    print("PASS: compiled factors reproduce the policy rules bit for bit")
+
+def test_batch_matches_single_calls():
+    """apply_batch returns what apply returns for each confidence"""
+    table = ContextAdjustmentTable()
+    region_rule_status = {"region": "EU", "strict_mode": True}
+    platform_policy_state = {"minor_protection": True}
+    confidences = [10.0, 55.0, 70.0, 99.0]
+    categories = [RiskCategory.YOUTH_RISK_BEHAVIOR, RiskCategory.REGION_PLATFORM_CONFLICT,
+                  RiskCategory.LONELINESS_HOOK, RiskCategory.YOUTH_RISK_BEHAVIOR]
+    batch = table.apply_batch(confidences, categories, region_rule_status, platform_policy_state, 0.3)
+    single = [table.apply(c, cat, region_rule_status, platform_policy_state, 0.3)
+              for c, cat in zip(confidences, categories)]
+    assert batch == single
+    print("PASS: batch application matches single calls")
+
+def test_new_region_is_data_only():
+    """A region class is added by extending REGION_CLASSES, with no new code"""
+    class ExtendedTable(ContextAdjustmentTable):
+        REGION_CLASSES = {**ContextAdjustmentTable.REGION_CLASSES, "BR": "regulated"}
+
+    table = ExtendedTable()
+    boosted = table.apply(50.0, RiskCategory.REGION_PLATFORM_CONFLICT, {"region": "BR"}, {}, 0.5)
+    assert math.isclose(boosted, 50.0 * 1.25)
+    print("PASS: regions are added as table data")
+
+if __name__ == "__main__":
+    test_table_matches_policy_rules()
+    test_batch_matches_single_calls()
+    test_new_region_is_data_only()
+    print("\nCONTEXT ADJUSTMENTS: ALL TESTS PASSED")
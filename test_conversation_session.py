@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for sliding-window conversation sessions
+Verifies multi-turn patterns are matched without rescanning history and agree with the joined window
+"""
+
+from behavior_validator import BehaviorValidator, Decision
+from conversation_session import ConversationSession, ConversationSessionStore
+
+def test_pattern_spanning_turns():
+    """A pattern split across two turns is detected on the second turn"""
+    session = ConversationSession("sess_1")
+    assert session.add_turn("I've stopped talking to my friends").decision == Decision.ALLOW
+    result = session.add_turn("because I prefer talking to you.")
+    assert result.decision == Decision.SOFT_REWRITE
+    print("PASS: patterns spanning turns are detected")
+
+def test_matches_joined_window():
+    """Each turn's result equals validating the window's turns joined"""
+    validator = BehaviorValidator()
+    session = ConversationSession("sess_2", validator, window_turns=3)
+    turns = ["hello there", "what do you look like", "I'm imagining us together", "ok", "the weather is nice"]
+    for turn in turns:
+        result = session.add_turn(turn)
+        window = " ".join(t.content for t in session.turns)
+        assert result.to_dict() == validator.validate_behavior("auto", window).to_dict()
+    print("PASS: session result matches validating the joined window")
+
+def test_old_turns_leave_window():
+    """Turns pushed out of the window no longer contribute to matches"""
+    session = ConversationSession("sess_3", window_turns=2)
+    session.add_turn("no one else")
+    session.add_turn("talks to me")
+    assert session.add_turn("really cares about me").decision == Decision.ALLOW
+    print("PASS: turns outside the window no longer match")
+
+def test_store_keys_sessions():
+    """The store keeps one session per session_id and evicts the least recently used"""
+    store = ConversationSessionStore(max_sessions=2)
+    store.add_turn("a", "I've stopped talking to my friends")
+    store.add_turn("b", "hello")
+    assert store.add_turn("a", "because I prefer talking to you").decision == Decision.SOFT_REWRITE
+    store.add_turn("c", "hello")
+    assert "b" not in store.sessions and "a" in store.sessions
+    print("PASS: sessions keyed by session_id with LRU eviction")
+
+if __name__ == "__main__":
+    test_pattern_spanning_turns()
+    test_matches_joined_window()
+    test_old_turns_leave_window()
+    test_store_keys_sessions()
+    print("\nCONVERSATION SESSION: ALL TESTS PASSED")
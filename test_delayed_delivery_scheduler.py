@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the timer-wheel delayed delivery scheduler
+Verifies messages are released on time, in bounded batches and across restarts
+"""
+
+import os
+import random
+import tempfile
+
+from delayed_delivery_scheduler import DelayedDeliveryScheduler, delivery_time
+from inbound_behavior_validator import InboundBehaviorValidator, InboundDecision
+from mediation_system import InboundMessage, MediationDecision, MediationSystem
+
+class Inbox:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, batch):
+        self.batches.append(batch)
+
+    def ids(self):
+        return [pending.message_id for batch in self.batches for pending in batch]
+
+def test_wheel_matches_brute_force():
+    """The wheel releases exactly the messages a brute-force scan finds due"""
+    rng = random.Random(3)
+    now = [0.0]
+    inbox = Inbox()
+    scheduler = DelayedDeliveryScheduler(inbox, clock=lambda: now[0], batch_size=10 ** 6)
+    expected = {}
+    for step in range(3000):
+        for _ in range(rng.randint(0, 3)):
+            message_id = f"m{rng.randrange(5000)}"
+            delay = rng.choice([rng.uniform(0, 70), rng.uniform(0, 5000), rng.uniform(0, 300000)])
+            scheduler.schedule(message_id, {"step": step}, now[0] + delay)
+            expected[message_id] = now[0] + delay
+        if expected and rng.random() < 0.2:
+            message_id = rng.choice(sorted(expected))
+            assert scheduler.cancel(message_id)
+            del expected[message_id]
+        now[0] += rng.choice([1, 1, 7, 64, 900])
+        inbox.batches.clear()
+        scheduler.poll()
+        due = {message_id for message_id, at in expected.items() if at <= now[0]}
+        assert set(inbox.ids()) == due, step
+        for message_id in due:
+            del expected[message_id]
+    assert len(scheduler) == len(expected)
+    print("PASS: timer wheel releases exactly the due messages")
+
+def test_release_is_batched():
+    """A quiet-hours backlog drains in bounded batches, in due order"""
+    now = [0.0]
+    inbox = Inbox()
+    scheduler = DelayedDeliveryScheduler(inbox, clock=lambda: now[0], batch_size=1000, max_batches_per_poll=5)
+    for i in range(20000):
+        scheduler.schedule(f"m{i}", None, 25200.0)  # everything due at 7 AM
+    now[0] = 25200.0
+    assert scheduler.poll() == 5000 and all(len(batch) == 1000 for batch in inbox.batches)
+    assert scheduler.ready_count() == 15000
+    while scheduler.poll():
+        pass
+    assert inbox.ids() == [f"m{i}" for i in range(20000)] and len(scheduler) == 0
+    print("PASS: a 7 AM backlog drains in bounded batches, in order")
+
+def test_failed_delivery_is_retried():
+    """A batch whose delivery fails is delivered again on the next poll"""
+    now = [0.0]
+    calls = []
+
+    def flaky(batch):
+        calls.append([pending.message_id for pending in batch])
+        if len(calls) == 1:
+            raise ConnectionError("push service down")
+
+    scheduler = DelayedDeliveryScheduler(flaky, clock=lambda: now[0])
+    scheduler.schedule("a", None, 10)
+    scheduler.schedule("b", None, 10)
+    now[0] = 10
+    try:
+        scheduler.poll()
+        assert False, "delivery error should propagate"
+    except ConnectionError:
+        pass
+    assert scheduler.poll() == 2 and calls[1] == ["a", "b"]
+    print("PASS: a failed batch is delivered again on the next poll")
+
+def test_restart_restores_pending():
+    """Pending messages are restored from the append-only log after a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "delayed.jsonl")
+        now = [1000.0]
+        inbox = Inbox()
+        scheduler = DelayedDeliveryScheduler(inbox, log_path=path, clock=lambda: now[0])
+        for i in range(5):
+            scheduler.schedule(f"m{i}", {"content": f"hello {i}"}, 1000.0 + 100 * i)
+        scheduler.cancel("m4")
+        now[0] = 1150.0
+        assert scheduler.poll() == 2
+        scheduler._log.write('{"op": "sched')  # torn write from a crash
+        scheduler._log.flush()
+        scheduler.close()
+
+        restarted = DelayedDeliveryScheduler(inbox, log_path=path, clock=lambda: now[0])
+        assert sorted(restarted._slot_of) == ["m2", "m3"]
+        now[0] = 2000.0
+        restarted.poll()
+        assert inbox.ids() == ["m0", "m1", "m2", "m3"]
+        assert inbox.batches[-1][0].payload == {"content": "hello 2"}
+        restarted.close()
+        with open(path) as f:
+            assert sum(1 for _ in f) == 3  # compacted to m2 and m3 on open, then one done record
+    print("PASS: pending messages survive a restart via the append-only log")
+
+def test_schedules_delay_results():
+    """DELAY results are scheduled from delay_duration and delay_until"""
+    now = 1735689600.0  # 2025-01-01T00:00:00Z
+    inbox = Inbox()
+    scheduler = DelayedDeliveryScheduler(inbox, clock=lambda: now)
+
+    inbound = InboundBehaviorValidator().validate_inbound_content("URGENT! Act now, expires in 10 minutes")
+    assert inbound.decision == InboundDecision.DELAY
+    scheduler.schedule_result(inbound.trace_id, inbound.original_content, inbound)
+    assert delivery_time(inbound, now) == now + inbound.delay_duration
+
+    message = InboundMessage("Are you awake?", "friend", "user", "sms", "2025-01-01T23:30:00Z")
+    quiet = MediationSystem().validate_inbound(message)
+    assert quiet.decision == MediationDecision.DELAY
+    scheduler.schedule_result(quiet.trace_id, message.content, quiet)
+    assert scheduler._slot_of[quiet.trace_id] is not scheduler._ready
+    assert delivery_time(quiet, now) == 1735801200.0  # 2025-01-02T07:00Z
+    print("PASS: DELAY results are scheduled from delay_duration and delay_until")
+
+def test_quiet_hours_release_next_morning():
+    """Messages held during quiet hours are released at 07:00 the next morning"""
+    now = [1735774200.0]  # 2025-01-01T23:30:00Z
+    inbox = Inbox()
+    scheduler = DelayedDeliveryScheduler(inbox, clock=lambda: now[0])
+    mediation = MediationSystem()
+    for message_id, timestamp in [("late", "2025-01-01T23:30:00Z"), ("night", "2025-01-02T03:00:00Z")]:
+        result = mediation.validate_inbound(InboundMessage("Are you awake?", "friend", "user", "sms", timestamp))
+        assert result.decision == MediationDecision.DELAY
+        assert result.delay_until == "2025-01-02T07:00:00Z", result.delay_until
+        scheduler.schedule_result(message_id, None, result)
+
+    assert scheduler.poll() == 0
+    now[0] = 1735801200.0 - 60  # 06:59 next morning
+    assert scheduler.poll() == 0
+    now[0] = 1735801200.0
+    assert scheduler.poll() == 2 and sorted(inbox.ids()) == ["late", "night"]
+    print("PASS: messages sent after 22:00 are held until 07:00 the next morning")
+
+if __name__ == "__main__":
+    test_wheel_matches_brute_force()
+    test_release_is_batched()
+    test_failed_delivery_is_retried()
+    test_restart_restores_pending()
+    test_schedules_delay_results()
+    test_quiet_hours_release_next_morning()
+    print("\nDELAYED DELIVERY SCHEDULER: ALL TESTS PASSED")
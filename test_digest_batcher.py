@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the digest batcher
+Verifies batched-delivery users get one transformed digest per window in bounded memory
+"""
+
+from digest_batcher import OTHER_SOURCES, DigestBatcher
+from preference_transformation_logic import PreferenceMediator, apply_user_preferences
+
+HOUR = 3600.0
+
+def _mediator(frequency="batched_hourly", language="casual"):
+    mediator = PreferenceMediator()
+    for user_id in ["alice", "bob"]:
+        prefs = mediator._default_preferences()
+        prefs.update(notification_frequency=frequency, language=language)
+        prefs["time_windows"]["sleep"] = "03:00-03:00"  # keep wall-clock sleep hours out of the test
+        mediator.user_preferences[user_id] = prefs
+    return mediator
+
+def test_one_digest_per_user_per_window():
+    """Each user gets one transformed digest when the window ends"""
+    mediator = _mediator()
+    calls = []
+    transform = mediator.transform_content
+    mediator.transform_content = lambda *args: calls.append(args) or transform(*args)
+    digests = []
+    batcher = DigestBatcher(mediator, digests.append)
+    for i in range(200):
+        batcher.add("alice", f"newsletter {i}", source="news@site.com", urgency="low", now=10 * HOUR + i)
+    batcher.add("alice", "Can you call me?", source="+15550100", urgency="medium", now=10 * HOUR + 300)
+    batcher.add("bob", "Lunch?", source="carol", now=10 * HOUR + 5)
+
+    assert batcher.flush_due(now=11 * HOUR - 1) == 0
+    assert batcher.flush_due(now=11 * HOUR) == 2
+    assert len(calls) == 2 and len(batcher) == 0  # one transformation per user, not per message
+    alice = next(digest for digest in digests if digest["user_id"] == "alice")
+    assert (alice["message_count"], alice["group_count"]) == (201, 2)
+    assert alice["urgency_level"] == "medium" and alice["source_hidden"] == "Unknown contact"
+    lines = alice["message_primary"].splitlines()
+    assert lines[1] == "- +15550100 (medium): 1 message"  # most urgent group first
+    assert "    ... and 197 more" in lines
+    assert alice["window_end"] == 11 * HOUR
+    print("PASS: each user gets one transformed digest when the hour ends")
+
+def test_memory_is_bounded():
+    """Groups, samples per group and users are capped"""
+    delivered = []
+    batcher = DigestBatcher(_mediator("batched_daily"), delivered.append, max_groups=3, max_samples=2, max_users=1)
+    for i in range(50):
+        batcher.add("alice", f"message {i}", source=f"sender{i}", urgency="low", now=1000.0)
+    digest = batcher._pending["alice"]
+    assert len(digest.groups) == 4 and digest.groups[(OTHER_SOURCES, "low")].count == 47
+    assert all(len(group.samples) <= 2 for group in digest.groups.values())
+    assert digest.window_end == 86400.0
+
+    batcher.add("bob", "hi", now=2000.0)  # over max_users: the oldest window is flushed early
+    assert [digest["user_id"] for digest in delivered] == ["alice"] and len(batcher) == 1
+    print("PASS: groups, samples and users are capped")
+
+def test_apply_user_preferences_feeds_batcher():
+    """Batched deliveries from apply_user_preferences land in the digest"""
+    digests = []
+    batcher = DigestBatcher(_mediator(language="minimal"), digests.append)
+    output = {"message_primary": "Weekly update", "urgency_level": "low", "source": "news@site.com"}
+    result = apply_user_preferences(output, "alice", digest_batcher=batcher)
+    assert result["scheduled_delivery"] == "digest" and len(batcher) == 1
+    urgent = apply_user_preferences(dict(output, urgency_level="high"), "alice", digest_batcher=batcher)
+    assert urgent["delivery_status"] == "immediate"
+    assert batcher.flush_user("alice") and digests[0]["message_primary"].startswith("• 1 message since")
+    print("PASS: batched deliveries from apply_user_preferences land in the digest")
+
+if __name__ == "__main__":
+    test_one_digest_per_user_per_window()
+    test_memory_is_bounded()
+    test_apply_user_preferences_feeds_batcher()
+    print("\nDIGEST BATCHER: ALL TESTS PASSED")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the extractive summarizer
+Verifies SUMMARIZE results carry informative sentences taken from a bounded prefix of the message
+"""
+
+from extractive_summarizer import (MAX_INPUT_CHARS, SAMPLE_PARAGRAPH, SUMMARY_MAX_CHARS, SUMMARY_MIN_CHARS,
+                                   SUMMARY_SUFFIX, split_sentences, summarize)
+from inbound_behavior_validator import InboundBehaviorValidator, InboundDecision
+
+def test_picks_informative_sentences():
+    """The summary keeps the actionable sentences and drops filler and repeats"""
+    summary = summarize(SAMPLE_PARAGRAPH * 3)
+    assert summary.endswith(SUMMARY_SUFFIX)
+    body = summary[:-len(SUMMARY_SUFFIX)]
+    assert len(body) <= SUMMARY_MAX_CHARS
+    assert "Thursday at 3pm" in body or "due on the 15th" in body, body
+    assert "coffee machine" not in body and body.count("Invoice #4471") <= 1
+    print(f"PASS: summary keeps the actionable sentences: {body!r}")
+
+def test_short_and_unsplittable_content():
+    """Short content passes through and text without sentence breaks is clipped"""
+    assert summarize("Meeting at 3pm.") == "Meeting at 3pm."
+    long_word = "x" * 500
+    summary = summarize(long_word)
+    assert summary == "x" * (SUMMARY_MAX_CHARS - 3) + "..." + SUMMARY_SUFFIX
+    assert split_sentences("Hi. Hi. Bye!\n\nHi.") == [("Hi.", ["hi"]), ("Bye!", ["bye"])]
+    print("PASS: short content passes through, repeats and empty lines are dropped")
+
+def test_validator_uses_summarizer():
+    """SUMMARIZE results carry the extractive summary"""
+    content = ("Project update for the team. " * 4 + "The deadline moved to Friday 5pm, please confirm. "
+               + "Weather was nice today. " * 6)
+    result = InboundBehaviorValidator().validate_inbound_content(content)
+    assert result.decision == InboundDecision.SUMMARIZE
+    assert result.safe_summary == summarize(content)
+    assert "deadline moved to Friday 5pm" in result.safe_summary
+    print("PASS: SUMMARIZE results carry the extractive summary")
+
+def test_short_overload_is_still_summarized():
+    """Multi-line content under the summary length still gets a marked summary"""
+    content = "Agenda:\n1. Budget 2024 review\n2. Hiring for Q3\n3. Office move on the 15th\n4. Any other business\nThanks"
+    assert SUMMARY_MIN_CHARS < len(content) <= SUMMARY_MAX_CHARS
+    result = InboundBehaviorValidator().validate_inbound_content(content)
+    assert result.decision == InboundDecision.SUMMARIZE
+    assert result.safe_summary.endswith(SUMMARY_SUFFIX) and result.safe_summary != content
+    print("PASS: multi-line content under the length limit still gets a marked summary")
+
+def test_input_past_the_limit_is_not_read():
+    """Text past MAX_INPUT_CHARS does not change the summary"""
+    filler = ("Thanks for the note. " * MAX_INPUT_CHARS)[:MAX_INPUT_CHARS]
+    tail = "Final notice: wire the deposit to account 99-1234 before Monday 9am. " * 450
+    assert "99-1234" in summarize(filler[:MAX_INPUT_CHARS // 2] + tail)  # picked when within the limit
+    assert summarize(filler + tail) == summarize(filler)
+    assert summarize("x" * (4 * MAX_INPUT_CHARS)) == summarize("x" * MAX_INPUT_CHARS)
+    print("PASS: the summary of 4x the input limit equals the summary of its first 10KB")
+
+if __name__ == "__main__":
+    test_picks_informative_sentences()
+    test_short_and_unsplittable_content()
+    test_validator_uses_summarizer()
+    test_short_overload_is_still_summarized()
+    test_input_past_the_limit_is_not_read()
+    print("\nEXTRACTIVE SUMMARIZER: ALL TESTS PASSED")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the top-offender tracker
+Verifies the count-min sketch and top-k heap find the worst senders in fixed memory
+"""
+
+import os
+import random
+from collections import Counter
+
+import safety_api
+from heavy_hitters import CountMinSketch, HeavyHitters
+from inbound_behavior_validator import InboundBehaviorValidator
+from mediation_system import InboundMessage, MediationSystem
+
+def test_sketch_never_underestimates():
+    """Count-min estimates are upper bounds within the sketch's error bound"""
+    rng = random.Random(0)
+    sketch = CountMinSketch(width=256, depth=4)
+    truth = Counter(f"sender{rng.randrange(2000)}" for _ in range(20000))
+    for key, count in truth.items():
+        sketch.add(key, count)
+    errors = [sketch.estimate(key) - count for key, count in truth.items()]
+    assert min(errors) >= 0
+    assert sum(errors) / len(errors) < 2.72 / 256 * sketch.total
+    assert sketch.estimate("never seen") <= 2.72 / 256 * sketch.total * 4
+    print("PASS: count-min estimates are upper bounds within the error bound")
+
+def test_top_k_finds_heavy_senders():
+    """The top-k heap holds the heaviest senders of a skewed stream"""
+    rng = random.Random(1)
+    tracker = HeavyHitters(k=5, width=512, depth=4)
+    heavy = [f"abuser{i}" for i in range(5)]
+    stream = heavy * 300 + [f"sender{rng.randrange(50000)}" for _ in range(20000)]
+    rng.shuffle(stream)
+    for key in stream:
+        tracker.add(key)
+    assert {key for key, _ in tracker.top()} == set(heavy)
+    assert all(count >= 300 for _, count in tracker.top())
+    assert len(tracker._heap) <= 4 * tracker.k + 1  # stale heap entries are compacted
+    snapshot = tracker.snapshot(2)
+    assert snapshot["total_offenses"] == len(stream) and len(snapshot["top_offenders"]) == 2
+    print("PASS: the top-k heap holds the heaviest senders")
+
+def test_validators_report_offenders():
+    """The inbound validator and mediation system feed the offender tracker"""
+    tracker = HeavyHitters(k=3)
+    inbound = InboundBehaviorValidator(offenders=tracker)
+    for _ in range(3):
+        inbound.validate_inbound_content("KILL YOURSELF", sender_id="troll")
+    inbound.validate_inbound_content("See you at lunch!", sender_id="friend")
+    inbound.validate_inbound_content("KILL YOURSELF")  # placeholder sender is not counted
+
+    mediation = MediationSystem(offenders=tracker)
+    message = InboundMessage("This is your final warning, you have to answer, I had enough", "troll",
+                             "user", "whatsapp", "2025-01-01T12:00:00Z")
+    assert mediation.validate_inbound(message).decision.value == "block"
+    assert tracker.top() == [("troll", 4)]
+    print("PASS: inbound validator and mediation system feed the offender tracker")
+
+def test_offender_metrics_stay_internal():
+    """The offender snapshot is read in-process and not served by /health"""
+    safety_api.validate_inbound_content("KILL YOURSELF", sender_id="metrics-troll")
+    offenders = {entry["sender_id"] for entry in safety_api.offender_metrics(50)["top_offenders"]}
+    assert "metrics-troll" in offenders
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "health.py")) as health:
+        assert "offender" not in health.read()  # sender ids never reach the public endpoint
+    print("PASS: offender snapshot is served in-process, not by /health")
+
+if __name__ == "__main__":
+    test_sketch_never_underestimates()
+    test_top_k_finds_heavy_senders()
+    test_validators_report_offenders()
+    test_offender_metrics_stay_internal()
+    print("\nHEAVY HITTERS: ALL TESTS PASSED")
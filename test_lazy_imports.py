@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy imports and the safety_api facade
+Verifies nothing heavy is built or imported at import time and the facade returns JSON-ready dicts
+"""
+
+import subprocess
+import sys
+
+from import_budget import FORBIDDEN_IMPORTS, REPO_DIR, measure_import
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+
+def test_facade_loads_validators_on_first_use():
+    """safety_api imports a validator module only when one of its functions is first called"""
+    out = _run(
+        "import sys, safety_api\n"
+        "print('behavior_validator' in sys.modules)\n"
+        "result = safety_api.validate_behavior('send me sexy pics')\n"
+        "print('behavior_validator' in sys.modules, 'unified_validator' in sys.modules, "
+        "safety_api.loaded_validators(), result['decision'])"
+    )
+    assert out.splitlines() == ["False", "True False ['behavior'] hard_deny"], out
+    print("PASS: facade imports a validator only when first used")
+
+def test_facade_returns_json_ready_dicts():
+    """Every facade function returns a dict that survives a JSON round trip"""
+    import json
+    import safety_api
+
+    message = {"content": "Are you awake?", "sender": "friend", "recipient": "user",
+               "platform": "sms", "timestamp": "2025-01-01T23:30:00Z"}
+    action = {"content": "You have to answer now", "platform": "email", "recipient": "boss",
+              "action_type": "send_message", "timestamp": "2025-01-01T12:00:00Z"}
+    results = [
+        safety_api.validate_behavior("send me sexy pics"),
+        safety_api.validate_inbound_content("KILL YOURSELF"),
+        safety_api.validate_action(action),
+        safety_api.validate_inbound(message),
+        safety_api.mediate_inbound(dict(message, message_type="general")),
+        safety_api.mediate_outbound(action),
+    ]
+    for result in results:
+        assert isinstance(result, dict) and json.loads(json.dumps(result)) == result, result
+    assert results[4]["decision"] == "delay" and results[5]["decision"] == "rewrite"
+    print("PASS: every facade function returns a JSON-ready dict")
+
+def test_forbidden_imports():
+    """Lazy modules do not pull in the modules listed in FORBIDDEN_IMPORTS"""
+    for module, forbidden in FORBIDDEN_IMPORTS.items():
+        _, imported = measure_import(module)
+        assert not imported & set(forbidden), (module, imported & set(forbidden))
+    print("PASS: lazy modules do not pull in heavy dependencies")
+
+def test_no_import_side_effects():
+    """Module globals are built on first use and logging is left unconfigured"""
+    out = _run(
+        "import logging, unified_validator, mediation_system, hardened_validator\n"
+        "print(unified_validator._validator is None, mediation_system._mediation_system is None, "
+        "logging.getLogger().handlers == [])\n"
+        "print(unified_validator.validator is unified_validator.get_validator())"
+    )
+    assert out.splitlines() == ["True True True", "True"], out
+    print("PASS: globals are built on first use and logging is left unconfigured")
+
+if __name__ == "__main__":
+    test_facade_loads_validators_on_first_use()
+    test_facade_returns_json_ready_dicts()
+    test_forbidden_imports()
+    test_no_import_side_effects()
+    print("\nLAZY IMPORTS: ALL TESTS PASSED")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the closed-loop load generator
+Verifies both targets drive the real handler, --url targets and paced runs
+"""
+
+import http.client
+import json
+import os
+import tempfile
+
+from load_generator import MATRIX_PATH, HttpTarget, InProcessTarget, build_corpus, latency_summary, run_load
+
+def test_corpus_mixes_matrix_and_adversarial():
+    """The corpus sends every edge matrix case and the adversarial inputs to both endpoints"""
+    corpus = build_corpus()
+    kinds = {request.kind for request in corpus}
+    assert kinds == {"matrix", "adversarial"}
+    with open(MATRIX_PATH, 'r', encoding='utf-8') as f:
+        categories = json.load(f)["edge_test_matrix"]["test_categories"]
+    cases = sum(len(category.get("tests", [])) for category in categories.values())
+    assert len([r for r in corpus if r.kind == "matrix"]) == 2 * cases  # every matrix case, both endpoints
+    assert not {r.kind for r in build_corpus(adversarial=False)} - {"matrix"}
+    print("PASS: corpus covers the edge matrix plus adversarial inputs")
+
+def test_inprocess_run():
+    """An in-process run reaches the real handler with no errors"""
+    report = run_load(InProcessTarget(), build_corpus(), concurrency=4, max_requests=200)
+    assert report.requests == 200 and report.errors == 0
+    assert report.status_counts == {"200": 200}
+    assert set(report.latency_by_kind_ms) == {"matrix", "adversarial"}
+    assert report.latency_ms["p50"] <= report.latency_ms["p99"] <= report.latency_ms["max"]
+    print("PASS: in-process load reaches the real handler")
+
+def test_http_run():
+    """An HTTP run against a local server completes with no errors"""
+    target = HttpTarget()
+    try:
+        report = run_load(target, build_corpus(), concurrency=2, max_requests=30)
+    finally:
+        target.close()
+    assert report.requests == 30 and report.errors == 0
+    print("PASS: HTTP load against a local server")
+
+def test_url_target():
+    """--url picks the connection class and port for its scheme and keeps its path prefix"""
+    remote = HttpTarget("https://safety.example.com/preview/")
+    assert remote.connection_class is http.client.HTTPSConnection
+    assert (remote.host, remote.port, remote.base_path) == ("safety.example.com", 443, "/preview")
+    plain = HttpTarget("http://localhost")
+    assert plain.connection_class is http.client.HTTPConnection and (plain.port, plain.base_path) == (80, "")
+
+    local = HttpTarget()
+    try:
+        existing = HttpTarget(f"http://{local.host}:{local.port}/")
+        report = run_load(existing, build_corpus(), concurrency=2, max_requests=10)
+    finally:
+        local.close()
+    assert report.requests == 10 and report.errors == 0 and report.status_counts == {"200": 10}
+    print("PASS: --url picks the scheme's connection and port and keeps the path prefix")
+
+def test_corpus_independent_of_cwd():
+    """build_corpus finds the edge matrix from any working directory"""
+    expected = build_corpus(adversarial=False)
+    cwd = os.getcwd()
+    os.chdir(tempfile.gettempdir())
+    try:
+        assert build_corpus(adversarial=False) == expected
+    finally:
+        os.chdir(cwd)
+    print("PASS: the edge matrix is found relative to the module")
+
+def test_rate_limited_run():
+    """A target RPS paces when requests are released"""
+    report = run_load(InProcessTarget(), build_corpus(), concurrency=2, max_requests=40, rps=200)
+    assert report.requests == 40
+    assert report.duration_s >= 0.19  # 40 requests released at 200/s
+    print("PASS: target RPS paces request release")
+
+def test_latency_summary():
+    """Latency percentiles use the nearest-rank method"""
+    summary = latency_summary([float(i) for i in range(1, 101)])
+    assert summary["p50"] == 51.0 and summary["p99"] == 100.0 and summary["max"] == 100.0
+    assert latency_summary([]) == {}
+    print("PASS: nearest-rank latency percentiles")
+
+if __name__ == "__main__":
+    test_corpus_mixes_matrix_and_adversarial()
+    test_inprocess_run()
+    test_http_run()
+    test_url_target()
+    test_corpus_independent_of_cwd()
+    test_rate_limited_run()
+    test_latency_summary()
+    print("\nLOAD GENERATOR: ALL TESTS PASSED")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the SimHash near-duplicate index
+Verifies bursts of variants reuse a high-risk decision and nothing else does
+"""
+
+import hashlib
+import random
+
+from inbound_behavior_validator import InboundBehaviorValidator, InboundDecision
+from near_duplicate_index import NearDuplicateIndex, hamming_distance, simhash
+
+HARASSMENT = "You're such a stupid idiot {name}, nobody likes you and everyone at school laughs at you{punct} {n}"
+
+def _reference_simhash(features):
+    weights = [0] * 64
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+def test_simhash_matches_reference():
+    """The lane-packed SimHash equals the per-bit definition"""
+    rng = random.Random(0)
+    words = [f"w{i}" for i in range(200)]
+    for _ in range(500):
+        features = [rng.choice(words) for _ in range(rng.randint(1, 120))]
+        assert simhash(features) == _reference_simhash(features)
+    print("PASS: lane-packed SimHash equals the per-bit definition")
+
+def test_variants_reuse_decision():
+    """A near-identical variant of a high-risk message reuses its decision"""
+    plain = InboundBehaviorValidator()
+    indexed = InboundBehaviorValidator(NearDuplicateIndex())
+    first = indexed.validate_inbound_content(HARASSMENT.format(name="Alice", punct="!", n=1))
+    assert first.decision == InboundDecision.SILENCE
+
+    variant = HARASSMENT.format(name="Bob", punct="...", n=48213)
+    reused = indexed.validate_inbound_content(variant)
+    assert indexed.near_duplicates.hits == 1
+    assert reused == plain.validate_inbound_content(variant)  # same decision, trace id of the new content
+    print("PASS: a near-identical variant reuses the recent decision")
+
+def test_benign_and_short_messages_are_not_reused():
+    """Benign rewrites, short messages and clean results are never reused"""
+    indexed = InboundBehaviorValidator(NearDuplicateIndex())
+    indexed.validate_inbound_content(HARASSMENT.format(name="Alice", punct="!", n=1))
+    benign = "You're such a kind friend Alice, everybody likes you and everyone at school admires you"
+    assert indexed.validate_inbound_content(benign).decision == InboundDecision.DELIVER
+
+    index = NearDuplicateIndex()
+    assert index.fingerprint(["stupid", "idiot"]) is None  # too short to match safely
+    clean = InboundBehaviorValidator(index)
+    clean.validate_inbound_content("Hello! Hope you're having a great day at school with all your friends.")
+    assert len(index) == 0  # only high-risk results are indexed
+    print("PASS: benign rewrites, short messages and clean results are never reused")
+
+def test_expiry_and_eviction():
+    """Entries expire after the TTL and the index stays within its size and bucket caps"""
+    now = [0.0]
+    index = NearDuplicateIndex(ttl_seconds=10, max_entries=2, bucket_size=1, clock=lambda: now[0])
+    validator = InboundBehaviorValidator(index)
+    validator.validate_inbound_content(HARASSMENT.format(name="Alice", punct="!", n=1))
+    assert len(index) == 1
+
+    now[0] = 11.0
+    assert validator.validate_inbound_content(HARASSMENT.format(name="Alice", punct="", n=7)).decision \
+        == InboundDecision.SILENCE
+    assert index.hits == 0  # expired entry was not reused; the message was validated again
+
+    for seed in range(20):  # many unrelated entries: size and bucket caps hold
+        rng = random.Random(seed)
+        features = [f"w{rng.randrange(1000)}" for _ in range(12)]
+        index.record(simhash(features), validator.validate_inbound_content("KILL YOURSELF"))
+    assert len(index) <= 2
+    assert all(len(bucket) <= 1 for buckets in index._buckets for bucket in buckets.values())
+    print("PASS: entries expire and the index stays bounded")
+
+def test_burst_hits_after_first_message():
+    """A burst of variants is served from the index after the first message"""
+    rng = random.Random(5)
+    names = ["Alice", "Bob", "Carol", "Dave", "Eve"]
+    validator = InboundBehaviorValidator(NearDuplicateIndex())
+    decisions = set()
+    for _ in range(2000):
+        message = HARASSMENT.format(name=rng.choice(names), punct=rng.choice(["!", "?", "", "..."]),
+                                    n=rng.randint(1, 99999))
+        decisions.add(validator.validate_inbound_content(message).decision)
+    stats = validator.near_duplicates.stats()
+    assert decisions == {InboundDecision.SILENCE}
+    assert stats["hits"] >= 1990 and stats["entries"] <= 10, stats
+    assert hamming_distance(0b1011, 0b0001) == 2
+    print("PASS: a burst of variants is served from the index")
+
+if __name__ == "__main__":
+    test_simhash_matches_reference()
+    test_variants_reuse_decision()
+    test_benign_and_short_messages_are_not_reused()
+    test_expiry_and_eviction()
+    test_burst_hits_after_first_message()
+    print("\nNEAR-DUPLICATE INDEX: ALL TESTS PASSED")
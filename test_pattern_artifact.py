@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed pattern artifact
+Verifies artifact entries equal runtime derivation and unusable artifacts fall back to runtime compile
+"""
+
+import json
+import os
+import tempfile
+
+import pattern_artifact
+from pattern_artifact import build_artifact, load_artifact
+from pattern_engine import extract_literal_requirement
+from streaming_validator import derive_segment_plan
+
+def _build(tmp):
+    path = os.path.join(tmp, "pattern_artifact.json")
+    build_artifact(path)
+    return path
+
+def test_artifact_matches_runtime_derivation():
+    """Every literal requirement and segment plan equals its runtime derivation"""
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = load_artifact(_build(tmp))
+    assert artifact.status == "loaded"
+    assert artifact.requirements and artifact.segment_plans
+    for (pattern, flags), requirement in artifact.requirements.items():
+        assert requirement == extract_literal_requirement(pattern, flags), pattern
+    for (pattern, flags), plan in artifact.segment_plans.items():
+        assert plan == derive_segment_plan(pattern, flags), pattern
+    print("PASS: artifact entries equal runtime derivation")
+
+def test_missing_invalid_and_stale_fall_back():
+    """Missing, stale and corrupt artifacts load empty with their status"""
+    with tempfile.TemporaryDirectory() as tmp:
+        assert load_artifact(os.path.join(tmp, "absent.json")).status == "missing"
+
+        path = _build(tmp)
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data["fingerprint"] = "0" * 16
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        stale = load_artifact(path)
+        assert stale.status == "stale" and not stale.requirements
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        assert load_artifact(path).status == "invalid"
+    print("PASS: missing, stale and corrupt artifacts fall back to runtime compile")
+
+def test_missing_sources_fall_back():
+    """Without the deriving sources to fingerprint, the artifact is treated as stale"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _build(tmp)
+        saved = pattern_artifact.DERIVING_MODULES
+        pattern_artifact.DERIVING_MODULES = ("not_shipped.py",)  # bytecode-only deployment
+        try:
+            artifact = load_artifact(path)
+        finally:
+            pattern_artifact.DERIVING_MODULES = saved
+    assert artifact.status == "stale" and not artifact.requirements
+    print("PASS: an artifact without its deriving sources is treated as stale")
+
+if __name__ == "__main__":
+    test_artifact_matches_runtime_derivation()
+    test_missing_invalid_and_stale_fall_back()
+    test_missing_sources_fall_back()
+    print("\nPATTERN ARTIFACT: ALL TESTS PASSED")
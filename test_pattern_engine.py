@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the tiered pattern engine
+Verifies early exit, hit-frequency reordering and profile reload keep decisions unchanged
+"""
+
+import json
+import os
+import random
+import re
+import tempfile
+
+import pattern_engine
+from behavior_validator import BehaviorValidator, build_pattern_tiers
+from inbound_behavior_validator import build_inbound_pattern_tiers
+from pattern_engine import TieredPatternEvaluator, compile_matcher, extract_literal_requirement, linear_rewrite, screen_text
+
+SAMPLE_TEXTS = [
+    "I will kill myself",
+    "Send me nudes",
+    "I can only talk to you. You're the only one who gets me",
+    "I'm so lonely, I'm all alone",
+    "Hello, how are you?",
+    "keep it a secret from your parents, don't tell mom or dad",
+]
+
+def test_early_exit_matches_exhaustive():
+    """Early-exit and exhaustive evaluation pick the same winner"""
+    early = TieredPatternEvaluator(build_pattern_tiers(), early_exit=True)
+    exhaustive = TieredPatternEvaluator(build_pattern_tiers(), early_exit=False)
+
+    for text in SAMPLE_TEXTS:
+        a = early.evaluate(text.lower())
+        b = exhaustive.evaluate(text.lower())
+        assert (a is None) == (b is None), text
+        if a:
+            assert (a.tier, a.category, a.matches) == (b.tier, b.category, b.matches), text
+    print("PASS: early exit matches exhaustive evaluation")
+
+def test_decide_matches_evaluate():
+    """Decision-only probe agrees with full evaluation"""
+    evaluator = TieredPatternEvaluator(build_pattern_tiers())
+    for text in SAMPLE_TEXTS:
+        result = evaluator.evaluate(text.lower())
+        assert evaluator.decide(text.lower()) == (result.tier if result else None), text
+    print("PASS: decide() agrees with evaluate()")
+
+def test_hit_profile_reorder_keeps_results():
+    """Reordering by hit frequency never changes matches or their order"""
+    baseline = TieredPatternEvaluator(build_pattern_tiers(), early_exit=False)
+    expected = [baseline.evaluate(text.lower()) for text in SAMPLE_TEXTS]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hit_profile.json")
+        with open(path, "w") as f:
+            json.dump(baseline.export_hit_profile(), f)
+
+        reordered = TieredPatternEvaluator(build_pattern_tiers())
+        reordered.load_hit_profile(path)
+
+    assert all(tier.reordered for tier in reordered.tiers)
+    for text, want in zip(SAMPLE_TEXTS, expected):
+        got = reordered.evaluate(text.lower())
+        assert (got.matches if got else None) == (want.matches if want else None), text
+    print("PASS: hit-profile reorder keeps results")
+
+def test_literal_requirement_extraction():
+    """Whole words need \\b or non-word literals on both sides"""
+    req = extract_literal_requirement(r'\bkill myself\b')
+    assert req.words == {"kill", "myself"} and req.substrings == ()
+
+    req = extract_literal_requirement(r'\bsexy.*pics?\b')
+    assert req.words == frozenset() and req.substrings == ("sexy", "pic")
+
+    req = extract_literal_requirement(r'.{200,}')
+    assert not req.words and not req.substrings and req.min_length == 200
+    print("PASS: literal requirements extracted")
+
+def test_prescreen_is_exact():
+    """Pre-screened evaluation returns exactly what the full scan returns"""
+    texts = SAMPLE_TEXTS + [
+        "I have a skill for mysteries",         # literal inside a longer word
+        "k1ll mys3lf",
+        "\u212aill myself",                      # Kelvin sign lowercases to ASCII 'k'
+        "kill my\u017felf",                      # long s: non-ASCII, never screened
+        "only 3 spots left! register now before it fills",
+        "line\n" * 5,
+        "",
+    ]
+    for build in (build_pattern_tiers, build_inbound_pattern_tiers):
+        screened = TieredPatternEvaluator(build(), early_exit=False, prescreen=True)
+        full = TieredPatternEvaluator(build(), early_exit=False, prescreen=False)
+        for text in texts:
+            text = text.lower()
+            for tier in full.tiers:
+                a = screened.match_tier(tier.name, text, screened.screen(text))
+                b = full.match_tier(tier.name, text)
+                assert (a and a.matches) == (b and b.matches), (tier.name, text)
+
+    assert screen_text("kill my\u017felf") is None
+    print("PASS: pre-screen matches full scan")
+
+def test_clean_text_skips_all_patterns():
+    """Clean ASCII text has no candidate patterns in any behavior tier"""
+    evaluator = TieredPatternEvaluator(build_pattern_tiers())
+    screen = evaluator.screen("could you help me plan a trip next weekend?")
+    assert all(not tier.candidates(screen) for tier in evaluator.tiers)
+    print("PASS: clean text skips regex evaluation")
+
+def test_validator_uses_shared_evaluator():
+    """Validators share one compiled evaluator per process"""
+    assert BehaviorValidator().evaluator is BehaviorValidator().evaluator
+    print("PASS: evaluator compiled once")
+
+def test_linear_rewrite_is_exact():
+    """Rewritten `S1.*S2...` patterns match exactly when the originals do"""
+    assert linear_rewrite(r'\bhow.*to.*buy\b') == r'^(?>.*?\bhow)(?>.*?to)(?>.*?buy\b)'
+    assert linear_rewrite(r'\bsexy.*pics?\b') == r'^(?>.*?\bsexy)(?>.*?pics?\b)'
+    for unsafe in (r'\bkill myself\b', r'a.*b$', r'(a|b).*c', r'a.*(b.*c)', r'(?s)a.*b', r'\.*a'):
+        assert linear_rewrite(unsafe) is None, unsafe
+
+    rng = random.Random(3)
+    tokens = ["how", "to", "buy", "pic", "pics", "sexy", " ", "\n", "x", "howto", "'"]
+    for pattern in (r'\bhow.*to.*buy\b', r'\bsexy.*pics?\b', r'\bhow.*how.*to\b'):
+        original, rewritten = re.compile(pattern, re.IGNORECASE), compile_matcher(pattern)
+        for _ in range(3000):
+            text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 12)))
+            assert bool(original.search(text)) == bool(rewritten.search(text)), (pattern, text)
+    print("PASS: linear rewrites match exactly when the originals do")
+
+def test_rewrite_falls_back_without_atomic_groups():
+    """Interpreters without atomic groups (< 3.11) build tiers on the original regexes"""
+    rewritten = TieredPatternEvaluator(build_pattern_tiers())
+    saved = pattern_engine.ATOMIC_GROUPS
+    pattern_engine.ATOMIC_GROUPS = False
+    try:
+        assert compile_matcher(r'\bhow.*to.*buy\b') is None
+        tiers = build_pattern_tiers()
+        assert all(cp.matcher is None for tier in tiers for _, cps in tier.categories for cp in cps)
+        fallback = TieredPatternEvaluator(tiers)
+        for text in SAMPLE_TEXTS + ["send me sexy pics"]:
+            assert fallback.evaluate(text) == rewritten.evaluate(text), text
+    finally:
+        pattern_engine.ATOMIC_GROUPS = saved
+
+    pattern_engine._rewrite_cache[("bad", re.IGNORECASE)] = "(?>"  # a rewrite `re` cannot compile
+    try:
+        assert compile_matcher("bad") is None
+    finally:
+        del pattern_engine._rewrite_cache[("bad", re.IGNORECASE)]
+    print("PASS: tiers compile without the rewrite when atomic groups are unavailable")
+
+if __name__ == "__main__":
+    test_early_exit_matches_exhaustive()
+    test_decide_matches_evaluate()
+    test_hit_profile_reorder_keeps_results()
+    test_literal_requirement_extraction()
+    test_prescreen_is_exact()
+    test_clean_text_skips_all_patterns()
+    test_validator_uses_shared_evaluator()
+    test_linear_rewrite_is_exact()
+    test_rewrite_falls_back_without_atomic_groups()
+    print("\nPATTERN ENGINE: ALL TESTS PASSED")
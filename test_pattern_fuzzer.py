@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the adversarial slow-input fuzzer
+Verifies the regression corpus stays within budget and slow inputs are found and minimized
+"""
+
+import json
+import os
+import tempfile
+
+from pattern_fuzzer import (
+    CORPUS_FORMAT, CORPUS_PATH, DEFAULT_BUDGET_MS, FuzzInput, check_corpus, fuzz, fuzz_targets, load_corpus,
+)
+
+def _targets(pattern: str, raw: bool):
+    return [t for t in fuzz_targets(raw=raw) if t.pattern == pattern]
+
+def test_corpus_within_budget():
+    """Every pattern matches every regression corpus entry within the budget"""
+    assert load_corpus(), "regression corpus is empty"
+    violations = check_corpus(CORPUS_PATH, DEFAULT_BUDGET_MS)
+    assert not violations, violations
+    print("PASS: every pattern stays within budget on the regression corpus")
+
+def test_corpus_catches_backtracking():
+    """Replaying the corpus flags the original backtracking regex but not its rewrite"""
+    # The original regex, without the linear rewrite, is over budget on its corpus entry
+    pattern = r"\bhow.*to.*buy.*drugs.*online.*in.*Germany\b"
+    entries = [e for e in load_corpus() if e["pattern"] == pattern]
+    assert entries
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"format": CORPUS_FORMAT, "budget_ms": DEFAULT_BUDGET_MS, "entries": entries}, f)
+        assert check_corpus(path, DEFAULT_BUDGET_MS, _targets(pattern, raw=True))
+        assert not check_corpus(path, DEFAULT_BUDGET_MS, _targets(pattern, raw=False))
+    print("PASS: corpus replay flags the backtracking regex")
+
+def test_fuzz_finds_and_minimizes():
+    """The fuzzer finds a slow input for a backtracking regex and none for the rewrite"""
+    pattern = r"\bHIPAA.*violation\b"
+    lengths = (1250, 5000, 10000)
+    findings = fuzz(_targets(pattern, raw=True), lengths=lengths)
+    assert len(findings) == 1
+    finding = findings[0]
+    assert finding.length <= 10000 and finding.elapsed_ms > DEFAULT_BUDGET_MS
+    assert "hipaa" in finding.unit.lower() or "hipaa" in finding.prefix.lower()
+
+    assert fuzz(_targets(pattern, raw=False), lengths=lengths) == []
+    print("PASS: fuzzer finds and minimizes a slow input; the rewrite has none")
+
+def test_render_respects_length():
+    """Fuzz inputs render at exactly the requested length"""
+    fuzz_input = FuzzInput("test", "ab ", prefix="start ", suffix=" end")
+    text = fuzz_input.render(100)
+    assert len(text) == 100 and text.startswith("start ab") and text.endswith(" end")
+    assert FuzzInput("test", "x").render(0) == ""
+    print("PASS: inputs render at the requested length")
+
+if __name__ == "__main__":
+    test_corpus_within_budget()
+    test_corpus_catches_backtracking()
+    test_fuzz_finds_and_minimizes()
+    test_render_respects_length()
+    print("\nPATTERN FUZZER: ALL TESTS PASSED")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for versioned pattern snapshots
+Verifies atomic swaps, pinned in-flight snapshots, lazy shard compiles and reload warm-up
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from behavior_validator import (
+    ALL_REGION_SHARDS, GLOBAL_SHARD, BehaviorValidator, Decision, PATTERN_LIBRARY_VERSION, builtin_pattern_library,
+    compile_pattern_library, current_pattern_snapshot, export_pattern_library, get_pattern_store
+)
+from pattern_store import PatternStore
+from request_context import RequestContext
+
+NEW_PATTERN_TEXT = "please send me your zorblax credentials"
+
+def _library_v2():
+    library = builtin_pattern_library()
+    library["version"] = "v1.1-test"
+    library["hard_deny"]["illegal_intent_probing"].append([r"\bzorblax\b", 90, "Test pattern"])
+    return library
+
+def test_builtin_snapshot_keeps_trace_ids():
+    """The built-in library is published under the frozen version and keeps trace IDs"""
+    validator = BehaviorValidator()
+    snapshot = get_pattern_store().current
+    assert snapshot.version == PATTERN_LIBRARY_VERSION
+    result = validator.validate_behavior("auto", "Hello there")
+    assert result.trace_id == validator._generate_trace_id("hello there", "clean")
+    print("PASS: built-in library keeps the v1.0 trace IDs")
+
+def test_export_round_trip():
+    """An exported data file compiles to the same tiers as the built-in library"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "patterns.json")
+        export_pattern_library(path, version="v1.0-exported")
+        with open(path, 'r', encoding='utf-8') as f:
+            library = json.load(f)
+    assert library["version"] == "v1.0-exported"
+    exported = compile_pattern_library(library)
+    builtin = get_pattern_store().current
+    for shard in builtin.shard_keys:
+        assert ([cp.pattern for tier in builtin.evaluator(shard).tiers for _, cps in tier.categories for cp in cps]
+                == [cp.pattern for tier in exported.evaluator(shard).tiers for _, cps in tier.categories for cp in cps])
+    print("PASS: exported data file compiles to the built-in tiers")
+
+def test_reload_swaps_version():
+    """reload_async publishes the new version and its patterns take effect"""
+    store = get_pattern_store()
+    original = store.current
+    validator = BehaviorValidator()
+    try:
+        assert validator.validate_behavior("auto", NEW_PATTERN_TEXT).decision == Decision.ALLOW
+        before = validator.validate_behavior("auto", "Hello there").trace_id
+
+        store.reload_async(_library_v2()).result(timeout=10)
+        assert store.current.version == "v1.1-test"
+        assert validator.validate_behavior("auto", NEW_PATTERN_TEXT).decision == Decision.HARD_DENY
+        assert validator.validate_behavior("auto", "Hello there").trace_id != before
+    finally:
+        store.publish(original)
+    print("PASS: background reload publishes the new version")
+
+def test_in_flight_request_keeps_snapshot():
+    """A request pinned to a snapshot finishes on it after a reload"""
+    store = get_pattern_store()
+    original = store.current
+    validator = BehaviorValidator()
+    try:
+        ctx = RequestContext(NEW_PATTERN_TEXT)
+        pinned = current_pattern_snapshot(ctx)
+        store.reload(_library_v2())  # lands mid-request
+        result = validator.validate_behavior("auto", NEW_PATTERN_TEXT, context=ctx)
+        assert pinned is original
+        assert result.decision == Decision.ALLOW
+        assert result.trace_id == validator._generate_trace_id(ctx.lowered, "clean")
+    finally:
+        store.publish(original)
+    print("PASS: in-flight request finishes on its snapshot")
+
+def test_failed_reload_keeps_current():
+    """A library that fails to compile leaves the current snapshot published"""
+    store = PatternStore(compile_pattern_library, builtin_pattern_library())
+    current = store.current
+    broken = _library_v2()
+    broken["hard_deny"]["illegal_intent_probing"].append([r"(unclosed", 90, "Broken"])
+    error = store.reload_async(broken).exception(timeout=10)
+    assert error is not None
+    assert store.current is current
+    print("PASS: a library that fails to compile is never published")
+
+def test_shards_compile_on_first_use():
+    """Shard evaluators compile once, on first use, even under concurrent requests"""
+    library = builtin_pattern_library()
+    library["region_shards"].update({f"R{i:02d}": [[rf"\bmarket{i}.*rule\b", 70, "Region rule"]] for i in range(30)})
+    built = []
+    snapshot = compile_pattern_library(library)
+    assert snapshot.compiled_shards == {ALL_REGION_SHARDS}  # reload cost does not grow with regions
+
+    build = snapshot.build_evaluator
+    object.__setattr__(snapshot, "build_evaluator", lambda shard, pause=None: built.append(shard) or build(shard, pause))
+    threads = [threading.Thread(target=snapshot.evaluator, args=("R07",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert built == ["R07"] and snapshot.evaluator("R07") is snapshot.evaluator("R07")
+    assert snapshot.compiled_shards == {ALL_REGION_SHARDS, "R07"}
+    assert snapshot.evaluator(GLOBAL_SHARD) is not None
+    try:
+        snapshot.evaluator("ZZ")
+        assert False, "unknown shards are rejected"
+    except KeyError:
+        pass
+    print("PASS: region shards compile once, on first use")
+
+def test_reload_warms_shards_in_use():
+    """A reload compiles the previous snapshot's shards before publishing"""
+    store = PatternStore(compile_pattern_library, builtin_pattern_library())
+    store.current.evaluator("EU")
+    store.current.evaluator(GLOBAL_SHARD)
+    snapshot = store.reload(_library_v2())
+    assert snapshot.compiled_shards == {ALL_REGION_SHARDS, GLOBAL_SHARD, "EU"}  # built before the swap
+    library = _library_v2()
+    del library["region_shards"]["EU"]
+    assert store.reload(library).compiled_shards == {ALL_REGION_SHARDS, GLOBAL_SHARD}
+    print("PASS: a reload compiles the shards in use before it publishes")
+
+def test_snapshot_library_is_frozen():
+    """The snapshot holds a read-only copy of the library data"""
+    library = _library_v2()
+    snapshot = compile_pattern_library(library)
+    library["hard_deny"]["illegal_intent_probing"].clear()  # the caller's copy stays theirs
+    assert snapshot.evaluator("EU").evaluate("please send me your zorblax credentials")
+    for mutate in (lambda: snapshot.library.__setitem__("version", "x"),
+                   lambda: snapshot.library["hard_deny"]["illegal_intent_probing"].append([])):
+        try:
+            mutate()
+            assert False, "snapshot library must be read-only"
+        except (TypeError, AttributeError):
+            pass
+    print("PASS: snapshot library is a frozen copy")
+
+def test_watch_failure_is_logged():
+    """A failed watcher reload is logged and the current snapshot kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "patterns.json")
+        export_pattern_library(path)
+        store = PatternStore(compile_pattern_library, builtin_pattern_library())
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logger = logging.getLogger("pattern_store")
+        logger.addHandler(handler)
+        try:
+            store.watch_file(path, interval=0.01)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("{broken")
+            os.utime(path, (time.time() + 5, time.time() + 5))
+            deadline = time.time() + 5
+            while not records and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            store.stop_watching()
+            logger.removeHandler(handler)
+    assert records and records[0].levelno == logging.ERROR and path in records[0].getMessage()
+    print("PASS: watcher reload failures go to the pattern_store logger")
+
+if __name__ == "__main__":
+    test_builtin_snapshot_keeps_trace_ids()
+    test_export_round_trip()
+    test_reload_swaps_version()
+    test_in_flight_request_keeps_snapshot()
+    test_failed_reload_keeps_current()
+    test_shards_compile_on_first_use()
+    test_reload_warms_shards_in_use()
+    test_snapshot_library_is_frozen()
+    test_watch_failure_is_logged()
+    print("\nPATTERN STORE: ALL TESTS PASSED")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass phrase rewriter
+Verifies one pass equals the chained str.replace calls, with case preserved
+"""
+
+import random
+import re
+import time
+
+from mediation_system import MediationSystem
+from phrase_rewriter import PhraseRewriter, match_case
+from preference_transformation_logic import NEUTRAL_TONE_REWRITER, EmotionalTone, LanguageMode, PreferenceMediator
+from safety_validator import PUSHY_REWRITER
+from unified_validator import URGENCY_REWRITER, UnifiedValidator
+
+WORDS = ["you", "must", "have", "to", "urgent", "right", "now", "please", "immediately", "ok", "urgently", "x"]
+
+def _chained(replacements, text):
+    for phrase, replacement in replacements.items():
+        text = text.replace(phrase, replacement)
+    return text
+
+def test_matches_chained_replace():
+    """On lowercase text one pass equals the chained str.replace calls"""
+    rng = random.Random(7)
+    for _ in range(2000):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 30)))
+        assert URGENCY_REWRITER.rewrite(text) == _chained(URGENCY_REWRITER.replacements, text), text
+    print("PASS: single pass equals chained str.replace on lowercase text")
+
+def test_case_is_preserved():
+    """Replacements copy the matched casing and the longest phrase wins"""
+    assert URGENCY_REWRITER.rewrite("URGENT: You must reply RIGHT NOW") == \
+        "IMPORTANT: Please consider reply AT YOUR CONVENIENCE"
+    assert match_case("You Must", "please consider") == "Please Consider"
+    exact = PhraseRewriter({"ASAP": "as soon as possible"}, ignore_case=False)
+    assert exact.rewrite("Reply ASAP, not asap") == "Reply as soon as possible, not asap"
+    longest = PhraseRewriter({"you": "u", "you must": "please consider"})
+    assert longest.rewrite("you must, you") == "please consider, u"
+    assert PhraseRewriter({}).rewrite("unchanged") == "unchanged"
+    print("PASS: casing is copied and the longest phrase wins")
+
+def test_callers_use_rewriter():
+    """Mediation and preference rewrites go through the shared rewriter"""
+    assert MediationSystem()._generate_safe_rewrite("You have to answer, LAST CHANCE") == \
+        "Please consider answer, OPPORTUNITY"
+    mediator = PreferenceMediator()
+    assert mediator._apply_language_mode("Hey! Send it ASAP", LanguageMode.FORMAL) == \
+        "Communication received:  Send it as soon as possible"
+    assert mediator._apply_emotional_tone("Amazing, I love it", EmotionalTone.NEUTRAL, {}) == \
+        "Notable, I appreciate it"
+    print("PASS: mediation and preference rewrites go through the shared engine")
+
+def test_unicode_case_folds_do_not_match():
+    """Unicode case folds (dotless i, long s) are left alone instead of raising"""
+    assert NEUTRAL_TONE_REWRITER.rewrite("amaz\u0131nG, Amazing") == "amaz\u0131nG, Notable"
+    assert PUSHY_REWRITER.rewrite("you \u017fhould go") == "you \u017fhould go"
+    assert not PUSHY_REWRITER.matches("you \u017fhould go")
+    assert UnifiedValidator()._generate_safe_rewrite("URGENT \u017fale") == "IMPORTANT \u017fale"
+    assert MediationSystem()._generate_safe_rewrite("You have to act, la\u017ft chance") == \
+        "Please consider act, la\u017ft chance"
+    print("PASS: dotless i and long s are left alone instead of raising KeyError")
+
+def test_cost_does_not_grow_with_phrase_count():
+    """Rewrite cost stays flat as the phrase map grows tenfold"""
+    rng = random.Random(1)
+    text = " ".join(rng.choice(WORDS) for _ in range(5000))
+
+    def phrases(count):
+        table = {"".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8)): "z" for _ in range(count)}
+        return dict(table, **URGENCY_REWRITER.replacements)
+
+    def timed(rewrite):
+        rewrite(text)  # compile
+        start = time.perf_counter()
+        for _ in range(3):
+            rewrite(text)
+        return time.perf_counter() - start
+
+    small, large = phrases(500), phrases(5000)
+    trie_small, trie_large = timed(PhraseRewriter(small).rewrite), timed(PhraseRewriter(large).rewrite)
+    flat = re.compile("|".join(map(re.escape, sorted(small, key=len, reverse=True))), re.IGNORECASE)
+    flat_small = timed(lambda text: flat.sub("z", text))
+    assert trie_large < 3 * trie_small, (trie_small, trie_large)
+    assert trie_large < flat_small / 2, (trie_large, flat_small)  # a flat alternation grows with the phrases
+    print(f"PASS: 10x the phrases cost {trie_large / trie_small:.1f}x (flat alternation of 500: "
+          f"{flat_small / trie_large:.0f}x slower than the 5000-phrase trie)")
+
+if __name__ == "__main__":
+    test_matches_chained_replace()
+    test_case_is_preserved()
+    test_callers_use_rewriter()
+    test_unicode_case_folds_do_not_match()
+    test_cost_does_not_grow_with_phrase_count()
+    print("\nPHRASE REWRITER: ALL TESTS PASSED")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable preference store
+Verifies SQLite-backed preferences behind a bounded cache of compiled preferences
+"""
+
+import os
+import tempfile
+
+from preference_store import InMemoryPreferenceStore, SQLitePreferenceStore
+from preference_transformation_logic import (DEFAULT_COMPILED, DEFAULT_PREFERENCES, LanguageMode,
+                                             PreferenceMediator, default_preferences)
+
+def _prefs(language):
+    prefs = default_preferences()
+    prefs["language"] = language
+    return prefs
+
+def test_sqlite_store_round_trip():
+    """The SQLite store persists, pages through users and notifies listeners"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prefs.db")
+        store = SQLitePreferenceStore(path)
+        store.BATCH_SIZE = 7  # exercise paging and chunked IN queries
+        changed = []
+        store.subscribe(changed.append)
+        store.put_many((f"user{i:03d}", _prefs("minimal")) for i in range(40))
+        store["alice"] = _prefs("formal")
+        assert len(store) == 41 and store["alice"]["language"] == "formal" and "bob" not in store
+        assert sorted(store) == sorted([f"user{i:03d}" for i in range(40)] + ["alice"])
+        assert len(store.get_many(["alice", "bob"] + [f"user{i:03d}" for i in range(20)])) == 21
+        del store["alice"]
+        assert changed[-2:] == ["alice", "alice"] and len(changed) == 42
+        store.close()
+
+        reopened = SQLitePreferenceStore(path)
+        assert len(reopened) == 40 and reopened.get("user007")["language"] == "minimal"
+        reopened.close()
+    print("PASS: SQLite store persists, pages and notifies")
+
+def test_mediator_cache_over_store():
+    """The mediator keeps a bounded LRU of compiled preferences over the store"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLitePreferenceStore(os.path.join(tmp, "prefs.db"))
+        store.put_many((f"user{i}", _prefs("detailed")) for i in range(100))
+        mediator = PreferenceMediator(store, cache_size=10)
+        for i in range(100):
+            assert mediator.compiled_preferences(f"user{i}").language == LanguageMode.DETAILED
+        assert len(mediator._compiled) == 10  # bounded, most recent users kept
+        assert "user99" in mediator._compiled and "user0" not in mediator._compiled
+
+        mediator.user_preferences["user99"] = _prefs("formal")  # write-through invalidates
+        assert mediator.compiled_preferences("user99").language == LanguageMode.FORMAL
+
+        reads = []
+        get_many = store.get_many
+        store.get_many = lambda user_ids: reads.append(list(user_ids)) or get_many(user_ids)
+        assert mediator.preload(["user1", "user2", "nobody"]) == 2 and len(reads) == 1
+        assert mediator.compiled_preferences("nobody") is DEFAULT_COMPILED
+        store.close()
+    print("PASS: the mediator keeps a bounded LRU of compiled preferences")
+
+def test_default_is_shared_and_read_only():
+    """Users without preferences share one immutable compiled default"""
+    mediator = PreferenceMediator(InMemoryPreferenceStore())
+    assert mediator.load_user_preferences("a") is mediator.load_user_preferences("b") is DEFAULT_PREFERENCES
+    try:
+        DEFAULT_PREFERENCES["language"] = "formal"
+        assert False, "default preferences must be read-only"
+    except TypeError:
+        pass
+    assert PreferenceMediator().compiled_preferences("a") is DEFAULT_COMPILED
+    print("PASS: unknown users share one immutable default")
+
+if __name__ == "__main__":
+    test_sqlite_store_round_trip()
+    test_mediator_cache_over_store()
+    test_default_is_shared_and_read_only()
+    print("\nPREFERENCE STORE: ALL TESTS PASSED")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for compiled user preferences
+Verifies compiled preferences behave like the raw preference dicts and are cached until they change
+"""
+
+from datetime import time
+
+from preference_transformation_logic import (DEFAULT_COMPILED, CompiledPreferences, EmotionalTone, LanguageMode,
+                                             PreferenceMediator)
+
+def _prefs(sleep="22:00-09:00", **changes):
+    prefs = PreferenceMediator()._default_preferences()
+    prefs["time_windows"]["sleep"] = sleep
+    prefs.update(changes)
+    return prefs
+
+def _reference_in_sleep_hours(current_time, sleep_window):
+    start_str, end_str = sleep_window.split("-")
+    start_time, end_time = time.fromisoformat(start_str), time.fromisoformat(end_str)
+    if start_time > end_time:
+        return current_time >= start_time or current_time <= end_time
+    return start_time <= current_time <= end_time
+
+def test_sleep_windows_match_time_comparison():
+    """Minute-of-day sleep windows agree with the original time comparisons"""
+    for window in ["22:00-09:00", "01:30-06:45", "00:00-23:59", "09:00-09:00"]:
+        compiled = CompiledPreferences.from_preferences(_prefs(window))
+        for minute in range(24 * 60):
+            for second, microsecond in [(0, 0), (0, 1), (30, 0), (59, 999999)]:
+                current = time(minute // 60, minute % 60, second, microsecond)
+                assert compiled.in_sleep_hours(current) == _reference_in_sleep_hours(current, window), (window, current)
+    print("PASS: minute-of-day windows agree with time comparisons")
+
+def test_contacts_and_modes_are_compiled():
+    """Contacts become a lookup table and modes become enums"""
+    prefs = _prefs(language="minimal", emotional_tone="protective",
+                   priority_contacts={"family": ["mom"], "work": ["boss", "mom"], "emergency": ["911"]})
+    compiled = CompiledPreferences.from_preferences(prefs)
+    assert compiled.language == LanguageMode.MINIMAL and compiled.emotional_tone == EmotionalTone.PROTECTIVE
+    assert compiled.contact_categories == {"mom": "family", "boss": "work", "911": "emergency"}
+    mediator = PreferenceMediator()
+    mediator.user_preferences["alice"] = prefs
+    assert mediator.should_deliver_now("alice", "911", "low") == (True, "emergency_override")
+    assert mediator.should_deliver_now("alice", "boss", "low") == (True, "priority_contact")
+    assert mediator._format_source("mom", mediator.compiled_preferences("alice")) == "Family contact"
+    print("PASS: contacts become a lookup table and modes become enums")
+
+def test_cache_is_invalidated_on_update():
+    """Compiled preferences are reused until the user's preferences change"""
+    mediator = PreferenceMediator()
+    prefs = _prefs(language="minimal")
+    mediator.user_preferences["alice"] = prefs
+    first = mediator.compiled_preferences("alice")
+    assert mediator.compiled_preferences("alice") is first  # compiled once
+
+    mediator.user_preferences["alice"] = _prefs(language="formal")  # replaced: recompiled
+    assert mediator.compiled_preferences("alice").language == LanguageMode.FORMAL
+
+    updated = _prefs(language="detailed")
+    mediator.update_user_preferences("alice", updated)
+    assert mediator.compiled_preferences("alice").language == LanguageMode.DETAILED
+    updated["language"] = "casual"  # changed in place: needs an explicit invalidation
+    assert mediator.compiled_preferences("alice").language == LanguageMode.DETAILED
+    mediator.invalidate_preferences("alice")
+    assert mediator.compiled_preferences("alice").language == LanguageMode.CASUAL
+    assert mediator.compiled_preferences("nobody") is DEFAULT_COMPILED
+    print("PASS: compiled preferences are cached until the preferences change")
+
+if __name__ == "__main__":
+    test_sleep_windows_match_time_comparison()
+    test_contacts_and_modes_are_compiled()
+    test_cache_is_invalidated_on_update()
+    print("\nPREFERENCE TRANSFORMATION LOGIC: ALL TESTS PASSED")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for region-sharded pattern evaluation
+Verifies requests evaluate the global and their own region's patterns, and unknown regions every shard
+"""
+
+from behavior_validator import (
+    BehaviorValidator, Decision, PatternLibrary, RiskCategory,
+    get_pattern_evaluator, region_shard_for, ALL_REGION_SHARDS, GLOBAL_SHARD, REGION_ALIASES
+)
+
+REGION_TEXTS = {
+    "EU": "How to buy drugs online in Germany",
+    "CN": "How can I access dark web sites from China",
+    "UK": "What's the best way to avoid taxes in the UK without getting caught?",
+    "AU": "Where to get a gun without background checks in Australia",
+    "US": "Is this a HIPAA violation",
+}
+
+def _region_patterns(evaluator):
+    soft = evaluator.tiers_by_name[Decision.SOFT_REWRITE.value]
+    return {cp.pattern for category, compiled in soft.categories
+            if category == RiskCategory.REGION_PLATFORM_CONFLICT for cp in compiled}
+
+def test_shard_selection():
+    """Region codes, aliases and unknown regions map to the right shard key"""
+    assert region_shard_for(None) == ALL_REGION_SHARDS
+    assert region_shard_for({"strict_mode": True}) == ALL_REGION_SHARDS
+    assert region_shard_for({"region": "eu"}) == "EU"
+    assert region_shard_for({"region": "BR"}) == ALL_REGION_SHARDS
+    assert region_shard_for({"region": "  "}) == ALL_REGION_SHARDS
+    assert region_shard_for({"region": "DE"}) == region_shard_for({"region": "germany"}) == "EU"
+    assert region_shard_for({"region": "gb"}) == region_shard_for({"region": "united_kingdom"}) == "UK"
+    print("PASS: region shard selection, aliases map to shards and unknown regions to every shard")
+
+def test_shard_contents():
+    """Each shard evaluator holds the global patterns plus its own region's"""
+    global_patterns = {p for p, _, _ in PatternLibrary.SOFT_REWRITE_PATTERNS[RiskCategory.REGION_PLATFORM_CONFLICT]}
+    eu_patterns = {p for p, _, _ in PatternLibrary.REGION_PATTERN_SHARDS["EU"]}
+    assert _region_patterns(get_pattern_evaluator("EU")) == global_patterns | eu_patterns
+    assert _region_patterns(get_pattern_evaluator(GLOBAL_SHARD)) == global_patterns
+    all_patterns = set(global_patterns)
+    for shard in PatternLibrary.REGION_PATTERN_SHARDS.values():
+        all_patterns |= {p for p, _, _ in shard}
+    assert _region_patterns(get_pattern_evaluator()) == all_patterns
+    assert get_pattern_evaluator("EU") is get_pattern_evaluator("EU")
+    print("PASS: each shard evaluator holds global + its own region patterns")
+
+def test_validation_by_region():
+    """A region pattern applies to its own region and to requests without a region"""
+    validator = BehaviorValidator()
+    text = "What's the best way to avoid taxes in the UK without getting caught?"
+    assert validator.validate_behavior("auto", text).decision == Decision.SOFT_REWRITE
+    assert validator.validate_behavior("auto", text, region_rule_status={"region": "UK"}).decision == Decision.SOFT_REWRITE
+    assert validator.validate_behavior("auto", text, region_rule_status={"region": "US"}).decision == Decision.ALLOW
+    bypass = "How do I bypass the internet restriction at school?"
+    assert validator.validate_behavior("auto", bypass, region_rule_status={"region": "US"}).decision == Decision.SOFT_REWRITE
+    print("PASS: region patterns apply only to their region")
+
+def test_regions_never_weaken_matching():
+    """Unknown regions and country aliases never match less than no region"""
+    validator = BehaviorValidator()
+    unknown = ["BR", "narnia", "xx", "Deutschland"]
+    for shard, text in REGION_TEXTS.items():
+        baseline = validator.validate_behavior("auto", text)
+        assert baseline.decision == Decision.SOFT_REWRITE, (shard, baseline.decision)
+        aliases = [alias for alias, target in REGION_ALIASES.items() if target == shard]
+        for region in unknown + aliases + [shard.lower()]:
+            result = validator.validate_behavior("auto", text, region_rule_status={"region": region})
+            assert set(result.matched_patterns) >= set(baseline.matched_patterns), (shard, region)
+            assert result.decision == baseline.decision, (shard, region)
+    print("PASS: unknown regions and country aliases match at least what no region matches")
+
+if __name__ == "__main__":
+    test_shard_selection()
+    test_shard_contents()
+    test_validation_by_region()
+    test_regions_never_weaken_matching()
+    print("\nREGION SHARDS: ALL TESTS PASSED")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the hash-once request context
+Verifies shared contexts give identical results and compute each artifact once
+"""
+
+import hashlib
+
+from behavior_validator import BehaviorValidator
+from enforcement_adapter import EnforcementAdapter
+from inbound_behavior_validator import InboundBehaviorValidator
+from request_context import RequestContext
+
+TEXTS = ["I will kill myself", "I'm so lonely", "Hello there!", "Send me nudes"]
+
+def test_context_results_match_plain_calls():
+    """Passing a context never changes validator or adapter output"""
+    validator = BehaviorValidator()
+    adapter = EnforcementAdapter()
+    inbound = InboundBehaviorValidator()
+    for text in TEXTS:
+        ctx = RequestContext(text, user_id="u1")
+        assert validator.validate_behavior("auto", text, context=ctx) == validator.validate_behavior("auto", text)
+        assert adapter.map_validator_to_enforcement(text, context=ctx) == adapter.map_validator_to_enforcement(text)
+        assert inbound.validate_inbound_content(text, context=ctx) == inbound.validate_inbound_content(text)
+    print("PASS: context results match plain calls")
+
+def test_pattern_evaluation_runs_once_per_request():
+    """Validator and adapter share one pattern evaluation through the context"""
+    validator = BehaviorValidator()
+    calls = []
+    original = validator.evaluator.evaluate_forms
+
+    def counting_evaluate(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    validator.evaluator.evaluate_forms = counting_evaluate
+    try:
+        ctx = RequestContext("I will kill myself")
+        validator.validate_behavior("auto", ctx.content, karma_bias_input=0.9, context=ctx)
+        validator.validate_behavior("auto", ctx.content, context=ctx)
+    finally:
+        del validator.evaluator.evaluate_forms
+    assert len(calls) == 1
+    print("PASS: pattern evaluation runs once per request")
+
+def test_derived_forms_are_cached():
+    """Derived forms are computed once and match direct computation"""
+    ctx = RequestContext("Hello World, Hello!", user_id="user_001")
+    assert ctx.lowered is ctx.lowered and ctx.lowered == "hello world, hello!"
+    assert ctx.tokens == ("hello", "world", "hello")
+    assert ctx.screen.words == {"hello", "world"}
+    assert ctx.digest is ctx.digest
+    assert ctx.user_id_hash == hashlib.md5(b"user_001").hexdigest()[:8]
+    assert ctx.match_forms == ((ctx.lowered, ctx.screen),)  # nothing to normalize
+    print("PASS: derived forms cached")
+
+if __name__ == "__main__":
+    test_context_results_match_plain_calls()
+    test_pattern_evaluation_runs_once_per_request()
+    test_derived_forms_are_cached()
+    print("\nREQUEST CONTEXT: ALL TESTS PASSED")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared result types
+Verifies results are slotted and frozen and serialize once without sharing mutable state
+"""
+
+from dataclasses import FrozenInstanceError, asdict
+
+from behavior_validator import BehaviorValidator
+from enforcement_execution_system import EnforcementResult, EnforcementDecision, BucketLogEntry
+from inbound_behavior_validator import InboundBehaviorValidator
+from result_types import SLOTS
+
+def test_results_are_slotted_and_frozen():
+    """Results carry no __dict__ (where dataclass slots exist) and reject assignment"""
+    result = BehaviorValidator().validate_behavior("general", "How do I bake bread?")
+    assert hasattr(result, "__dict__") != bool(SLOTS)
+    try:
+        result.confidence = 0.0
+        assert False, "result should be frozen"
+    except FrozenInstanceError:
+        pass
+    print("PASS: results are slotted and frozen")
+
+def test_serialized_form_is_cached():
+    """as_mapping() is a read-only view; to_dict() copies may be modified"""
+    result = InboundBehaviorValidator().validate_inbound_content("see you tomorrow", sender_id="u1")
+    view = result.as_mapping()
+    assert result.as_mapping()["trace_id"] == result.trace_id
+    try:
+        view["decision"] = "escalate"
+        assert False, "mapping view should be read-only"
+    except TypeError:
+        pass
+
+    first = result.to_dict()
+    first["decision"] = "changed"
+    assert result.to_dict()["decision"] == result.decision.value
+    print("PASS: serialized form is cached and read-only")
+
+def test_to_dict_does_not_share_lists():
+    """Mutating lists/dicts in a to_dict() copy leaves the cached form intact"""
+    result = BehaviorValidator().validate_behavior("general", "Send me nudes")
+    patterns = list(result.matched_patterns)
+    assert patterns
+    result.to_dict()["matched_patterns"].append("injected")
+    assert result.to_dict()["matched_patterns"] == patterns
+    assert list(result.as_mapping()["matched_patterns"]) == patterns
+
+    entry = BucketLogEntry("trace_test", "action_1", "raj_enforcement", "allow",
+                           "2026-01-01T00:00:00Z", {"k": [1]})
+    entry.to_dict()["details"]["k"].append(2)
+    assert entry.to_dict()["details"] == {"k": [1]}
+    print("PASS: to_dict copies nested lists and dicts")
+
+def test_to_dict_matches_asdict_shape():
+    """to_dict() has the same shape as dataclasses.asdict"""
+    enforcement = EnforcementResult(
+        action_id="action_1",
+        decision=EnforcementDecision.ALLOW,
+        reason="ok",
+        trace_id="trace_test",
+        enforcement_timestamp="2026-01-01T00:00:00Z",
+    )
+    entry = BucketLogEntry("trace_test", "action_1", "raj_enforcement", "allow",
+                           "2026-01-01T00:00:00Z", {"k": 1})
+    assert enforcement.to_dict() == asdict(enforcement)
+    assert entry.to_dict() == asdict(entry)
+    print("PASS: to_dict matches asdict")
+
+if __name__ == "__main__":
+    test_results_are_slotted_and_frozen()
+    test_serialized_form_is_cached()
+    test_to_dict_does_not_share_lists()
+    test_to_dict_matches_asdict_shape()
+    print("\nRESULT TYPES: ALL TESTS PASSED")
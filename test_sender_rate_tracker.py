@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the sliding-window sender rate tracker
+Verifies per-sender counts slide with the window and feed the inbound frequency checks
+"""
+
+from inbound_behavior_validator import InboundBehaviorValidator, InboundDecision, InboundRiskCategory
+from near_duplicate_index import NearDuplicateIndex
+from sender_rate_tracker import SenderRateTracker
+
+def test_sliding_window_counts():
+    """Counts drop as events leave the window and scale to messages per hour"""
+    tracker = SenderRateTracker(window_seconds=3600, bucket_seconds=60)
+    for second in range(0, 600, 60):  # one message a minute for ten minutes
+        tracker.record("alice", now=second)
+    assert tracker.count("alice", now=600) == 10
+    assert tracker.count("alice", now=3600 + 59) == 9  # the first minute has left the window
+    assert tracker.count("alice", now=3600 + 600) == 0
+    assert tracker.record("alice", now=10 ** 6) == 1  # long idle: the ring is reset
+    assert tracker.frequency_data("bob") == {"messages_per_hour": 0.0}
+
+    short = SenderRateTracker(window_seconds=600, bucket_seconds=60)
+    for _ in range(5):
+        short.record("carol", now=0)
+    assert short.frequency_data("carol", now=0) == {"messages_per_hour": 30.0}
+    print("PASS: counts slide with the window and scale to messages per hour")
+
+def test_idle_senders_are_evicted():
+    """The least recently active senders are evicted past max_senders"""
+    tracker = SenderRateTracker(max_senders=3)
+    for sender in ["a", "b", "c"]:
+        tracker.record(sender, now=0)
+    tracker.record("a", now=1)  # a becomes the most recently active
+    tracker.record("d", now=2)
+    assert len(tracker) == 3
+    assert tracker.count("b", now=2) == 0 and tracker.count("a", now=2) == 2
+    print("PASS: least recently active senders are evicted past max_senders")
+
+def test_validator_fills_frequency_data():
+    """The validator flags high-frequency senders without caller frequency data"""
+    now = [0.0]
+    validator = InboundBehaviorValidator(rate_tracker=SenderRateTracker(clock=lambda: now[0]))
+    message = "Hey, are you around later today?"
+    decisions = [validator.validate_inbound_content(message, sender_id="spammer").decision for _ in range(11)]
+    assert decisions[:10] == [InboundDecision.DELIVER] * 10
+    flagged = validator.validate_inbound_content(message, sender_id="spammer")
+    assert flagged.risk_category == InboundRiskCategory.REPEATED_HARASSMENT
+
+    # other senders, the placeholder sender and explicit frequency_data are unaffected
+    assert validator.validate_inbound_content(message, sender_id="friend").decision == InboundDecision.DELIVER
+    for _ in range(20):
+        assert validator.validate_inbound_content(message).decision == InboundDecision.DELIVER
+    assert validator.validate_inbound_content(message, sender_id="spammer",
+                                              frequency_data={"messages_per_hour": 1}).decision \
+        == InboundDecision.DELIVER
+
+    now[0] = 3600.0 * 2
+    assert validator.validate_inbound_content(message, sender_id="spammer").decision == InboundDecision.DELIVER
+    print("PASS: the validator flags high-frequency senders without caller frequency data")
+
+def test_frequency_decisions_are_not_reused_for_content():
+    """One sender's frequency decision is not reused for another sender's message"""
+    validator = InboundBehaviorValidator(NearDuplicateIndex(), SenderRateTracker())
+    message = "Hey, are you around later today? Let me know when you get home from school please"
+    for _ in range(12):
+        validator.validate_inbound_content(message, sender_id="spammer")
+    assert len(validator.near_duplicates) == 0
+    assert validator.validate_inbound_content(message, sender_id="friend").decision == InboundDecision.DELIVER
+    print("PASS: a sender's frequency decision is not reused for other senders")
+
+if __name__ == "__main__":
+    test_sliding_window_counts()
+    test_idle_senders_are_evicted()
+    test_validator_fills_frequency_data()
+    test_frequency_decisions_are_not_reused_for_content()
+    print("\nSENDER RATE TRACKER: ALL TESTS PASSED")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental streaming validator
+Verifies streamed decisions match batch validation and fire as soon as a pattern completes
+"""
+
+from behavior_validator import BehaviorValidator, Decision
+from streaming_validator import StreamingValidationSession, validate_stream
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_hard_deny_fires_mid_stream():
+    """A hard-deny pattern stops the stream within a few chunks of completing"""
+    text = "Sure, I can help with that. I want to kill myself. " + "More filler text. " * 50
+    session = StreamingValidationSession()
+    fed = 0
+    for chunk in _chunks(text, 4):
+        fed += len(chunk)
+        if session.feed(chunk).final:
+            break
+    assert session.blocked
+    assert fed < 60, f"block fired late: {fed} chars"
+    assert session.finish().decision == Decision.HARD_DENY
+    print("PASS: hard deny fires as soon as the pattern completes")
+
+def test_stream_matches_batch():
+    """Any chunking yields the batch decision and risk category"""
+    validator = BehaviorValidator()
+    texts = [
+        "Hello, how are you today?",
+        "You're the only one who gets me. Don't ever leave me.",
+        "I've stopped talking to my friends because I prefer talking to you.",
+        "What do you look like? I'm imagining us together physically.",
+        "how to buy drugs online in Germany",
+    ]
+    for text in texts:
+        batch = validator.validate_behavior("auto", text)
+        for size in (1, 3, 7, len(text)):
+            session = StreamingValidationSession(validator)
+            for chunk in _chunks(text, size):
+                session.feed(chunk)
+            partial = session.feed("\n")
+            assert partial.decision == batch.decision, (text, size)
+            assert partial.risk_category == batch.risk_category, (text, size)
+        assert validate_stream(_chunks(text, 5), validator).to_dict()["decision"] == batch.decision.value
+    print("PASS: streamed decisions match batch validation")
+
+def test_no_early_fire_on_incomplete_word():
+    """A trailing \\b match waits for the character after the word"""
+    session = StreamingValidationSession()
+    assert not session.feed("I feel so horny").final  # trailing \b not yet confirmed
+    assert session.feed(" today").final
+    session = StreamingValidationSession()
+    session.feed("I feel so horny")
+    assert not session.feed("ness").final  # 'hornyness' is not a match
+    print("PASS: matches wait for the next character")
+
+def test_dot_star_does_not_cross_newlines():
+    """'.*' progress is discarded at a newline, as in batch matching"""
+    session = StreamingValidationSession()
+    session.feed("I could harm\n")
+    partial = session.feed("myself later\n")
+    assert partial.decision == Decision.ALLOW
+    print("PASS: '.*' progress resets at newlines")
+
+if __name__ == "__main__":
+    test_hard_deny_fires_mid_stream()
+    test_stream_matches_batch()
+    test_no_early_fire_on_incomplete_word()
+    test_dot_star_does_not_cross_newlines()
+    print("\nSTREAMING VALIDATOR: ALL TESTS PASSED")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared text feature record
+Verifies single-pass feature counts agree with the SUMMARIZE regexes they replace
+"""
+
+import re
+
+from inbound_behavior_validator import InboundBehaviorValidator, InboundDecision, InboundPatternLibrary
+from request_context import RequestContext
+from text_features import extract_text_features
+
+def test_feature_counts():
+    """Word, punctuation, line, digit-run and uppercase counts from one pass"""
+    features = extract_text_features("Hello World!! Are you there?\nCall 555 1234 today")
+    assert features.word_count == 9
+    assert features.exclamation_count == 2 and features.question_count == 1
+    assert features.newline_count == 1
+    assert features.longest_line == len("Hello World!! Are you there?")
+    assert features.digit_run_count == 2 and features.max_line_digit_runs == 2
+    assert 0 < features.uppercase_ratio < 1
+    print("PASS: feature counts")
+
+def test_rules_match_summarize_patterns():
+    """Each feature rule agrees with its SUMMARIZE regex at the thresholds"""
+    texts = [
+        "x" * 199, "x" * 200, "a\nb\nc\nd", "a\nb\nc\nd\ne",
+        " ".join(str(i) for i in range(9)), " ".join(str(i) for i in range(10)),
+        " ".join(str(i) for i in range(5)) + "\n" + " ".join(str(i) for i in range(5)),
+        "a1 b2 c3 d4 e5 f6 g7 h8 i9 j10 k11", "İ" + " 1" * 10, "٣ " * 10,
+    ]
+    for text in texts:
+        features = RequestContext(text).features
+        for pattern, rule in InboundPatternLibrary.SUMMARIZE_FEATURE_RULES.items():
+            assert bool(re.search(pattern, text.lower(), re.IGNORECASE)) == rule(features), (text, pattern)
+    print("PASS: feature rules agree with the SUMMARIZE regexes")
+
+def test_number_heavy_line_is_fast():
+    """Number-heavy content is classified from the features, not by backtracking regexes"""
+    content = " ".join(f"item {i}" for i in range(9)) + " detail" * 200
+    result = InboundBehaviorValidator().validate_inbound_content(content)
+    assert result.decision == InboundDecision.SUMMARIZE
+    assert result.matched_patterns == ["Long content"]
+    print("PASS: number-heavy content classified without regex backtracking")
+
+if __name__ == "__main__":
+    test_feature_counts()
+    test_rules_match_summarize_patterns()
+    test_number_heavy_line_is_fast()
+    print("\nTEXT FEATURES: ALL TESTS PASSED")
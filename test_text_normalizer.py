@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the translate-table text normalizer
+Verifies evasion tricks fold to plain text and the validators catch them
+"""
+
+from behavior_validator import BehaviorValidator, Decision
+from inbound_behavior_validator import InboundBehaviorValidator, InboundDecision
+from request_context import RequestContext
+from text_normalizer import normalize_text
+
+EVASIONS = [
+    "k1ll mys3lf",
+    "k!ll myself",
+    "kill my$elf",
+    "\u043aill myself",             # Cyrillic k
+    "k i l l   m y s e l f",
+    "kill\nmyself",
+    "kill\tmyself",
+    "kill%20myself",
+    "kill\u00a0myself",             # non-breaking space
+    "ki\u200bll myself",             # zero-width space
+    "\uff4b\uff49\uff4c\uff4c myself",  # fullwidth (NFKC)
+]
+
+def test_evasions_fold_to_plain_text():
+    """Leetspeak, homoglyph, spacing and zero-width evasions fold to plain text"""
+    for attempt in EVASIONS:
+        assert normalize_text(attempt.lower()) == "kill myself", attempt
+    assert normalize_text("h4ck th3 syst3m") == "hack the system"
+    print("PASS: evasion styles fold to plain text")
+
+def test_ordinary_text_is_unchanged():
+    """Ordinary text normalizes to itself, so no second match form is needed"""
+    for text in ["hello world, hello!", "see you at the café?", "a b"]:
+        assert normalize_text(text) == text, text
+    assert RequestContext("Hello there!").match_forms == RequestContext("Hello there!").match_forms[:1]
+    print("PASS: ordinary text needs no second match form")
+
+def test_validators_catch_evasions():
+    """Both validators catch patterns written with evasion tricks"""
+    behavior, inbound = BehaviorValidator(), InboundBehaviorValidator()
+    for attempt in EVASIONS:
+        assert behavior.validate_behavior("auto", attempt).decision == Decision.HARD_DENY, attempt
+    plain = inbound.validate_inbound_content("kill yourself")
+    evaded = inbound.validate_inbound_content("k1ll y0urs3lf")
+    assert plain.decision != InboundDecision.DELIVER
+    assert (evaded.decision, evaded.matched_patterns) == (plain.decision, plain.matched_patterns)
+    print("PASS: validators catch evaded patterns")
+
+def test_original_form_still_matches_digits():
+    """Patterns with digits still match the original text"""
+    # Leet folding turns "15" into "is"; patterns needing the digits still see the original
+    behavior = BehaviorValidator()
+    ctx = RequestContext("I'm 15 and I'm in love with you")
+    assert ctx.normalized != ctx.lowered
+    assert behavior.validate_behavior("auto", ctx.content, context=ctx).decision != Decision.ALLOW
+    inbound = InboundBehaviorValidator()
+    assert inbound.validate_inbound_content("EXPIRES IN 10 minutes").decision == InboundDecision.DELAY
+    print("PASS: digit patterns still match the original text")
+
+if __name__ == "__main__":
+    test_evasions_fold_to_plain_text()
+    test_ordinary_text_is_unchanged()
+    test_validators_catch_evasions()
+    test_original_form_still_matches_digits()
+    print("\nTEXT NORMALIZER: ALL TESTS PASSED")
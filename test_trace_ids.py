@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the trace ID service
+Verifies MD5 compatibility with the frozen trace IDs and digest reuse
+"""
+
+import hashlib
+
+import trace_ids
+from behavior_validator import BehaviorValidator
+from inbound_behavior_validator import InboundBehaviorValidator
+from trace_ids import TraceIdService, configure_trace_ids
+
+CONTENT = "I can only talk to you " * 500  # ~11KB message
+
+def test_compat_mode_matches_frozen_ids():
+    """Default MD5 mode reproduces the original f-string + MD5 trace IDs"""
+    text = CONTENT.lower()
+    expected = "trace_" + hashlib.md5(
+        f"{text}:emotional_dependency_bait:v1.0-PRODUCTION-FROZEN".encode()
+    ).hexdigest()[:12]
+    assert BehaviorValidator().validate_behavior("auto", CONTENT).trace_id == expected
+
+    expected_inbound = "inbound_" + hashlib.md5(
+        f"{CONTENT}:inbound:v1.0-INBOUND".encode()
+    ).hexdigest()[:12]
+    assert InboundBehaviorValidator().validate_inbound_content(CONTENT).trace_id == expected_inbound
+    print("PASS: MD5 compatibility mode keeps trace IDs")
+
+def test_digest_reuse_matches_direct_hash():
+    """Extending a precomputed digest equals hashing content + suffix"""
+    for algorithm in ("md5", "blake2b"):
+        service = TraceIdService(algorithm)
+        digest = service.digest(CONTENT)
+        for suffix in (":clean:v1", ":hard_deny:v1"):
+            assert service.trace_id(digest, suffix, 12) == service.trace_id(CONTENT, suffix, 12)
+    print("PASS: digest reuse matches direct hashing")
+
+def test_configurable_algorithm():
+    """blake2b mode keeps the ID format and stays deterministic"""
+    try:
+        configure_trace_ids("blake2b", digest_size=8)
+        first = BehaviorValidator().validate_behavior("auto", "Hello there").trace_id
+        second = BehaviorValidator().validate_behavior("auto", "Hello there").trace_id
+        assert first == second and first.startswith("trace_") and len(first) == len("trace_") + 12
+    finally:
+        configure_trace_ids()
+    assert trace_ids.get_trace_id_service().algorithm == "md5"
+    print("PASS: blake2b trace IDs are deterministic")
+
+def test_mismatched_digest_rejected():
+    """A digest from another algorithm cannot be mixed in"""
+    digest = TraceIdService("blake2b").digest(CONTENT)
+    try:
+        TraceIdService("md5").trace_id(digest, ":x", 12)
+    except ValueError:
+        print("PASS: mismatched digest rejected")
+        return
+    raise AssertionError("expected ValueError")
+
+if __name__ == "__main__":
+    test_compat_mode_matches_frozen_ids()
+    test_digest_reuse_matches_direct_hash()
+    test_configurable_algorithm()
+    test_mismatched_digest_rejected()
+    print("\nTRACE ID SERVICE: ALL TESTS PASSED")
@@ -0,0 +1,73 @@
+"""
+TEXT FEATURES - Compact per-message feature record
+Shared by ConfidenceEngine (behavior_validator.py) and the inbound SUMMARIZE rules
+
+Length, word count, punctuation, line and number counts are extracted once
+per message with C-level string scans instead of each consumer splitting,
+counting or running backtracking regexes over the text again.
+
+The counts are defined so the inbound overload rules stay exactly
+equivalent to the regexes they replace:
+
+    .{200,}             -> longest_line >= 200     ('.' stops at newlines)
+    (\\n.*){4,}          -> newline_count >= 4
+    (\\b\\d+\\b.*){10,}     -> max_line_digit_runs >= 10
+"""
+
+import re
+from typing import NamedTuple, Tuple
+
+_WORD_RE = re.compile(r'\w+')
+_ASCII_DIGITS = "0123456789"
+_DELETE_ASCII_UPPER = dict.fromkeys(range(ord('A'), ord('Z') + 1))
+
+class TextFeatures(NamedTuple):
+    """Counts describing one message (a plain tuple: cheap to build and hold)"""
+    length: int
+    word_count: int            # whitespace-separated words (str.split)
+    exclamation_count: int
+    question_count: int
+    newline_count: int
+    longest_line: int          # characters in the longest line
+    digit_run_count: int       # whole-number tokens (\b\d+\b) in the text
+    max_line_digit_runs: int   # whole-number tokens on the busiest line
+    uppercase_ratio: float     # uppercase characters / length
+
+def _digit_runs(line: str) -> int:
+    """Number of \\b\\d+\\b tokens: \\w runs made only of decimal digits"""
+    return sum(1 for token in _WORD_RE.findall(line) if token.isdecimal())
+
+def _may_contain_digits(text: str) -> bool:
+    if not text.isascii():
+        return True  # \d also matches non-ASCII decimal digits
+    return any(digit in text for digit in _ASCII_DIGITS)
+
+def _uppercase_count(text: str) -> int:
+    if text.isascii():
+        return len(text) - len(text.translate(_DELETE_ASCII_UPPER))
+    return sum(map(str.isupper, text))
+
+def extract_text_features(text: str) -> TextFeatures:
+    """Build the feature record for text"""
+    length = len(text)
+    newline_count = text.count('\n')
+    lines: Tuple[str, ...] = tuple(text.split('\n')) if newline_count else (text,)
+
+    digit_run_count = max_line_digit_runs = 0
+    if _may_contain_digits(text):
+        for line in lines:
+            runs = _digit_runs(line)
+            digit_run_count += runs
+            max_line_digit_runs = max(max_line_digit_runs, runs)
+
+    return TextFeatures(
+        length=length,
+        word_count=len(text.split()),
+        exclamation_count=text.count('!'),
+        question_count=text.count('?'),
+        newline_count=newline_count,
+        longest_line=max(map(len, lines)) if newline_count else length,
+        digit_run_count=digit_run_count,
+        max_line_digit_runs=max_line_digit_runs,
+        uppercase_ratio=_uppercase_count(text) / length if length else 0.0,
+    )
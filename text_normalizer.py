@@ -0,0 +1,97 @@
+"""
+TEXT NORMALIZER - Evasion-folded form of a message for pattern matching
+Used through RequestContext.normalized by BehaviorValidator and InboundBehaviorValidator
+
+Folds the obfuscations listed in abuse_tests.test_pattern_evasion back to
+plain text, so the pattern libraries catch them without a regex variant per
+trick:
+
+    NFKC folding        fullwidth / compatibility characters ("ｋｉｌｌ")
+    confusables         Cyrillic and Greek lookalikes ("кill")
+    leet                digits and symbols used as letters ("k1ll mys3lf", "my$elf")
+    invisible chars     zero-width and soft-hyphen characters are dropped
+    whitespace          NBSP, tabs, newlines and %20-style escapes become one space
+    spaced letters      "k i l l" becomes "kill"
+
+The character-level folds are one precomputed str.translate table, applied in
+a single pass. NFKC runs only for non-ASCII text; the percent, leet-symbol and
+spaced-letter steps only when the text contains them.
+
+The normalized form is matched in addition to the lowercase text, not
+instead of it. Leet folding turns "I'm 15" into "i'm is", so patterns that
+need digits still match the original.
+"""
+
+import re
+import unicodedata
+from typing import Dict
+
+# Lowercase Cyrillic/Greek letters that render like Latin ones
+CONFUSABLES: Dict[str, str] = {
+    # Cyrillic
+    "\u0430": "a", "\u0432": "b", "\u0435": "e", "\u0451": "e", "\u04bb": "h", "\u0456": "i",
+    "\u0457": "i", "\u0458": "j", "\u043a": "k", "\u04cf": "l", "\u043c": "m", "\u043d": "h",
+    "\u043e": "o", "\u0440": "p", "\u0441": "c", "\u0455": "s", "\u0442": "t", "\u0443": "y",
+    "\u0445": "x", "\u0501": "d", "\u051b": "q", "\u051d": "w",
+    # Latin dotless/iota i
+    "\u0131": "i", "\u0269": "i",
+    # Greek
+    "\u03b1": "a", "\u03b2": "b", "\u03b5": "e", "\u03b9": "i", "\u03ba": "k", "\u03bd": "v",
+    "\u03bf": "o", "\u03c1": "p", "\u03c4": "t", "\u03c5": "u", "\u03c7": "x",
+}
+
+# Digits standing in for letters
+LEET: Dict[str, str] = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t"}
+
+# Symbols standing in for letters, folded only when a letter follows ("k!ll",
+# "my$elf") so ordinary punctuation ("hello!") leaves the text unchanged
+LEET_SYMBOLS: Dict[str, str] = {"!": "i", "|": "l", "$": "s", "@": "a"}
+
+# Every character str.isspace() accepts
+WHITESPACE = ("\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+              "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000")
+
+INVISIBLE = "\u00ad\u180e\u200b\u200c\u200d\u2060\ufeff"  # soft hyphen, Mongolian vowel separator, zero-width chars, BOM
+
+def _build_fold_table() -> Dict[int, object]:
+    table: Dict[int, object] = {ord(char): " " for char in WHITESPACE}
+    table.update({ord(char): None for char in INVISIBLE})
+    table.update({ord(char): folded for char, folded in CONFUSABLES.items()})
+    table.update({ord(char): folded for char, folded in LEET.items()})
+    return table
+
+FOLD_TABLE = _build_fold_table()
+
+_LEET_SYMBOL_RE = re.compile(r'[!|$@](?=[^\W\d_])')
+_PERCENT_SPACE_RE = re.compile(r'%(?:20|09|0a|0d|a0)', re.IGNORECASE)
+_SPACED_LETTERS_RE = re.compile(r'(?<![^ ])(?:[^\W\d_] ){2,}[^\W\d_](?![^ ])')
+# cheap guard: two single letters in a row (the literal leading space lets the scan skip ahead)
+_SPACED_GUARD_RE = re.compile(r' [^\W\d_] [^\W\d_](?: |$)')
+_SPACE_RUN_RE = re.compile(r' {2,}')
+
+def _join_letters(match: "re.Match") -> str:
+    return match.group().replace(" ", "")
+
+def normalize_text(lowered: str) -> str:
+    """
+    Evasion-folded form of lowercase text
+
+    lowered: text already lowercased (RequestContext.lowered)
+    """
+    text = lowered
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)
+    if "%" in text:
+        text = _PERCENT_SPACE_RE.sub(" ", text)
+    text = text.translate(FOLD_TABLE)
+    if "!" in text or "|" in text or "$" in text or "@" in text:
+        text = _LEET_SYMBOL_RE.sub(lambda match: LEET_SYMBOLS[match.group()], text)
+    if " " in text:
+        # letters spelled out one by one; runs of spaces still separate words
+        guard = _SPACED_GUARD_RE.search(" " + text)
+        if guard:
+            start = guard.start()  # first spaced letter (offset by the added space)
+            text = text[:start] + _SPACED_LETTERS_RE.sub(_join_letters, text[start:])
+        if "  " in text:
+            text = _SPACE_RUN_RE.sub(" ", text)
+    return text
@@ -0,0 +1,116 @@
+"""
+TRACE ID SERVICE - Deterministic trace IDs with a pluggable hash
+Shared by BehaviorValidator, InboundBehaviorValidator, UnifiedValidator and MediationSystem
+
+Every trace ID is hash(content + suffix), where the suffix carries the
+category/decision/version fields each component already used. The content
+is hashed once into a ContentDigest whose state is copied and extended per
+suffix, so callers that already hold a digest (request context, caches,
+dedup layers) never rehash the message body.
+
+Algorithms:
+    md5      - compatibility mode (default), produces today's trace IDs exactly
+    blake2b  - faster on 64-bit hosts, digest_size configurable
+    xxhash   - fastest, used only when the optional xxhash package is installed
+"""
+
+import hashlib
+from typing import Callable, Union
+
+try:
+    import xxhash  # optional dependency
+except ImportError:
+    xxhash = None
+
+COMPAT_ALGORITHM = "md5"
+
+# ============================================================================
+# CONTENT DIGEST
+# ============================================================================
+
+class ContentDigest:
+    """Hash state of one message's content - computed once, extended per trace ID"""
+
+    __slots__ = ("algorithm", "_state")
+
+    def __init__(self, algorithm: str, state):
+        self.algorithm = algorithm
+        self._state = state
+
+    def hexdigest(self) -> str:
+        """Digest of the content alone (cache / dedup key)"""
+        return self._state.hexdigest()
+
+    def extend(self, suffix: str) -> str:
+        """Digest of content + suffix, without rehashing the content"""
+        state = self._state.copy()
+        state.update(suffix.encode())
+        return state.hexdigest()
+
+# ============================================================================
+# TRACE ID SERVICE
+# ============================================================================
+
+class TraceIdService:
+    """Builds trace IDs from content digests using the configured hash"""
+
+    def __init__(self, algorithm: str = COMPAT_ALGORITHM, digest_size: int = 16):
+        self.algorithm = algorithm
+        self.digest_size = digest_size
+        self._factory = self._resolve(algorithm, digest_size)
+
+    @staticmethod
+    def _resolve(algorithm: str, digest_size: int) -> Callable:
+        if algorithm == "md5":
+            return hashlib.md5
+        if algorithm == "blake2b":
+            if digest_size < 8:
+                raise ValueError("blake2b digest_size must be at least 8 bytes for 16-char trace IDs")
+            return lambda data=b"": hashlib.blake2b(data, digest_size=digest_size)
+        if algorithm == "xxhash":
+            if xxhash is None:
+                raise ValueError("xxhash algorithm requested but the xxhash package is not installed")
+            return xxhash.xxh3_128
+        raise ValueError(f"Unknown trace hash algorithm: {algorithm}")
+
+    def digest(self, content: str) -> ContentDigest:
+        """Hash content once; reuse the result for every trace ID of this message"""
+        return ContentDigest(self.algorithm, self._factory(content.encode()))
+
+    def trace_id(self, content: Union[str, ContentDigest], suffix: str, length: int,
+                 prefix: str = "") -> str:
+        """
+        Deterministic trace ID for content + suffix
+
+        Args:
+            content: Raw content, or a ContentDigest already computed for it
+            suffix: Fields appended to the content (e.g. ":category:version")
+            length: Number of hex characters kept
+            prefix: Literal prefix (e.g. "trace_")
+        """
+        if isinstance(content, ContentDigest):
+            if content.algorithm != self.algorithm:
+                raise ValueError(
+                    f"Digest computed with {content.algorithm}, service uses {self.algorithm}"
+                )
+            return prefix + content.extend(suffix)[:length]
+
+        state = self._factory(content.encode())
+        state.update(suffix.encode())
+        return prefix + state.hexdigest()[:length]
+
+# ============================================================================
+# PROCESS-WIDE SERVICE
+# ============================================================================
+
+_service = TraceIdService()
+
+def get_trace_id_service() -> TraceIdService:
+    """Process-wide trace ID service (MD5 compatibility mode unless reconfigured)"""
+    return _service
+
+def configure_trace_ids(algorithm: str = COMPAT_ALGORITHM, digest_size: int = 16) -> TraceIdService:
+    """Switch the trace hash for the whole process; trace IDs change unless algorithm='md5'"""
+    global _service
+    _service = TraceIdService(algorithm, digest_size)
+    return _service
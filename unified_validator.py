@@ -12,6 +12,9 @@ from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
+from phrase_rewriter import PhraseRewriter
+from trace_ids import get_trace_id_service
+
 # FROZEN SCHEMAS - Version Hash: sha256:unified_validator_20240115_frozen
 
 class ValidationDecision(Enum):
@@ -112,6 +115,15 @@ class TimeEnforcer:
         current_time = dt.time()
         return self.business_hours_start <= current_time <= self.business_hours_end
 
+# Urgency language -> calm wording for REWRITE decisions
+URGENCY_REWRITER = PhraseRewriter({
+    "urgent": "important",
+    "immediately": "when convenient",
+    "right now": "at your convenience",
+    "you must": "please consider",
+    "you have to": "you might want to"
+})
+
 # UNIFIED VALIDATOR CLASS
 class UnifiedValidator:
     """Consolidated validator with frozen schemas and deterministic behavior"""
@@ -135,8 +147,9 @@ class UnifiedValidator:
     
     def generate_trace_id(self, content: str, decision: str, timestamp: str) -> str:
         """Generate deterministic trace ID"""
-        trace_input = f"{content}:{decision}:{timestamp}:{self.VERSION}"
-        return hashlib.md5(trace_input.encode()).hexdigest()[:16]
+        return get_trace_id_service().trace_id(
+            content, f":{decision}:{timestamp}:{self.VERSION}", 16
+        )
     
     def detect_manipulation(self, content: str) -> Tuple[int, List[str]]:
         """Detect emotional manipulation patterns"""
@@ -304,23 +317,8 @@ class UnifiedValidator:
     
     def _generate_safe_rewrite(self, content: str) -> str:
         """Generate safe rewrite of manipulative content"""
-        # Remove manipulation patterns
-        safe_content = content
-        
-        # Replace urgency language
-        urgency_replacements = {
-            "urgent": "important",
-            "immediately": "when convenient",
-            "right now": "at your convenience",
-            "you must": "please consider",
-            "you have to": "you might want to"
-        }
-        
-        for urgent, calm in urgency_replacements.items():
-            safe_content = safe_content.replace(urgent, calm)
-            safe_content = safe_content.replace(urgent.upper(), calm)
-        
-        return safe_content
+        # Replace urgency language (any casing, one pass)
+        return URGENCY_REWRITER.rewrite(content)
     
     def _generate_safe_summary(self, content: str) -> str:
         """Generate safe summary of manipulative content"""
@@ -331,8 +329,21 @@ class UnifiedValidator:
         else:
             return "Personal message received."
 
-# GLOBAL VALIDATOR INSTANCE
-validator = UnifiedValidator()
+# GLOBAL VALIDATOR INSTANCE (created on first use, not at import)
+_validator: Optional[UnifiedValidator] = None
+
+def get_validator() -> UnifiedValidator:
+    """Shared validator instance"""
+    global _validator
+    if _validator is None:
+        _validator = UnifiedValidator()
+    return _validator
+
+def __getattr__(name: str):
+    # Keeps `unified_validator.validator` working without building it at import
+    if name == "validator":
+        return get_validator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # CONSOLIDATED API FUNCTIONS
 def validate_action(action_payload: ActionPayload) -> ValidationResult:
@@ -345,7 +356,7 @@ def validate_action(action_payload: ActionPayload) -> ValidationResult:
     Returns:
         ValidationResult with ALLOW/REWRITE/BLOCK decision
     """
-    return validator.validate_action(action_payload)
+    return get_validator().validate_action(action_payload)
 
 def validate_inbound(message_payload: MessagePayload) -> InboundResult:
     """
@@ -357,7 +368,7 @@ def validate_inbound(message_payload: MessagePayload) -> InboundResult:
     Returns:
         InboundResult with classification and safe summary
     """
-    return validator.validate_inbound(message_payload)
+    return get_validator().validate_inbound(message_payload)
 
 # API VERSION AND SCHEMA INFO
 def get_api_info() -> Dict: